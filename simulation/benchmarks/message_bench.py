@@ -0,0 +1,96 @@
+"""Benchmark of the throughput and memory footprint of messages.
+
+Creates the messages a round sends to `--num-messages` nodes and their replies,
+the way the Driver API does, and reports how many messages per second can be
+created and read, and how many bytes each message and its metadata take in memory.
+The content of the messages is shared, as it is when a round broadcasts the same
+instructions, so that only the per-message overhead is measured.
+
+Run from the `simulation` directory:
+
+    python -m benchmarks.message_bench --num-messages 100000
+"""
+
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from common import Message, RecordSet
+from common.message import Metadata
+
+
+def _create_messages(num_messages: int, content: RecordSet) -> list[Message]:
+    """Create one message per node, all holding `content`."""
+    return [
+        Message(
+            metadata=Metadata(
+                run_id=1,
+                message_id=str(node_id),
+                src_node_id=0,
+                dst_node_id=node_id,
+                reply_to_message="",
+                group_id="1",
+                ttl=3600.0,
+                message_type="train",
+            ),
+            content=content,
+        )
+        for node_id in range(1, num_messages + 1)
+    ]
+
+
+def _read_messages(messages: list[Message]) -> int:
+    """Read the metadata fields the server-side logic looks at."""
+    total = 0
+    for message in messages:
+        metadata = message.metadata
+        if message.has_content() and metadata.message_type == "train":
+            total += metadata.dst_node_id + metadata.run_id
+    return total
+
+
+def _reply_to_messages(messages: list[Message], content: RecordSet) -> list[Message]:
+    """Create a reply to each message."""
+    return [message.create_reply(content) for message in messages]
+
+
+def _bytes_per_message(num_messages: int, content: RecordSet) -> float:
+    """Return the memory allocated per message (and its metadata)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    messages = _create_messages(num_messages, content)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del messages
+    return (after - before) / num_messages
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = RecordSet()
+    messages = _create_messages(args.num_messages, content)
+    benchmarks = {
+        "create": lambda: _create_messages(args.num_messages, content),
+        "read": lambda: _read_messages(messages),
+        "reply": lambda: _reply_to_messages(messages, content),
+    }
+    print(f"{args.num_messages} messages")
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, repeat=args.repeat, number=1))
+        print(f"{name:>8}: {args.num_messages / best:12,.0f} messages/s")
+    print(
+        f"{'memory':>8}: {_bytes_per_message(args.num_messages, content):12,.0f} "
+        "bytes/message"
+    )
+
+
+if __name__ == "__main__":
+    main()
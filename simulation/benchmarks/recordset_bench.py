@@ -0,0 +1,93 @@
+"""Micro-benchmark of the per-message cost of RecordSet conversions.
+
+Measures the time to access the typed views of a `RecordSet` and the time of the
+conversions a fit message goes through in `recordset_compat`, from `FitIns` to
+the `RecordSet` of the message and back, for the request and for the reply.
+
+Run from the `simulation` directory:
+
+    python -m benchmarks.recordset_bench --num-records 8 --num-arrays 16
+"""
+
+
+import argparse
+import timeit
+
+import numpy as np
+
+from common import (
+    Code,
+    ConfigsRecord,
+    FitIns,
+    FitRes,
+    MetricsRecord,
+    RecordSet,
+    Status,
+    ndarrays_to_parameters,
+)
+from common import recordset_compat as compat
+
+
+def _make_recordset(num_records: int) -> RecordSet:
+    """Return a RecordSet holding `num_records` records of each type."""
+    recordset = RecordSet()
+    for idx in range(num_records):
+        recordset.configs_records[f"config.{idx}"] = ConfigsRecord({"lr": 0.1})
+        recordset.metrics_records[f"metrics.{idx}"] = MetricsRecord({"loss": 0.5})
+        recordset.parameters_records[f"parameters.{idx}"] = (
+            compat.parameters_to_parametersrecord(
+                ndarrays_to_parameters([np.zeros(4)]), keep_input=False
+            )
+        )
+    return recordset
+
+
+def _fit_message_round_trip(ins: FitIns, res: FitRes) -> None:
+    """Run the conversions of a fit request and of its reply."""
+    recordset = compat.fitins_to_recordset(ins, keep_input=True)
+    compat.recordset_to_fitins(recordset, keep_input=True)
+    recordset = compat.fitres_to_recordset(res, keep_input=True)
+    compat.recordset_to_fitres(recordset, keep_input=True)
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per operation."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-records", type=int, default=8)
+    parser.add_argument("--num-arrays", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    recordset = _make_recordset(args.num_records)
+    parameters = ndarrays_to_parameters(
+        [np.zeros(16, dtype=np.float32) for _ in range(args.num_arrays)]
+    )
+    ins = FitIns(parameters=parameters, config={"lr": 0.1, "epochs": 1})
+    res = FitRes(
+        status=Status(code=Code.OK, message="Success"),
+        parameters=parameters,
+        num_examples=10,
+        metrics={"loss": 0.5},
+    )
+
+    benchmarks = {
+        "view access": lambda: (
+            recordset.parameters_records,
+            recordset.metrics_records,
+            recordset.configs_records,
+        ),
+        "view lookup": lambda: recordset.configs_records["config.0"],
+        "fit message": lambda: _fit_message_round_trip(ins, res),
+    }
+    print(
+        f"{args.num_records} records of each type, "
+        f"{args.num_arrays} arrays per message"
+    )
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, repeat=args.repeat, number=args.number))
+        print(f"{name:>12}: {best / args.number * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark of the framing of Messages against pickle protocol 5.
+
+Measures the round trip of a fit Message holding a model of `--num-arrays` arrays
+of `--array-size` float32 values each: encoding, sending over a socket pair,
+receiving and decoding, both with `common.serde` frames and with pickle protocol
+5. Pickle passes objects supporting it (e.g. ndarrays) as out-of-band buffers,
+but the data of `Array`s are `bytes`, which it copies into the pickle stream.
+
+Run from the `simulation` directory:
+
+    python -m benchmarks.serde_bench --num-arrays 16 --array-size 1000000
+"""
+
+
+import argparse
+import pickle
+import socket
+import struct
+import threading
+import timeit
+from typing import Any, Callable
+
+import numpy as np
+
+from common import FitIns, Message, ndarrays_to_parameters
+from common import recordset_compat as compat
+from common.message import Metadata
+from common.serde import message_from_frame, message_to_frame, recv_frame, send_frame
+
+
+def _make_message(num_arrays: int, array_size: int) -> Message:
+    """Return a fit Message holding a model of `num_arrays` float32 arrays."""
+    ndarrays = [
+        np.random.rand(array_size).astype(np.float32) for _ in range(num_arrays)
+    ]
+    recordset = compat.fitins_to_recordset(
+        FitIns(parameters=ndarrays_to_parameters(ndarrays), config={"lr": 0.1}),
+        keep_input=False,
+    )
+    metadata = Metadata(
+        run_id=1,
+        message_id="1",
+        src_node_id=0,
+        dst_node_id=1,
+        reply_to_message="",
+        group_id="1",
+        ttl=3600.0,
+        message_type="train",
+    )
+    return Message(metadata=metadata, content=recordset)
+
+
+def _send_pickle(sock: socket.socket, message: Message) -> None:
+    """Send a Message pickled with protocol 5 and its out-of-band buffers."""
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(message, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+    lengths = [len(data)] + [raw.nbytes for raw in raws]
+    prefix = struct.pack(f"<I{len(lengths)}Q", len(lengths), *lengths)
+    sock.sendmsg([prefix, data, *raws])
+
+
+def _recv_pickle(sock: socket.socket) -> Message:
+    """Receive a Message sent by `_send_pickle`."""
+    (count,) = struct.unpack("<I", _recv_exact(sock, 4))
+    lengths = struct.unpack(f"<{count}Q", _recv_exact(sock, 8 * count))
+    data, *buffers = [_recv_exact(sock, length) for length in lengths]
+    return pickle.loads(data, buffers=buffers)  # type: ignore[no-any-return]
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    data = bytearray(size)
+    view = memoryview(data)
+    received = 0
+    while received < size:
+        received += sock.recv_into(view[received:])
+    return data
+
+
+def _round_trip(
+    message: Message,
+    send: Callable[[socket.socket, Message], None],
+    recv: Callable[[socket.socket], Any],
+) -> None:
+    """Send a Message over a socket pair and receive it on the other side."""
+    sender, receiver = socket.socketpair()
+    thread = threading.Thread(target=send, args=(sender, message))
+    thread.start()
+    recv(receiver)
+    thread.join()
+    sender.close()
+    receiver.close()
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-arrays", type=int, default=16)
+    parser.add_argument("--array-size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    message = _make_message(args.num_arrays, args.array_size)
+    frame = message_to_frame(message)
+    num_bytes = len(frame[0]) + sum(buffer.nbytes for buffer in frame[1])
+    benchmarks = {
+        "serde encode/decode": lambda: message_from_frame(message_to_frame(message)),
+        "pickle5 dumps/loads": lambda: pickle.loads(pickle.dumps(message, protocol=5)),
+        "serde socket": lambda: _round_trip(
+            message,
+            lambda sock, msg: send_frame(sock, message_to_frame(msg)),
+            lambda sock: message_from_frame(recv_frame(sock)),
+        ),
+        "pickle5 socket": lambda: _round_trip(message, _send_pickle, _recv_pickle),
+    }
+    print(
+        f"{args.num_arrays} arrays of {args.array_size} float32 "
+        f"({num_bytes / 1e6:.1f} MB per message)"
+    )
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, repeat=args.repeat, number=1))
+        print(f"{name:>20}: {best * 1e3:9.2f} ms ({num_bytes / best / 1e9:6.2f} GB/s)")
+
+
+if __name__ == "__main__":
+    main()
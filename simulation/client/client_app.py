@@ -41,6 +41,8 @@ def _inspect_maybe_adapt_client_fn_signature(client_fn: ClientFnExt) -> ClientFn
             " `from flwr.common import Context`"
         )
 
+    return client_fn
+
 
 @contextmanager
 def _empty_lifespan(_: Context) -> Iterator[None]:
@@ -56,6 +58,10 @@ class ClientAppException(Exception):
         super().__init__(self.message)
 
 
+class LoadClientAppError(Exception):
+    """Error when trying to load `ClientApp`."""
+
+
 class ClientApp:
     """Flower ClientApp.
 
@@ -9,7 +9,13 @@ from client.client import (
     maybe_call_fit, 
     maybe_call_evaluate,
 )
-from client.numpy_client import NumPyClient
+from client.numpy_client import (
+    NumPyClient,
+    evaluate_recordset,
+    fit_recordset,
+    has_evaluate,
+    has_fit,
+)
 from client.typing import ClientFnExt
 from common import Message, Context, log
 from common.constant import MessageType, MessageTypeLegacy
@@ -41,6 +47,12 @@ def handle_legacy_message_from_msgtype(
             "Please use `NumPyClient.to_client()` method to convert it to `Client`.",
         )
 
+    # NumPyClients wrapped by `to_client` exchange RecordSets without going through
+    # the legacy `Parameters`
+    numpy_client = getattr(client, "numpy_client", None)
+    if not isinstance(numpy_client, NumPyClient):
+        numpy_client = None
+
     message_type = message.metadata.message_type
 
     # Handle GetPropertiesIns
@@ -60,6 +72,12 @@ def handle_legacy_message_from_msgtype(
             get_parameters_res, keep_input=False
         )
     # Handle FitIns
+    elif (
+        message_type == MessageType.TRAIN
+        and numpy_client is not None
+        and has_fit(numpy_client)
+    ):
+        out_recordset = fit_recordset(numpy_client, message.content)
     elif message_type == MessageType.TRAIN:
         fit_res = maybe_call_fit(
             client=client,
@@ -67,6 +85,12 @@ def handle_legacy_message_from_msgtype(
         )
         out_recordset = fitres_to_recordset(fit_res, keep_input=False)
     # Handle EvaluateIns
+    elif (
+        message_type == MessageType.EVALUATE
+        and numpy_client is not None
+        and has_evaluate(numpy_client)
+    ):
+        out_recordset = evaluate_recordset(numpy_client, message.content)
     elif message_type == MessageType.EVALUATE:
         evaluate_res = maybe_call_evaluate(
             client=client,
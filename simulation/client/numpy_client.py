@@ -3,8 +3,10 @@ from abc import ABC
 from typing import Callable
 
 from client.client import Client
+from common import recordset_compat as compat
 from common import (
     Config,
+    RecordSet,
     Scalar,
     NDArrays,
     ndarrays_to_parameters,
@@ -202,13 +204,11 @@ def _get_parameters(self: Client, ins: GetParametersIns) -> GetParametersRes:
     )
 
 
-def _fit(self: Client, ins: FitIns) -> FitRes:
-    """Refine the provided parameters using the locally held dataset."""
-    # Deconstruct FitIns
-    parameters: NDArrays = parameters_to_ndarrays(ins.parameters)
-
-    # Train
-    results = self.numpy_client.fit(parameters, ins.config)  # type: ignore
+def _call_fit(
+    numpy_client: NumPyClient, parameters: NDArrays, config: dict[str, Scalar]
+) -> tuple[NDArrays, int, dict[str, Scalar]]:
+    """Call `NumPyClient.fit` and check the type of its results."""
+    results = numpy_client.fit(parameters, config)
     if not (
         len(results) == 3
         and isinstance(results[0], list)
@@ -216,6 +216,31 @@ def _fit(self: Client, ins: FitIns) -> FitRes:
         and isinstance(results[2], dict)
     ):
         raise TypeError(EXCEPTION_MESSAGE_WRONG_RETURN_TYPE_FIT)
+    return results
+
+
+def _call_evaluate(
+    numpy_client: NumPyClient, parameters: NDArrays, config: dict[str, Scalar]
+) -> tuple[float, int, dict[str, Scalar]]:
+    """Call `NumPyClient.evaluate` and check the type of its results."""
+    results = numpy_client.evaluate(parameters, config)
+    if not (
+        len(results) == 3
+        and isinstance(results[0], float)
+        and isinstance(results[1], int)
+        and isinstance(results[2], dict)
+    ):
+        raise TypeError(EXCEPTION_MESSAGE_WRONG_RETURN_TYPE_EVALUATE)
+    return results
+
+
+def _fit(self: Client, ins: FitIns) -> FitRes:
+    """Refine the provided parameters using the locally held dataset."""
+    # Deconstruct FitIns
+    parameters: NDArrays = parameters_to_ndarrays(ins.parameters)
+
+    # Train
+    results = _call_fit(self.numpy_client, parameters, ins.config)  # type: ignore
 
     # Return FitRes
     parameters_prime, num_examples, metrics = results
@@ -232,14 +257,7 @@ def _evaluate(self: Client, ins: EvaluateIns) -> EvaluateRes:
     """Evaluate the provided parameters using the locally held dataset."""
     parameters: NDArrays = parameters_to_ndarrays(ins.parameters)
 
-    results = self.numpy_client.evaluate(parameters, ins.config)  # type: ignore
-    if not (
-        len(results) == 3
-        and isinstance(results[0], float)
-        and isinstance(results[1], int)
-        and isinstance(results[2], dict)
-    ):
-        raise TypeError(EXCEPTION_MESSAGE_WRONG_RETURN_TYPE_EVALUATE)
+    results = _call_evaluate(self.numpy_client, parameters, ins.config)  # type: ignore
 
     # Return EvaluateRes
     loss, num_examples, metrics = results
@@ -251,6 +269,83 @@ def _evaluate(self: Client, ins: EvaluateIns) -> EvaluateRes:
     )
 
 
+def fit_recordset(numpy_client: NumPyClient, recordset: RecordSet) -> RecordSet:
+    """Train a NumPyClient on the parameters of a `FitIns` RecordSet.
+
+    This is the record-native equivalent of wrapping the client with `to_client`
+    and going through `FitIns` and `FitRes`: the arrays of the received
+    `ParametersRecord` are deserialized directly, and the updated arrays are
+    serialized directly into the `ParametersRecord` of the reply, under the names
+    of the received arrays if the model has as many arrays. The received
+    RecordSet is not modified.
+
+    Parameters
+    ----------
+    numpy_client : NumPyClient
+        The client, which must implement `fit`.
+    recordset : RecordSet
+        The content of a `MessageType.TRAIN` message.
+
+    Returns
+    -------
+    RecordSet
+        The content of the reply, as created by `fitres_to_recordset`.
+    """
+    parameters_record, config = compat.recordset_to_ins_record(recordset, "fitins")
+    parameters = compat.parametersrecord_to_ndarrays(parameters_record)
+
+    parameters_prime, num_examples, metrics = _call_fit(
+        numpy_client, parameters, config
+    )
+
+    # Keep the names of the received arrays if the model still matches them
+    names = [key for key in parameters_record if key != compat.EMPTY_TENSOR_KEY]
+    return compat.fitres_record_to_recordset(
+        compat.ndarrays_to_parametersrecord(
+            parameters_prime,
+            names if len(names) == len(parameters_prime) else None,
+        ),
+        num_examples,
+        metrics,
+        Status(code=Code.OK, message="Success"),
+    )
+
+
+def evaluate_recordset(numpy_client: NumPyClient, recordset: RecordSet) -> RecordSet:
+    """Evaluate a NumPyClient on the parameters of an `EvaluateIns` RecordSet.
+
+    This is the record-native equivalent of wrapping the client with `to_client`
+    and going through `EvaluateIns`: the arrays of the received `ParametersRecord`
+    are deserialized directly. The received RecordSet is not modified.
+
+    Parameters
+    ----------
+    numpy_client : NumPyClient
+        The client, which must implement `evaluate`.
+    recordset : RecordSet
+        The content of a `MessageType.EVALUATE` message.
+
+    Returns
+    -------
+    RecordSet
+        The content of the reply, as created by `evaluateres_to_recordset`.
+    """
+    parameters_record, config = compat.recordset_to_ins_record(
+        recordset, "evaluateins"
+    )
+    parameters = compat.parametersrecord_to_ndarrays(parameters_record)
+
+    loss, num_examples, metrics = _call_evaluate(numpy_client, parameters, config)
+
+    return compat.evaluateres_to_recordset(
+        EvaluateRes(
+            status=Status(code=Code.OK, message="Success"),
+            loss=loss,
+            num_examples=num_examples,
+            metrics=metrics,
+        )
+    )
+
 
 def _wrap_numpy_client(client: NumPyClient) -> Client:
     member_dict: dict[str, Callable] = {  # type: ignore
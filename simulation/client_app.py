@@ -1,5 +1,6 @@
 """my-awesome-app: A Flower / PyTorch app."""
 
+import threading
 import torch
 from random import random
 from client import NumPyClient, ClientApp
@@ -75,11 +76,17 @@ class FlowerClient(NumPyClient):
         return loss, len(self.valloader.dataset), {"accuracy": accuracy}
 
 
+worker_cache = threading.local()  # Cache objects per simulation worker
+
+
 def client_fn(context: Context):
     """A function that returns a Client."""
 
-    # Instantiate the model
-    net = Net()
+    # Instantiate the model only once per worker, `fit` and `evaluate` overwrite
+    # all of its weights anyway
+    if not hasattr(worker_cache, "net"):
+        worker_cache.net = Net()
+    net = worker_cache.net
     # Read node config and fetch data for the ClientApp that is being constructed
     partition_id = context.node_config["partition-id"]
     num_partitions = context.node_config["num-partitions"]
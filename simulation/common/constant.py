@@ -7,6 +7,9 @@ from __future__ import annotations
 # Message TTL
 MESSAGE_TTL_TOLERANCE = 1e-1
 
+# Node ID used by the SuperLink (and the Driver talking to it) as message source
+SUPERLINK_NODE_ID = 0
+
 
 class MessageType:
     """Message type."""
@@ -35,7 +38,22 @@ class SType:
     """Serialisation type."""
 
     NUMPY = "numpy.ndarray"
+    NUMPY_RAW = "numpy.ndarray.raw"
 
     def __new__(cls) -> SType:
         """Prevent instantiation."""
-        raise TypeError(f"{cls.__name__} cannot be instantiated.")
\ No newline at end of file
+        raise TypeError(f"{cls.__name__} cannot be instantiated.")
+
+
+class ErrorCode:
+    """Error codes for Message's Error."""
+
+    UNKNOWN = 0
+    LOAD_CLIENT_APP_EXCEPTION = 1
+    CLIENT_APP_RAISED_EXCEPTION = 2
+    MESSAGE_UNAVAILABLE = 3
+    REPLY_MESSAGE_UNAVAILABLE = 4
+
+    def __new__(cls) -> ErrorCode:
+        """Prevent instantiation."""
+        raise TypeError(f"{cls.__name__} cannot be instantiated.")
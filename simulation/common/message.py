@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import time
-from typing import cast, Optional
+from typing import Any
 from logging import WARNING
 
 from .record import RecordSet
@@ -39,6 +39,19 @@ class Metadata:
         the receiving end.
     """
 
+    __slots__ = (
+        "_run_id",
+        "_message_id",
+        "_src_node_id",
+        "_dst_node_id",
+        "_reply_to_message",
+        "_group_id",
+        "_ttl",
+        "_message_type",
+        "_created_at",
+        "_delivered_at",
+    )
+
     def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         run_id: int,
@@ -50,108 +63,110 @@ class Metadata:
         ttl: float,
         message_type: str,
     ) -> None:
-        var_dict = {
-            "_run_id": run_id,
-            "_message_id": message_id,
-            "_src_node_id": src_node_id,
-            "_dst_node_id": dst_node_id,
-            "_reply_to_message": reply_to_message,
-            "_group_id": group_id,
-            "_ttl": ttl,
-            "_message_type": message_type,
-        }
-        self.__dict__.update(var_dict)
+        self._run_id = run_id
+        self._message_id = message_id
+        self._src_node_id = src_node_id
+        self._dst_node_id = dst_node_id
+        self._reply_to_message = reply_to_message
+        self._group_id = group_id
+        self._ttl = ttl
+        self._message_type = message_type
 
     @property
     def run_id(self) -> int:
         """An identifier for the current run."""
-        return cast(int, self.__dict__["_run_id"])
+        return self._run_id
 
     @property
     def message_id(self) -> str:
         """An identifier for the current message."""
-        return cast(str, self.__dict__["_message_id"])
+        return self._message_id
+
+    @message_id.setter
+    def message_id(self, value: str) -> None:
+        """Set message_id."""
+        self._message_id = value
 
     @property
     def src_node_id(self) -> int:
         """An identifier for the node sending this message."""
-        return cast(int, self.__dict__["_src_node_id"])
+        return self._src_node_id
 
     @property
     def reply_to_message(self) -> str:
         """An identifier for the message this message replies to."""
-        return cast(str, self.__dict__["_reply_to_message"])
+        return self._reply_to_message
 
     @property
     def dst_node_id(self) -> int:
         """An identifier for the node receiving this message."""
-        return cast(int, self.__dict__["_dst_node_id"])
+        return self._dst_node_id
 
     @dst_node_id.setter
     def dst_node_id(self, value: int) -> None:
         """Set dst_node_id."""
-        self.__dict__["_dst_node_id"] = value
+        self._dst_node_id = value
 
     @property
     def group_id(self) -> str:
         """An identifier for grouping messages."""
-        return cast(str, self.__dict__["_group_id"])
+        return self._group_id
 
     @group_id.setter
     def group_id(self, value: str) -> None:
         """Set group_id."""
-        self.__dict__["_group_id"] = value
+        self._group_id = value
 
     @property
     def created_at(self) -> float:
         """Unix timestamp when the message was created."""
-        return cast(float, self.__dict__["_created_at"])
+        return self._created_at
 
     @created_at.setter
     def created_at(self, value: float) -> None:
         """Set creation timestamp for this message."""
-        self.__dict__["_created_at"] = value
+        self._created_at = value
 
     @property
     def delivered_at(self) -> str:
         """Unix timestamp when the message was delivered."""
-        return cast(str, self.__dict__["_delivered_at"])
+        return self._delivered_at
 
     @delivered_at.setter
     def delivered_at(self, value: str) -> None:
         """Set delivery timestamp of this message."""
-        self.__dict__["_delivered_at"] = value
+        self._delivered_at = value
 
     @property
     def ttl(self) -> float:
         """Time-to-live for this message."""
-        return cast(float, self.__dict__["_ttl"])
+        return self._ttl
 
     @ttl.setter
     def ttl(self, value: float) -> None:
         """Set ttl."""
-        self.__dict__["_ttl"] = value
+        self._ttl = value
 
     @property
     def message_type(self) -> str:
         """A string that encodes the action to be executed on the receiving end."""
-        return cast(str, self.__dict__["_message_type"])
+        return self._message_type
 
     @message_type.setter
     def message_type(self, value: str) -> None:
         """Set message_type."""
-        self.__dict__["_message_type"] = value
+        self._message_type = value
 
     def __repr__(self) -> str:
         """Return a string representation of this instance."""
-        view = ", ".join([f"{k.lstrip('_')}={v!r}" for k, v in self.__dict__.items()])
+        view = ", ".join([f"{k.lstrip('_')}={v!r}" for k, v in _slot_items(self)])
         return f"{self.__class__.__qualname__}({view})"
 
     def __eq__(self, other: object) -> bool:
         """Compare two instances of the class."""
         if not isinstance(other, self.__class__):
             raise NotImplementedError
-        return self.__dict__ == other.__dict__
+        return _slot_items(self) == _slot_items(other)
 
 
 class Error:
@@ -165,33 +180,32 @@ class Error:
         A reason for why the error arose (e.g. an exception stack-trace)
     """
 
+    __slots__ = ("_code", "_reason")
+
     def __init__(self, code: int, reason: str | None = None) -> None:
-        var_dict = {
-            "_code": code,
-            "_reason": reason,
-        }
-        self.__dict__.update(var_dict)
+        self._code = code
+        self._reason = reason
 
     @property
     def code(self) -> int:
         """Error code."""
-        return cast(int, self.__dict__["_code"])
+        return self._code
 
     @property
     def reason(self) -> str | None:
         """Reason reported about the error."""
-        return cast(Optional[str], self.__dict__["_reason"])
+        return self._reason
 
     def __repr__(self) -> str:
         """Return a string representation of this instance."""
-        view = ", ".join([f"{k.lstrip('_')}={v!r}" for k, v in self.__dict__.items()])
+        view = ", ".join([f"{k.lstrip('_')}={v!r}" for k, v in _slot_items(self)])
         return f"{self.__class__.__qualname__}({view})"
 
     def __eq__(self, other: object) -> bool:
         """Compare two instances of the class."""
         if not isinstance(other, self.__class__):
             raise NotImplementedError
-        return self.__dict__ == other.__dict__
+        return _slot_items(self) == _slot_items(other)
 
 
 class Message:
@@ -209,6 +223,8 @@ class Message:
         when processing another message.
     """
 
+    __slots__ = ("_metadata", "_content", "_error")
+
     def __init__(
         self,
         metadata: Metadata,
@@ -220,60 +236,57 @@ class Message:
 
         metadata.created_at = time.time()  # Set the message creation timestamp
         metadata.delivered_at = ""
-        var_dict = {
-            "_metadata": metadata,
-            "_content": content,
-            "_error": error,
-        }
-        self.__dict__.update(var_dict)
+        self._metadata = metadata
+        self._content = content
+        self._error = error
 
     @property
     def metadata(self) -> Metadata:
         """A dataclass including information about the message to be executed."""
-        return cast(Metadata, self.__dict__["_metadata"])
+        return self._metadata
 
     @property
     def content(self) -> RecordSet:
         """The content of this message."""
-        if self.__dict__["_content"] is None:
+        if self._content is None:
             raise ValueError(
                 "Message content is None. Use <message>.has_content() "
                 "to check if a message has content."
             )
-        return cast(RecordSet, self.__dict__["_content"])
+        return self._content
 
     @content.setter
     def content(self, value: RecordSet) -> None:
         """Set content."""
-        if self.__dict__["_error"] is None:
-            self.__dict__["_content"] = value
+        if self._error is None:
+            self._content = value
         else:
             raise ValueError("A message with an error set cannot have content.")
 
     @property
     def error(self) -> Error:
         """Error captured by this message."""
-        if self.__dict__["_error"] is None:
+        if self._error is None:
             raise ValueError(
                 "Message error is None. Use <message>.has_error() "
                 "to check first if a message carries an error."
             )
-        return cast(Error, self.__dict__["_error"])
+        return self._error
 
     @error.setter
     def error(self, value: Error) -> None:
         """Set error."""
         if self.has_content():
             raise ValueError("A message with content set cannot carry an error.")
-        self.__dict__["_error"] = value
+        self._error = value
 
     def has_content(self) -> bool:
         """Return True if message has content, else False."""
-        return self.__dict__["_content"] is not None
+        return self._content is not None
 
     def has_error(self) -> bool:
         """Return True if message has an error, else False."""
-        return self.__dict__["_error"] is not None
+        return self._error is not None
 
     def create_error_reply(self, error: Error, ttl: float | None = None) -> Message:
         """Construct a reply message indicating an error happened.
@@ -359,7 +372,7 @@ class Message:
         view = ", ".join(
             [
                 f"{k.lstrip('_')}={v!r}"
-                for k, v in self.__dict__.items()
+                for k, v in _slot_items(self)
                 if v is not None
             ]
         )
@@ -391,6 +404,15 @@ class Message:
             message.metadata.ttl = max_allowed_ttl
 
 
+def _slot_items(obj: object) -> list[tuple[str, Any]]:
+    """Return the names and values of the slots of `obj` that are set, in order."""
+    return [
+        (name, getattr(obj, name))
+        for name in type(obj).__slots__  # type: ignore[attr-defined]
+        if hasattr(obj, name)
+    ]
+
+
 def _create_reply_metadata(msg: Message, ttl: float) -> Metadata:
     """Construct metadata for a reply message."""
     return Metadata(
@@ -0,0 +1,37 @@
+"""Helper functions to load objects from a reference."""
+
+
+import importlib
+from typing import Any
+
+
+def load_app(module_attribute_str: str, error_type: type[Exception]) -> Any:
+    """Return the object specified in a module attribute string.
+
+    The module/attribute string should have the form <module>:<attribute>. Valid
+    examples include `client_app:app` and `project.package.module:wrapper.app`.
+    It must refer to a module on the PYTHONPATH and the module needs to have the
+    specified attribute.
+    """
+    module_str, _, attributes_str = module_attribute_str.partition(":")
+    if not module_str or not attributes_str:
+        raise error_type(
+            f"Invalid format `{module_attribute_str}`. Expected <module>:<attribute>."
+        )
+
+    try:
+        module = importlib.import_module(module_str)
+    except ModuleNotFoundError as err:
+        raise error_type(f"Unable to load module {module_str}") from err
+
+    # Recursively load attribute
+    attribute = module
+    try:
+        for attribute_str in attributes_str.split("."):
+            attribute = getattr(attribute, attribute_str)
+    except AttributeError as err:
+        raise error_type(
+            f"Unable to load attribute {attributes_str} from module {module_str}",
+        ) from err
+
+    return attribute
@@ -1,26 +1,45 @@
 """Parameter conversion."""
 
 
+import struct
 from io import BytesIO
 from typing import cast
 
 import numpy as np
 
+from .constant import SType
 from .typing import NDArray, NDArrays, Parameters
 
-def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
+# Layout of a raw tensor: magic, header length, number of dimensions, the dimensions
+# (int64 each) and the dtype string, zero-padded so the payload starts at a multiple
+# of 16 bytes. The payload is the C-contiguous data of the array.
+RAW_MAGIC = b"\x93FLRAW"
+_RAW_PREFIX = struct.Struct("<6sHB")
+_RAW_ALIGNMENT = 16
+
+
+def ndarrays_to_parameters(
+    ndarrays: NDArrays, tensor_type: str = SType.NUMPY_RAW
+) -> Parameters:
     """Convert NumPy ndarrays to parameters object."""
-    tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+    tensors = [ndarray_to_bytes(ndarray, tensor_type) for ndarray in ndarrays]
+    return Parameters(tensors=tensors, tensor_type=tensor_type)
 
 
-def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
-    return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
+def parameters_to_ndarrays(parameters: Parameters, copy: bool = True) -> NDArrays:
+    """Convert parameters object to NumPy ndarrays.
 
+    See `bytes_to_ndarray` for the meaning of `copy`.
+    """
+    return [bytes_to_ndarray(tensor, copy) for tensor in parameters.tensors]
 
-def ndarray_to_bytes(ndarray: NDArray) -> bytes:
+
+def ndarray_to_bytes(ndarray: NDArray, tensor_type: str = SType.NUMPY_RAW) -> bytes:
     """Serialize NumPy ndarray to bytes."""
+    if tensor_type == SType.NUMPY_RAW:
+        return _ndarray_to_raw_bytes(ndarray)
+    if tensor_type != SType.NUMPY:
+        raise ValueError(f"Unsupported serialization type: '{tensor_type}'")
     bytes_io = BytesIO()
     # WARNING: NEVER set allow_pickle to true.
     # Reason: loading pickled data can execute arbitrary code
@@ -29,11 +48,58 @@ def ndarray_to_bytes(ndarray: NDArray) -> bytes:
     return bytes_io.getvalue()
 
 
-def bytes_to_ndarray(tensor: bytes) -> NDArray:
-    """Deserialize NumPy ndarray from bytes."""
+def bytes_to_ndarray(tensor: bytes, copy: bool = True) -> NDArray:
+    """Deserialize NumPy ndarray from bytes.
+
+    Both raw tensors and tensors in the `.npy` format are supported. `tensor` may be
+    any object supporting the buffer protocol (e.g. a `memoryview` of a
+    memory-mapped file). The returned array is writable, unless `copy` is False: a
+    raw tensor is then not copied, but returned as a read-only view of `tensor`.
+    """
+    if bytes(tensor[: len(RAW_MAGIC)]) == RAW_MAGIC:
+        dtype, shape, header_len = read_raw_header(tensor)
+        count = int(np.prod(shape, dtype=np.int64))
+        ndarray = np.frombuffer(tensor, dtype=dtype, count=count, offset=header_len)
+        ndarray = ndarray.reshape(shape)
+        return ndarray.copy() if copy else ndarray
     bytes_io = BytesIO(tensor)
     # WARNING: NEVER set allow_pickle to true.
     # Reason: loading pickled data can execute arbitrary code
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
     ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
     return cast(NDArray, ndarray_deserialized)
+
+
+def read_raw_header(
+    tensor: bytes,
+) -> tuple[np.dtype, list[int], int]:  # type: ignore[type-arg]
+    """Return the dtype, the shape and the header length of a raw tensor."""
+    magic, header_len, ndim = _RAW_PREFIX.unpack_from(tensor)
+    if magic != RAW_MAGIC:
+        raise ValueError("The tensor is not serialized as a raw NumPy ndarray.")
+    shape_end = _RAW_PREFIX.size + 8 * ndim
+    shape = list(struct.unpack_from(f"<{ndim}q", tensor, _RAW_PREFIX.size))
+    dtype = bytes(tensor[shape_end:header_len]).rstrip(b"\x00").decode("ascii")
+    return np.dtype(dtype), shape, header_len
+
+
+def _ndarray_to_raw_bytes(ndarray: NDArray) -> bytes:
+    """Serialize NumPy ndarray to a raw header followed by its data."""
+    # Like `np.save(..., allow_pickle=False)`, refuse what cannot be stored as data
+    if ndarray.dtype.hasobject or ndarray.dtype.fields is not None:
+        raise ValueError(
+            f"Arrays of dtype `{ndarray.dtype}` cannot be serialized as raw "
+            f"tensors, use the `{SType.NUMPY}` serialization type instead."
+        )
+    dtype = ndarray.dtype.str.encode("ascii")
+    header_len = _RAW_PREFIX.size + 8 * ndarray.ndim + len(dtype)
+    header_len += -header_len % _RAW_ALIGNMENT
+    header = b"".join(
+        [
+            _RAW_PREFIX.pack(RAW_MAGIC, header_len, ndarray.ndim),
+            struct.pack(f"<{ndarray.ndim}q", *ndarray.shape),
+            dtype,
+        ]
+    ).ljust(header_len, b"\x00")
+    data = np.ascontiguousarray(ndarray).reshape(-1).view(np.uint8)
+    return b"".join([header, data])
@@ -93,6 +93,8 @@ class ConfigsRecord(TypedDict[str, ConfigsRecordValues]):
     :code:`ConfigsRecord`)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         configs_dict: Optional[dict[str, ConfigsRecordValues]] = None,
@@ -101,10 +103,9 @@ class ConfigsRecord(TypedDict[str, ConfigsRecordValues]):
 
         super().__init__(_check_key, _check_value)
         if configs_dict:
-            for k in list(configs_dict.keys()):
-                self[k] = configs_dict[k]
-                if not keep_input:
-                    del configs_dict[k]
+            self.update_many(configs_dict)
+            if not keep_input:
+                configs_dict.clear()
 
     def count_bytes(self) -> int:
         """Return number of Bytes stored in this object.
@@ -3,10 +3,16 @@
 
 from typing import get_args, Optional
 
+import numpy as np
+
 from common.typing import MetricsRecordValues, MetricsScalar
 
 from .typeddict import TypedDict
 
+# NumPy dtype kinds of the arrays accepted as metrics: signed/unsigned integers
+# and floats
+_METRICS_ARRAY_KINDS = "iuf"
+
 
 def _check_key(key: str) -> None:
     """Check if key is of expected type."""
@@ -23,11 +29,19 @@ def _check_value(value: MetricsRecordValues) -> None:
                 f" Expected `{MetricsRecordValues}` but `{type(__v)}` was passed."
             )
 
-    if isinstance(value, list):
+    if isinstance(value, np.ndarray):
+        # Arrays are checked by their dtype, whatever their number of elements
+        if value.ndim != 1 or value.dtype.kind not in _METRICS_ARRAY_KINDS:
+            raise TypeError(
+                "Arrays of metrics must be one-dimensional arrays of integers or "
+                f"floats, but an array of shape {value.shape} and dtype "
+                f"`{value.dtype}` was passed."
+            )
+    elif isinstance(value, list):
         # If your lists are large (e.g. 1M+ elements) this will be slow
         # 1s to check 10M element list on a M2 Pro
-        # In such settings, you'd be better of treating such metric as
-        # an array and pass it to a ParametersRecord.
+        # In such settings, you'd be better of passing such metric as a
+        # one-dimensional NumPy array.
         # Empty lists are valid
         if len(value) > 0:
             is_valid(value[0])
@@ -57,6 +71,8 @@ class MetricsRecord(TypedDict[str, MetricsRecordValues]):
     metrics_dict : Optional[Dict[str, MetricsRecordValues]]
         A dictionary that stores basic types (i.e. `int`, `float` as defined
         in `MetricsScalar`) and list of such types (see `MetricsScalarList`).
+        Long lists of numbers are best stored as one-dimensional NumPy arrays of
+        integers or floats, which are validated by their dtype only.
     keep_input : bool (default: True)
         A boolean indicating whether metrics should be deleted from the input
         dictionary immediately after adding them to the record. When set
@@ -99,6 +115,8 @@ class MetricsRecord(TypedDict[str, MetricsRecordValues]):
     :code:`ParametersRecord`.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         metrics_dict: Optional[dict[str, MetricsRecordValues]] = None,
@@ -106,17 +124,18 @@ class MetricsRecord(TypedDict[str, MetricsRecordValues]):
     ):
         super().__init__(_check_key, _check_value)
         if metrics_dict:
-            for k in list(metrics_dict.keys()):
-                self[k] = metrics_dict[k]
-                if not keep_input:
-                    del metrics_dict[k]
+            self.update_many(metrics_dict)
+            if not keep_input:
+                metrics_dict.clear()
 
     def count_bytes(self) -> int:
         """Return number of Bytes stored in this object."""
         num_bytes = 0
 
         for k, v in self.items():
-            if isinstance(v, list):
+            if isinstance(v, np.ndarray):
+                num_bytes += 8 * v.size
+            elif isinstance(v, list):
                 # both int and float normally take 4 bytes
                 # But MetricRecords are mapped to 64bit int/float
                 # during protobuffing
@@ -0,0 +1,102 @@
+"""MetricsRecord tests."""
+
+
+import numpy as np
+import pytest
+
+from common import (
+    Code,
+    ConfigsRecord,
+    FitRes,
+    Message,
+    MetricsRecord,
+    RecordSet,
+    Status,
+    ndarrays_to_parameters,
+)
+from common import recordset_compat as compat
+from common.message import Metadata
+from common.serde import message_from_frame, message_to_frame
+
+
+def _array_metrics() -> dict[str, np.ndarray]:
+    return {
+        "losses": np.array([0.5, 0.25, 0.125]),
+        "counts": np.arange(3, dtype=np.int64),
+    }
+
+
+def test_array_values_accepted() -> None:
+    """One-dimensional arrays of integers or floats are valid metrics."""
+    record = MetricsRecord(_array_metrics())
+
+    assert set(record.keys()) == {"losses", "counts"}
+
+
+@pytest.mark.parametrize(
+    "value",
+    [np.zeros((2, 2)), np.array(["a", "b"]), np.array([True, False])],
+)
+def test_invalid_array_values_rejected(value: np.ndarray) -> None:
+    """Arrays that are not 1-D arrays of integers or floats are rejected."""
+    with pytest.raises(TypeError):
+        MetricsRecord({"metric": value})
+
+
+def test_equality_with_array_values() -> None:
+    """Records holding arrays compare element-wise instead of raising."""
+    record = MetricsRecord(_array_metrics())
+
+    assert record == MetricsRecord(_array_metrics())
+    assert record == _array_metrics()
+    assert record != MetricsRecord({**_array_metrics(), "counts": np.arange(1, 4)})
+    assert record != MetricsRecord({**_array_metrics(), "counts": np.arange(4)})
+    assert record != MetricsRecord({"losses": _array_metrics()["losses"]})
+    assert record != MetricsRecord({**_array_metrics(), "counts": 3})
+
+
+def test_recordset_equality_with_array_metrics() -> None:
+    """RecordSets compare the arrays of their MetricsRecords element-wise."""
+    recordset = RecordSet({"train": MetricsRecord(_array_metrics())})
+    other = RecordSet({"train": MetricsRecord(_array_metrics())})
+
+    assert recordset == other
+    other.metrics_records["train"]["losses"] = np.array([0.5, 0.25, 0.0])
+    assert recordset != other
+
+
+def test_fitres_round_trip_with_array_metrics() -> None:
+    """The RecordSet of a FitRes with array metrics survives a frame round trip."""
+    fitres = FitRes(
+        status=Status(code=Code.OK, message="Success"),
+        parameters=ndarrays_to_parameters([np.arange(6.0).reshape(2, 3)]),
+        num_examples=10,
+        metrics={"accuracy": 0.75},
+    )
+    recordset = compat.fitres_to_recordset(fitres, keep_input=True)
+    recordset.metrics_records["fitres.history"] = MetricsRecord(_array_metrics())
+    message = Message(
+        metadata=Metadata(
+            run_id=1,
+            message_id="message",
+            src_node_id=2,
+            dst_node_id=0,
+            reply_to_message="instruction",
+            group_id="1",
+            ttl=60.0,
+            message_type="train",
+        ),
+        content=recordset,
+    )
+
+    received = message_from_frame(message_to_frame(message)).content
+
+    assert received == recordset
+    assert isinstance(received.metrics_records["fitres.history"]["losses"], np.ndarray)
+    assert compat.recordset_to_fitres(received, keep_input=True) == fitres
+
+
+def test_configs_record_equality_unchanged() -> None:
+    """Records without arrays compare as before."""
+    assert ConfigsRecord({"lr": 0.1, "epochs": 2}) == {"epochs": 2, "lr": 0.1}
+    assert ConfigsRecord({"lr": 0.1}) != ConfigsRecord({"lr": 0.2})
@@ -5,14 +5,14 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import overload, Any, cast
-from io import BytesIO
+from typing import overload, Any
 
 import numpy as np
 
 from .typeddict import TypedDict
 from ..typing import NDArray
 from ..constant import SType
+from ..parameter import bytes_to_ndarray, ndarray_to_bytes
 
 
 def _raise_array_init_error() -> None:
@@ -161,36 +161,36 @@ class Array:
         _raise_array_init_error()
 
     @classmethod
-    def from_numpy_ndarray(cls, ndarray: NDArray) -> Array:
-        """Create Array from NumPy ndarray."""
+    def from_numpy_ndarray(
+        cls, ndarray: NDArray, stype: str = SType.NUMPY_RAW
+    ) -> Array:
+        """Create Array from NumPy ndarray.
+
+        By default, the data is stored as a raw buffer (`SType.NUMPY_RAW`) that
+        `numpy(copy=False)` can read without copying it. Pass `stype=SType.NUMPY` to
+        use the `.npy` format instead.
+        """
         assert isinstance(
             ndarray, np.ndarray
         ), f"Expected NumPy ndarray, got {type(ndarray)}"
-        buffer = BytesIO()
-        # WARNING: NEVER set allow_pickle to true.
-        # Reason: loading pickled data can execute arbitrary code
-        # Source: https://numpy.org/doc/stable/reference/generated/numpy.save.html
-        np.save(buffer, ndarray, allow_pickle=False)
-        data = buffer.getvalue()
         return Array(
             dtype=str(ndarray.dtype),
             shape=list(ndarray.shape),
-            stype=SType.NUMPY,
-            data=data,
+            stype=stype,
+            data=ndarray_to_bytes(ndarray, stype),
         )
 
-    def numpy(self) -> NDArray:
-        """Return the array as a NumPy array."""
-        if self.stype != SType.NUMPY:
+    def numpy(self, copy: bool = True) -> NDArray:
+        """Return the array as a NumPy array.
+
+        If `copy` is False, arrays of stype `SType.NUMPY_RAW` are returned as
+        read-only views of `data` instead of writable copies.
+        """
+        if self.stype not in (SType.NUMPY, SType.NUMPY_RAW):
             raise TypeError(
                 f"Unsupported serialization type for numpy conversion: '{self.stype}'"
             )
-        bytes_io = BytesIO(self.data)
-        # WARNING: NEVER set allow_pickle to true.
-        # Reason: loading pickled data can execute arbitrary code
-        # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
-        ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
-        return cast(NDArray, ndarray_deserialized)
+        return bytes_to_ndarray(self.data, copy)
 
 
 def _check_key(key: str) -> None:
@@ -295,6 +295,8 @@ class ParametersRecord(TypedDict[str, Array]):
     therefore allowing to use the same or similar steps as in the example above.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         array_dict: OrderedDict[str, Array] | None = None,
@@ -302,10 +304,9 @@ class ParametersRecord(TypedDict[str, Array]):
     ) -> None:
         super().__init__(_check_key, _check_value)
         if array_dict:
-            for k in list(array_dict.keys()):
-                self[k] = array_dict[k]
-                if not keep_input:
-                    del array_dict[k]
+            self.update_many(array_dict)
+            if not keep_input:
+                array_dict.clear()
 
     def count_bytes(self) -> int:
         """Return number of Bytes stored in this object.
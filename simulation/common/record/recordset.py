@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Union, TypeVar, cast
 from textwrap import indent
 from logging import WARN
@@ -37,13 +38,16 @@ def _check_value(value: RecordType) -> None:
     
 
 class _SyncedDict(TypedDict[str, T]):
-    """A synchronized dictionary that mirrors changes to an underlying RecordSet.
+    """A live view of the records of one type held by a RecordSet.
 
-    This dictionary ensures that any modifications (set or delete operations)
-    are automatically reflected in the associated `RecordSet`. Only values of
-    the specified `allowed_type` are permitted.
+    The view shares its storage with the index the `RecordSet` keeps for the
+    type, so it always reflects the records of the `RecordSet`. Any modification
+    (set or delete operations) of the view is applied to the `RecordSet`, which
+    updates the index. Only values of the specified `allowed_type` are permitted.
     """
 
+    __slots__ = ("recordset", "allowed_type")
+
     def __init__(self, ref_recordset: RecordSet, allowed_type: type[T]) -> None:
         if not issubclass(
             allowed_type, (ParametersRecord, MetricsRecord, ConfigsRecord)
@@ -54,13 +58,21 @@ class _SyncedDict(TypedDict[str, T]):
         self.allowed_type = allowed_type
 
     def __setitem__(self, key: str, value: T) -> None:
-        super().__setitem__(key, value)
+        _check_key(key)
+        self.check_value(value)
         self.recordset[key] = cast(RecordType, value)
 
     def __delitem__(self, key: str) -> None:
-        super().__delitem__(key)
+        if key not in self:
+            raise KeyError(key)
         del self.recordset[key]
 
+    def _update_trusted(self, items: Iterable[tuple[str, T]]) -> None:
+        # pylint: disable-next=protected-access
+        self.recordset._update_trusted(
+            cast(Iterable[tuple[str, RecordType]], items)
+        )
+
     def check_value(self, value: T) -> None:
         """Check if value is of expected type."""
         if not isinstance(value, self.allowed_type):
@@ -68,8 +80,8 @@ class _SyncedDict(TypedDict[str, T]):
                 f"Expected `{self.allowed_type.__name__}`, but "
                 f"received `{type(value).__name__}` for the value."
             )
-    
-    
+
+
 class RecordSet(TypedDict[str, RecordType]):
     """RecordSet stores groups of parameters, metrics and configs.
 
@@ -142,38 +154,38 @@ class RecordSet(TypedDict[str, RecordType]):
     :code:`MetricsRecord` and :code:`ParametersRecord`.
     """
 
+    __slots__ = ("_views",)
+
     def __init__(self, records: dict[str, RecordType] | None = None) -> None:
         super().__init__(_check_key, _check_value)
+        # One view per type of record, kept up to date by `__setitem__` and
+        # `__delitem__` so that the properties below don't have to scan the records
+        self._views: tuple[
+            _SyncedDict[ParametersRecord],
+            _SyncedDict[MetricsRecord],
+            _SyncedDict[ConfigsRecord],
+        ] = (
+            _SyncedDict(self, ParametersRecord),
+            _SyncedDict(self, MetricsRecord),
+            _SyncedDict(self, ConfigsRecord),
+        )
         if records is not None:
-            for key, record in records.items():
-                self[key] = record
+            self.update_many(records)
 
     @property
     def parameters_records(self) -> TypedDict[str, ParametersRecord]:
         """Dictionary holding only ParametersRecord instances."""
-        synced_dict = _SyncedDict[ParametersRecord](self, ParametersRecord)
-        for key, record in self.items():
-            if isinstance(record, ParametersRecord):
-                synced_dict[key] = record
-        return synced_dict
+        return cast(TypedDict[str, ParametersRecord], self._views[0])
 
     @property
     def metrics_records(self) -> TypedDict[str, MetricsRecord]:
         """Dictionary holding only MetricsRecord instances."""
-        synced_dict = _SyncedDict[MetricsRecord](self, MetricsRecord)
-        for key, record in self.items():
-            if isinstance(record, MetricsRecord):
-                synced_dict[key] = record
-        return synced_dict
+        return cast(TypedDict[str, MetricsRecord], self._views[1])
 
     @property
     def configs_records(self) -> TypedDict[str, ConfigsRecord]:
         """Dictionary holding only ConfigsRecord instances."""
-        synced_dict = _SyncedDict[ConfigsRecord](self, ConfigsRecord)
-        for key, record in self.items():
-            if isinstance(record, ConfigsRecord):
-                synced_dict[key] = record
-        return synced_dict
+        return cast(TypedDict[str, ConfigsRecord], self._views[2])
 
     def __repr__(self) -> str:
         """Return a string representation of this instance."""
@@ -184,8 +196,27 @@ class RecordSet(TypedDict[str, RecordType]):
 
     def __setitem__(self, key: str, value: RecordType) -> None:
         """Set the given key to the given value after type checking."""
-        original_value = self.get(key, None)
-        super().__setitem__(key, value)
+        _check_key(key)
+        _check_value(value)
+        self._store(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """Remove the record with the specified key."""
+        record = self[key]
+        super().__delitem__(key)
+        del self._index_of(record)[key]
+
+    def _update_trusted(self, items: Iterable[tuple[str, RecordType]]) -> None:
+        for key, value in items:
+            self._store(key, value)
+
+    def _store(self, key: str, value: RecordType) -> None:
+        """Set a record that was already type checked and index it."""
+        original_value = self._data.get(key, None)
+        self._data[key] = value
+        if original_value is not None:
+            del self._index_of(original_value)[key]
+        self._index_of(value)[key] = value
         if original_value is not None and not isinstance(value, type(original_value)):
             log(
                 WARN,
@@ -193,4 +224,15 @@ class RecordSet(TypedDict[str, RecordType]):
                 key,
                 type(original_value).__name__,
                 type(value).__name__,
-            )
\ No newline at end of file
+            )
+
+    def _index_of(self, record: RecordType) -> dict[str, RecordType]:
+        """Return the storage of the view holding records of the type of `record`."""
+        if isinstance(record, ParametersRecord):
+            view = self._views[0]
+        elif isinstance(record, MetricsRecord):
+            view = self._views[1]
+        else:
+            view = self._views[2]
+        # pylint: disable-next=protected-access
+        return cast(dict[str, RecordType], view._data)
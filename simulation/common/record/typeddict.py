@@ -1,75 +1,145 @@
 """Typed dict base class for *Records."""
 
 
-from collections.abc import MutableMapping, Iterator, KeysView, ValuesView, ItemsView
-from typing import Callable, TypeVar, Generic, cast
+from collections.abc import (
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    Mapping,
+    MutableMapping,
+    ValuesView,
+)
+from typing import Any, Callable, TypeVar, Generic, Union
+
+import numpy as np
 
 
 K = TypeVar("K")  # Key type
 V = TypeVar("V")  # Value type
+TypedDictT = TypeVar("TypedDictT", bound="TypedDict[Any, Any]")
 
 
 class TypedDict(MutableMapping[K, V], Generic[K, V]):
-    """Typed dictionary."""
+    """Typed dictionary.
+
+    The key-value pairs are stored in a plain `dict` held in a slot, next to the
+    functions checking the keys and the values.
+    """
+
+    __slots__ = ("_check_key_fn", "_check_value_fn", "_data")
+
+    _check_key_fn: Callable[[K], None]
+    _check_value_fn: Callable[[V], None]
+    _data: dict[K, V]
 
     def __init__(
         self, check_key_fn: Callable[[K], None], check_value_fn: Callable[[V], None]
     ):
-        self.__dict__["_check_key_fn"] = check_key_fn
-        self.__dict__["_check_value_fn"] = check_value_fn
-        self.__dict__["_data"] = {}
+        self._check_key_fn = check_key_fn
+        self._check_value_fn = check_value_fn
+        self._data = {}
+
+    @classmethod
+    def from_trusted(
+        cls: type[TypedDictT],
+        items: Union[Mapping[Any, Any], Iterable[tuple[Any, Any]]] = (),
+    ) -> TypedDictT:
+        """Create an instance holding `items` without type checking them.
+
+        Only use it for keys and values that are known to be valid, e.g. taken from
+        another record of the same type or produced by the conversion functions of
+        `recordset_compat`.
+        """
+        instance = cls()  # type: ignore[call-arg]
+        instance._update_trusted(
+            items.items() if isinstance(items, Mapping) else items
+        )
+        return instance
+
+    def update_many(self, items: Union[Mapping[K, V], Iterable[tuple[K, V]]]) -> None:
+        """Set many key-value pairs after type checking all of them.
+
+        Nothing is set if one of the keys or values is invalid.
+        """
+        pairs = list(items.items() if isinstance(items, Mapping) else items)
+        check_key_fn, check_value_fn = self._check_key_fn, self._check_value_fn
+        for key, value in pairs:
+            check_key_fn(key)
+            check_value_fn(value)
+        self._update_trusted(pairs)
+
+    def _update_trusted(self, items: Iterable[tuple[K, V]]) -> None:
+        """Set key-value pairs that were already type checked."""
+        self._data.update(items)
 
     def __setitem__(self, key: K, value: V) -> None:
         """Set the given key to the given value after type checking."""
         # Check the types of key and value
-        cast(Callable[[K], None], self.__dict__["_check_key_fn"])(key)
-        cast(Callable[[V], None], self.__dict__["_check_value_fn"])(value)
+        self._check_key_fn(key)
+        self._check_value_fn(value)
 
         # Set key-value pair
-        cast(dict[K, V], self.__dict__["_data"])[key] = value
+        self._data[key] = value
 
     def __delitem__(self, key: K) -> None:
         """Remove the item with the specified key."""
-        del cast(dict[K, V], self.__dict__["_data"])[key]
+        del self._data[key]
 
     def __getitem__(self, item: K) -> V:
         """Return the value for the specified key."""
-        return cast(dict[K, V], self.__dict__["_data"])[item]
+        return self._data[item]
 
     def __iter__(self) -> Iterator[K]:
         """Yield an iterator over the keys of the dictionary."""
-        return iter(cast(dict[K, V], self.__dict__["_data"]))
+        return iter(self._data)
 
     def __repr__(self) -> str:
         """Return a string representation of the dictionary."""
-        return cast(dict[K, V], self.__dict__["_data"]).__repr__()
+        return self._data.__repr__()
 
     def __len__(self) -> int:
         """Return the number of items in the dictionary."""
-        return len(cast(dict[K, V], self.__dict__["_data"]))
+        return len(self._data)
 
     def __contains__(self, key: object) -> bool:
         """Check if the dictionary contains the specified key."""
-        return key in cast(dict[K, V], self.__dict__["_data"])
+        return key in self._data
 
     def __eq__(self, other: object) -> bool:
-        """Compare this instance to another dictionary or TypedDict."""
-        data = cast(dict[K, V], self.__dict__["_data"])
+        """Compare this instance to another dictionary or TypedDict.
+
+        NumPy arrays (e.g. in a `MetricsRecord`) are equal if they have the same
+        shape and elements.
+        """
         if isinstance(other, TypedDict):
-            other_data = cast(dict[K, V], other.__dict__["_data"])
-            return data == other_data
-        if isinstance(other, dict):
-            return data == other
-        return NotImplemented
+            other_data = other._data
+        elif isinstance(other, dict):
+            other_data = other
+        else:
+            return NotImplemented
+        data = self._data
+        return data.keys() == other_data.keys() and all(
+            _values_equal(value, other_data[key]) for key, value in data.items()
+        )
 
     def keys(self) -> KeysView[K]:
         """D.keys() -> a set-like object providing a view on D's keys."""
-        return cast(dict[K, V], self.__dict__["_data"]).keys()
+        return self._data.keys()
 
     def values(self) -> ValuesView[V]:
         """D.values() -> an object providing a view on D's values."""
-        return cast(dict[K, V], self.__dict__["_data"]).values()
+        return self._data.values()
 
     def items(self) -> ItemsView[K, V]:
         """D.items() -> a set-like object providing a view on D's items."""
-        return cast(dict[K, V], self.__dict__["_data"]).items()
\ No newline at end of file
+        return self._data.items()
+
+
+def _values_equal(value: Any, other: Any) -> bool:
+    """Compare two values of a TypedDict, arrays element-wise."""
+    if value is other:
+        return True
+    if isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+        return bool(np.array_equal(value, other))
+    return bool(value == other)
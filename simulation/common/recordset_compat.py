@@ -3,12 +3,15 @@
 
 from collections import OrderedDict
 from collections.abc import Mapping
-from typing import Union, get_args, cast
+from typing import Optional, Union, get_args, cast
 
 from . import Array, ConfigsRecord, MetricsRecord, ParametersRecord, RecordSet
+from .constant import SType
+from .parameter import read_raw_header
 from .typing import (
     ConfigsRecordValues,
     MetricsRecordValues,
+    NDArrays,
     EvaluateIns,
     EvaluateRes,
     FitIns,
@@ -66,6 +69,8 @@ def parametersrecord_to_parameters(
         if not keep_input:
             del record[key]
 
+    return parameters
+
 
 def parameters_to_parametersrecord(
     parameters: Parameters, keep_input: bool
@@ -74,7 +79,8 @@ def parameters_to_parametersrecord(
 
     Because there is no concept of names in the legacy Parameters, arbitrary keys will
     be used when constructing the ParametersRecord. Similarly, the shape and data type
-    won't be recorded in the Array objects.
+    won't be recorded in the Array objects, unless the tensors are raw NumPy ndarrays
+    (`SType.NUMPY_RAW`), which carry both in their header.
 
     Parameters
     ----------
@@ -94,20 +100,96 @@ def parameters_to_parametersrecord(
 
     num_arrays = len(parameters.tensors)
     ordered_dict = OrderedDict()
-    for idx in range(num_arrays):
-        if keep_input:
-            tensor = parameters.tensors[idx]
-        else:
-            tensor = parameters.tensors.pop(0)
+    for idx, tensor in enumerate(parameters.tensors):
+        dtype, shape = "", []
+        if tensor_type == SType.NUMPY_RAW:
+            # Raw tensors describe themselves, no need to deserialize them
+            raw_dtype, shape, _ = read_raw_header(tensor)
+            dtype = str(raw_dtype)
         ordered_dict[str(idx)] = Array(
-            data=tensor, dtype="", stype=tensor_type, shape=[]
+            data=tensor, dtype=dtype, stype=tensor_type, shape=shape
         )
 
+    if not keep_input:
+        # The tensors are now owned by the record
+        parameters.tensors = []
+
     if num_arrays == 0:
         ordered_dict[EMPTY_TENSOR_KEY] = Array(
             data=b"", dtype="", stype=tensor_type, shape=[]
         )
-    return ParametersRecord(ordered_dict, keep_input=keep_input)
+    # The Arrays were created above, no need to check them again
+    return ParametersRecord.from_trusted(ordered_dict)
+
+
+def parametersrecord_to_ndarrays(
+    record: ParametersRecord, copy: bool = True
+) -> NDArrays:
+    """Deserialize the arrays of a ParametersRecord, in order.
+
+    Unlike going through `parametersrecord_to_parameters` and
+    `parameters_to_ndarrays`, the record is left untouched and every `Array` is
+    deserialized directly.
+
+    Parameters
+    ----------
+    record : ParametersRecord
+        The record holding the arrays.
+    copy : bool (default: True)
+        If False, arrays of stype `SType.NUMPY_RAW` are returned as read-only views
+        of their data instead of writable copies.
+
+    Returns
+    -------
+    NDArrays
+        The arrays of the record, without the placeholder of an empty record.
+    """
+    return [
+        array.numpy(copy) for key, array in record.items() if key != EMPTY_TENSOR_KEY
+    ]
+
+
+def ndarrays_to_parametersrecord(
+    ndarrays: NDArrays,
+    names: Optional[list[str]] = None,
+    stype: str = SType.NUMPY_RAW,
+) -> ParametersRecord:
+    """Serialize NumPy ndarrays into a ParametersRecord of named Arrays.
+
+    The dtype and shape of each `Array` are taken from the ndarray, so they are
+    recorded whatever the serialization type.
+
+    Parameters
+    ----------
+    ndarrays : NDArrays
+        The arrays to serialize.
+    names : Optional[list[str]] (default: None)
+        The key of each array in the record. If None, the arrays are keyed by
+        their index, like in `parameters_to_parametersrecord`.
+    stype : str (default: SType.NUMPY_RAW)
+        The serialization type of the arrays.
+
+    Returns
+    -------
+    ParametersRecord
+        The record holding the serialized arrays.
+    """
+    if names is None:
+        names = [str(idx) for idx in range(len(ndarrays))]
+    elif len(names) != len(ndarrays):
+        raise ValueError(
+            f"Expected {len(ndarrays)} names for the arrays but got {len(names)}."
+        )
+
+    ordered_dict = OrderedDict(
+        (name, Array.from_numpy_ndarray(ndarray, stype))
+        for name, ndarray in zip(names, ndarrays)
+    )
+    if not ndarrays:
+        ordered_dict[EMPTY_TENSOR_KEY] = Array(
+            data=b"", dtype="", stype=stype, shape=[]
+        )
+    return ParametersRecord.from_trusted(ordered_dict)
 
 
 
@@ -127,24 +209,46 @@ def _check_mapping_from_recordscalartype_to_scalar(
     return cast(dict[str, Scalar], record_data)
 
 
+def recordset_to_ins_record(
+    recordset: RecordSet, ins_str: str
+) -> tuple[ParametersRecord, dict[str, Scalar]]:
+    """Return the ParametersRecord and the config of a Fit/Evaluate Ins RecordSet.
+
+    Parameters
+    ----------
+    recordset : RecordSet
+        The RecordSet of a `FitIns` or `EvaluateIns`.
+    ins_str : str
+        Either `"fitins"` or `"evaluateins"`.
+
+    Returns
+    -------
+    tuple[ParametersRecord, dict[str, Scalar]]
+        The record of the parameters, as sent, and the config.
+    """
+    parameters_record = recordset.parameters_records[f"{ins_str}.parameters"]
+
+    # get config dict
+    config_record = recordset.configs_records[f"{ins_str}.config"]
+    # pylint: disable-next=protected-access
+    config_dict = _check_mapping_from_recordscalartype_to_scalar(config_record)
+
+    return parameters_record, config_dict
+
+
 def _recordset_to_fit_or_evaluate_ins_components(
     recordset: RecordSet,
     ins_str: str,
     keep_input: bool,
 ) -> tuple[Parameters, dict[str, Scalar]]:
     """Derive Fit/Evaluate Ins from a RecordSet."""
-    # get Array and construct Parameters
-    parameters_record = recordset.parameters_records[f"{ins_str}.parameters"]
+    parameters_record, config_dict = recordset_to_ins_record(recordset, ins_str)
 
+    # get Array and construct Parameters
     parameters = parametersrecord_to_parameters(
         parameters_record, keep_input=keep_input
     )
 
-    # get config dict
-    config_record = recordset.configs_records[f"{ins_str}.config"]
-    # pylint: disable-next=protected-access
-    config_dict = _check_mapping_from_recordscalartype_to_scalar(config_record)
-
     return parameters, config_dict
 
 
@@ -179,7 +283,9 @@ def _embed_status_into_recordset(
     }
     # we add it to a `ConfigsRecord`` because the `status.message`` is a string
     # and `str` values aren't supported in `MetricsRecords`
-    recordset.configs_records[f"{res_str}.status"] = ConfigsRecord(status_dict)
+    recordset.configs_records[f"{res_str}.status"] = ConfigsRecord.from_trusted(
+        status_dict
+    )
     return recordset
 
 
@@ -293,25 +399,39 @@ def recordset_to_evaluateres(recordset: RecordSet) -> EvaluateRes:
 
 def fitres_to_recordset(fitres: FitRes, keep_input: bool) -> RecordSet:
     """Construct a RecordSet from a FitRes object."""
+    return fitres_record_to_recordset(
+        parameters_to_parametersrecord(fitres.parameters, keep_input),
+        fitres.num_examples,
+        fitres.metrics,
+        fitres.status,
+    )
+
+
+def fitres_record_to_recordset(
+    parameters_record: ParametersRecord,
+    num_examples: int,
+    metrics: dict[str, Scalar],
+    status: Status,
+) -> RecordSet:
+    """Construct the RecordSet of a FitRes from a ParametersRecord.
+
+    The RecordSet is the one `fitres_to_recordset` creates, but the parameters are
+    taken as they are instead of being converted from legacy `Parameters`.
+    """
     recordset = RecordSet()
 
     res_str = "fitres"
 
     recordset.configs_records[f"{res_str}.metrics"] = ConfigsRecord(
-        fitres.metrics  # type: ignore
+        metrics  # type: ignore
     )
     recordset.metrics_records[f"{res_str}.num_examples"] = MetricsRecord(
-        {"num_examples": fitres.num_examples},
-    )
-    recordset.parameters_records[f"{res_str}.parameters"] = (
-        parameters_to_parametersrecord(
-            fitres.parameters,
-            keep_input,
-        )
+        {"num_examples": num_examples},
     )
+    recordset.parameters_records[f"{res_str}.parameters"] = parameters_record
 
     # status
-    recordset = _embed_status_into_recordset(res_str, fitres.status, recordset)
+    recordset = _embed_status_into_recordset(res_str, status, recordset)
 
     return recordset
 
@@ -0,0 +1,520 @@
+"""Binary framing of Messages, RecordSets and Contexts.
+
+A frame is made of a header and a list of out-of-band buffers. The header holds
+everything but the payloads of the `Array`s of `ParametersRecord`s (and NumPy
+arrays stored in `MetricsRecord`s): those are appended to the buffers as they
+are, without being copied into the header, and the header only refers to them by
+index. On the wire, a frame is a fixed-size prefix, the length of every buffer,
+the header and the buffers, written with a single scatter/gather `sendmsg` call
+(where available). The receiver reads the header and all buffers into a single
+allocation and decodes `Array`s as read-only views of it, without copying them.
+"""
+
+
+import os
+import socket
+import struct
+from collections.abc import Sequence
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from .context import Context
+from .message import Error, Message, Metadata
+from .record import Array, ConfigsRecord, MetricsRecord, ParametersRecord, RecordSet
+from .typing import UserConfig
+
+# A frame: the header and the out-of-band buffers
+Frame = tuple[Union[bytes, memoryview], list[memoryview]]
+
+FRAME_MAGIC = b"FLF1"
+
+# Magic, header length and number of out-of-band buffers
+_FRAME_PREFIX = struct.Struct("<4sQI")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+# Lengths of the name, dtype and stype, number of dimensions and buffer index of an
+# Array, followed by the name, dtype and stype and the shape
+_ARRAY = struct.Struct("<IIIII")
+
+# Buffers smaller than this are copied together rather than passed to `sendmsg`
+# one by one, the copy costs less than an extra entry in the scatter/gather list
+_COALESCE_LIMIT = 1 << 16
+
+# Maximum number of buffers passed to a single `sendmsg` call
+_IOV_MAX = 1024
+if hasattr(os, "sysconf"):
+    try:
+        _IOV_MAX = min(_IOV_MAX, os.sysconf("SC_IOV_MAX"))
+    except (ValueError, OSError):
+        pass
+
+# Type tags of records
+_PARAMETERS_RECORD = b"P"
+_METRICS_RECORD = b"M"
+_CONFIGS_RECORD = b"C"
+
+# Type tags of record values; lists are tagged with `_LIST` then the tag of their
+# elements (`_EMPTY` for empty lists)
+_BOOL = b"?"
+_INT = b"i"
+_FLOAT = b"f"
+_STR = b"s"
+_BYTES = b"b"
+_NDARRAY = b"a"
+_LIST = b"l"
+_EMPTY = b"n"
+
+_SCALAR_TAGS: tuple[tuple[type, bytes], ...] = (
+    # `bool` first, it is a subclass of `int`
+    (bool, _BOOL),
+    (int, _INT),
+    (float, _FLOAT),
+    (str, _STR),
+    (bytes, _BYTES),
+)
+
+
+def _scalar_tag(value: Any) -> bytes:
+    """Return the type tag of a scalar value."""
+    for value_type, tag in _SCALAR_TAGS:
+        if isinstance(value, value_type):
+            return tag
+    raise TypeError(f"Values of type `{type(value).__name__}` cannot be serialized.")
+
+
+class FrameWriter:
+    """Encode objects into the header and the out-of-band buffers of a frame."""
+
+    def __init__(self) -> None:
+        self.header = bytearray()
+        self.buffers: list[memoryview] = []
+
+    def frame(self) -> Frame:
+        """Return the frame of everything written so far."""
+        return bytes(self.header), self.buffers
+
+    def write_u8(self, value: int) -> None:
+        """Write an unsigned 8-bit integer."""
+        self.header += _U8.pack(value)
+
+    def write_u32(self, value: int) -> None:
+        """Write an unsigned 32-bit integer."""
+        self.header += _U32.pack(value)
+
+    def write_int(self, value: int) -> None:
+        """Write a signed 64-bit integer."""
+        try:
+            self.header += _I64.pack(value)
+        except struct.error as ex:
+            raise ValueError(f"Integer {value} does not fit in 64 bits.") from ex
+
+    def write_float(self, value: float) -> None:
+        """Write a 64-bit float."""
+        self.header += _F64.pack(value)
+
+    def write_bytes(self, value: bytes) -> None:
+        """Write length-prefixed bytes."""
+        self.write_u32(len(value))
+        self.header += value
+
+    def write_str(self, value: str) -> None:
+        """Write a length-prefixed UTF-8 string."""
+        self.write_bytes(value.encode("utf-8"))
+
+    def write_optional_str(self, value: Optional[str]) -> None:
+        """Write a string that may be None."""
+        self.write_u8(value is not None)
+        if value is not None:
+            self.write_str(value)
+
+    def write_buffer(self, value: Any) -> None:
+        """Append an object supporting the buffer protocol to the buffers."""
+        self.write_u32(len(self.buffers))
+        self.buffers.append(memoryview(value).cast("B"))
+
+    def write_value(self, value: Any) -> None:
+        """Write a value of a ConfigsRecord, MetricsRecord or UserConfig."""
+        if isinstance(value, np.ndarray):
+            self.header += _NDARRAY
+            self.write_str(value.dtype.str)
+            self.write_buffer(np.ascontiguousarray(value))
+        elif isinstance(value, list):
+            self.header += _LIST
+            self._write_list(value)
+        else:
+            tag = _scalar_tag(value)
+            self.header += tag
+            self._write_scalars(tag, [value])
+
+    def write_config(self, config: UserConfig) -> None:
+        """Write a mapping of strings to values."""
+        self.write_u32(len(config))
+        for key, value in config.items():
+            self.write_str(key)
+            self.write_value(value)
+
+    def write_recordset(self, recordset: RecordSet) -> None:
+        """Write a RecordSet."""
+        self.write_u32(len(recordset))
+        for key, record in recordset.items():
+            self.write_str(key)
+            if isinstance(record, ParametersRecord):
+                self.header += _PARAMETERS_RECORD
+                self.write_u32(len(record))
+                for name, array in record.items():
+                    self._write_array(name, array)
+            else:
+                self.header += (
+                    _METRICS_RECORD
+                    if isinstance(record, MetricsRecord)
+                    else _CONFIGS_RECORD
+                )
+                self.write_config(record)  # type: ignore[arg-type]
+
+    def write_metadata(self, metadata: Metadata) -> None:
+        """Write the Metadata of a Message."""
+        self.write_int(metadata.run_id)
+        self.write_str(metadata.message_id)
+        self.write_int(metadata.src_node_id)
+        self.write_int(metadata.dst_node_id)
+        self.write_str(metadata.reply_to_message)
+        self.write_str(metadata.group_id)
+        self.write_float(metadata.ttl)
+        self.write_str(metadata.message_type)
+        self.write_float(metadata.created_at)
+        self.write_str(metadata.delivered_at)
+
+    def write_message(self, message: Message) -> None:
+        """Write a Message: its Metadata and either its content or its Error."""
+        self.write_metadata(message.metadata)
+        self.write_u8(message.has_content())
+        if message.has_content():
+            self.write_recordset(message.content)
+        else:
+            self.write_int(message.error.code)
+            self.write_optional_str(message.error.reason)
+
+    def write_context(self, context: Context) -> None:
+        """Write a Context."""
+        self.write_int(context.run_id)
+        self.write_int(context.node_id)
+        self.write_config(context.node_config)
+        self.write_recordset(context.state)
+        self.write_config(context.run_config)
+
+    def _write_array(self, name: str, array: Array) -> None:
+        # One descriptor per Array keeps the header small and quick to decode
+        name_bytes = name.encode("utf-8")
+        dtype_bytes = array.dtype.encode("utf-8")
+        stype_bytes = array.stype.encode("utf-8")
+        self.header += _ARRAY.pack(
+            len(name_bytes),
+            len(dtype_bytes),
+            len(stype_bytes),
+            len(array.shape),
+            len(self.buffers),
+        )
+        self.header += name_bytes + dtype_bytes + stype_bytes
+        self.header += struct.pack(f"<{len(array.shape)}q", *array.shape)
+        self.buffers.append(memoryview(array.data).cast("B"))
+
+    def _write_list(self, values: list[Any]) -> None:
+        if not values:
+            self.header += _EMPTY
+            return
+        tag = _scalar_tag(values[0])
+        self.header += tag
+        self.write_u32(len(values))
+        self._write_scalars(tag, values)
+
+    def _write_scalars(self, tag: bytes, values: list[Any]) -> None:
+        if tag == _INT:
+            try:
+                self.header += struct.pack(f"<{len(values)}q", *values)
+            except struct.error as ex:
+                raise ValueError("Integers must fit in 64 bits.") from ex
+        elif tag == _FLOAT:
+            self.header += struct.pack(f"<{len(values)}d", *values)
+        elif tag == _BOOL:
+            self.header += struct.pack(f"<{len(values)}?", *values)
+        elif tag == _STR:
+            for value in values:
+                self.write_str(value)
+        else:
+            for value in values:
+                self.write_bytes(value)
+
+
+class FrameReader:
+    """Decode objects from the header and the out-of-band buffers of a frame.
+
+    Arrays are decoded as views of the buffers of the frame.
+    """
+
+    def __init__(self, frame: Frame) -> None:
+        header, self.buffers = frame
+        self.header = memoryview(header)
+        self.offset = 0
+
+    def _unpack(self, fmt: struct.Struct) -> Any:
+        value = fmt.unpack_from(self.header, self.offset)[0]
+        self.offset += fmt.size
+        return value
+
+    def _unpack_many(self, fmt: str, count: int) -> tuple[Any, ...]:
+        values = struct.unpack_from(f"<{count}{fmt}", self.header, self.offset)
+        self.offset += struct.calcsize(f"<{count}{fmt}")
+        return values
+
+    def _read_tag(self) -> bytes:
+        tag = bytes(self.header[self.offset : self.offset + 1])
+        self.offset += 1
+        return tag
+
+    def read_u8(self) -> int:
+        """Read an unsigned 8-bit integer."""
+        return self._unpack(_U8)  # type: ignore[no-any-return]
+
+    def read_u32(self) -> int:
+        """Read an unsigned 32-bit integer."""
+        return self._unpack(_U32)  # type: ignore[no-any-return]
+
+    def read_int(self) -> int:
+        """Read a signed 64-bit integer."""
+        return self._unpack(_I64)  # type: ignore[no-any-return]
+
+    def read_float(self) -> float:
+        """Read a 64-bit float."""
+        return self._unpack(_F64)  # type: ignore[no-any-return]
+
+    def read_bytes(self) -> bytes:
+        """Read length-prefixed bytes."""
+        length = self.read_u32()
+        value = bytes(self.header[self.offset : self.offset + length])
+        self.offset += length
+        return value
+
+    def read_str(self) -> str:
+        """Read a length-prefixed UTF-8 string."""
+        return self.read_bytes().decode("utf-8")
+
+    def read_optional_str(self) -> Optional[str]:
+        """Read a string that may be None."""
+        return self.read_str() if self.read_u8() else None
+
+    def read_buffer(self) -> memoryview:
+        """Return the out-of-band buffer referred to by the header."""
+        return self.buffers[self.read_u32()]
+
+    def read_value(self) -> Any:
+        """Read a value of a ConfigsRecord, MetricsRecord or UserConfig."""
+        tag = self._read_tag()
+        if tag == _NDARRAY:
+            dtype = np.dtype(self.read_str())
+            return np.frombuffer(self.read_buffer(), dtype=dtype)
+        if tag == _LIST:
+            tag = self._read_tag()
+            if tag == _EMPTY:
+                return []
+            return self._read_scalars(tag, self.read_u32())
+        return self._read_scalars(tag, 1)[0]
+
+    def read_config(self) -> dict[str, Any]:
+        """Read a mapping of strings to values."""
+        return {self.read_str(): self.read_value() for _ in range(self.read_u32())}
+
+    def read_recordset(self) -> RecordSet:
+        """Read a RecordSet."""
+        records: list[tuple[str, Any]] = []
+        for _ in range(self.read_u32()):
+            key = self.read_str()
+            tag = self._read_tag()
+            if tag == _PARAMETERS_RECORD:
+                arrays = [self._read_array() for _ in range(self.read_u32())]
+                records.append((key, ParametersRecord.from_trusted(arrays)))
+            elif tag in (_METRICS_RECORD, _CONFIGS_RECORD):
+                record_type = MetricsRecord if tag == _METRICS_RECORD else ConfigsRecord
+                records.append((key, record_type.from_trusted(self.read_config())))
+            else:
+                raise ValueError(f"Unknown record type tag {tag!r}.")
+        return RecordSet.from_trusted(records)
+
+    def read_metadata(self) -> Metadata:
+        """Read the Metadata of a Message."""
+        metadata = Metadata(
+            run_id=self.read_int(),
+            message_id=self.read_str(),
+            src_node_id=self.read_int(),
+            dst_node_id=self.read_int(),
+            reply_to_message=self.read_str(),
+            group_id=self.read_str(),
+            ttl=self.read_float(),
+            message_type=self.read_str(),
+        )
+        metadata.created_at = self.read_float()
+        metadata.delivered_at = self.read_str()
+        return metadata
+
+    def read_message(self) -> Message:
+        """Read a Message, keeping the timestamps of its Metadata."""
+        metadata = self.read_metadata()
+        created_at, delivered_at = metadata.created_at, metadata.delivered_at
+        if self.read_u8():
+            message = Message(metadata=metadata, content=self.read_recordset())
+        else:
+            message = Message(
+                metadata=metadata,
+                error=Error(code=self.read_int(), reason=self.read_optional_str()),
+            )
+        # `Message` stamps the Metadata with the current time, restore it
+        metadata.created_at, metadata.delivered_at = created_at, delivered_at
+        return message
+
+    def read_context(self) -> Context:
+        """Read a Context."""
+        return Context(
+            run_id=self.read_int(),
+            node_id=self.read_int(),
+            node_config=self.read_config(),
+            state=self.read_recordset(),
+            run_config=self.read_config(),
+        )
+
+    def _read_array(self) -> tuple[str, Array]:
+        name_len, dtype_len, stype_len, ndim, index = _ARRAY.unpack_from(
+            self.header, self.offset
+        )
+        begin = self.offset + _ARRAY.size
+        dtype_begin = begin + name_len
+        stype_begin = dtype_begin + dtype_len
+        self.offset = stype_begin + stype_len
+        header = self.header
+        array = Array.__new__(Array)
+        array.dtype = str(header[dtype_begin:stype_begin], "utf-8")
+        array.stype = str(header[stype_begin : self.offset], "utf-8")
+        array.shape = list(self._unpack_many("q", ndim))
+        # A read-only view of the received data, not a copy
+        array.data = self.buffers[index]  # type: ignore[assignment]
+        return str(header[begin:dtype_begin], "utf-8"), array
+
+    def _read_scalars(self, tag: bytes, count: int) -> list[Any]:
+        if tag == _INT:
+            return list(self._unpack_many("q", count))
+        if tag == _FLOAT:
+            return list(self._unpack_many("d", count))
+        if tag == _BOOL:
+            return list(self._unpack_many("?", count))
+        if tag == _STR:
+            return [self.read_str() for _ in range(count)]
+        if tag == _BYTES:
+            return [self.read_bytes() for _ in range(count)]
+        raise ValueError(f"Unknown value type tag {tag!r}.")
+
+
+def message_to_frame(message: Message) -> Frame:
+    """Encode a Message into a frame."""
+    writer = FrameWriter()
+    writer.write_message(message)
+    return writer.frame()
+
+
+def message_from_frame(frame: Frame) -> Message:
+    """Decode a Message from a frame."""
+    return FrameReader(frame).read_message()
+
+
+def send_frame(sock: socket.socket, frame: Frame) -> None:
+    """Write a frame to a stream socket.
+
+    The prefix, the header and the out-of-band buffers are passed to `sendmsg`
+    as they are, so large buffers are not copied into an intermediate message.
+    """
+    header, buffers = frame
+    lengths = struct.pack(f"<{len(buffers)}Q", *(buffer.nbytes for buffer in buffers))
+    chunks: list[Any] = [
+        _FRAME_PREFIX.pack(FRAME_MAGIC, len(header), len(buffers)),
+        lengths,
+        header,
+        *buffers,
+    ]
+    if hasattr(sock, "sendmsg"):
+        _sendmsg_all(sock.sendmsg, chunks)
+    else:
+        sock.sendall(b"".join(chunks))
+
+
+def recv_frame(sock: socket.socket) -> Frame:
+    """Read a frame from a stream socket.
+
+    The header and the buffers are received into a single allocation, the
+    returned header and buffers are read-only views of it.
+    """
+    magic, header_len, num_buffers = _FRAME_PREFIX.unpack(
+        _recv_exact(sock, _FRAME_PREFIX.size)
+    )
+    if magic != FRAME_MAGIC:
+        raise ValueError("The data received is not a frame.")
+    lengths = struct.unpack(f"<{num_buffers}Q", _recv_exact(sock, 8 * num_buffers))
+
+    payload = memoryview(bytearray(header_len + sum(lengths)))
+    _recv_into_exact(sock, payload)
+    payload = payload.toreadonly()
+
+    buffers = []
+    offset = header_len
+    for length in lengths:
+        buffers.append(payload[offset : offset + length])
+        offset += length
+    return payload[:header_len], buffers
+
+
+def _coalesce(chunks: list[Any]) -> list[memoryview]:
+    """Join consecutive small chunks, keep large chunks as views."""
+    views: list[memoryview] = []
+    pending = bytearray()
+    for chunk in chunks:
+        view = memoryview(chunk).cast("B")
+        if view.nbytes < _COALESCE_LIMIT:
+            pending += view
+            continue
+        if pending:
+            views.append(memoryview(pending))
+            pending = bytearray()
+        views.append(view)
+    if pending:
+        views.append(memoryview(pending))
+    return views
+
+
+def _sendmsg_all(sendmsg: Callable[[Sequence[Any]], int], chunks: list[Any]) -> None:
+    """Call `sendmsg` until all chunks were sent."""
+    views = _coalesce(chunks)
+    first = 0
+    while first < len(views):
+        sent = sendmsg(views[first : first + _IOV_MAX])
+        # Skip the chunks sent entirely and the part sent of the next one
+        while first < len(views) and sent >= views[first].nbytes:
+            sent -= views[first].nbytes
+            first += 1
+        if sent > 0:
+            views[first] = views[first][sent:]
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Receive exactly `size` bytes."""
+    data = bytearray(size)
+    _recv_into_exact(sock, memoryview(data))
+    return bytes(data)
+
+
+def _recv_into_exact(sock: socket.socket, view: memoryview) -> None:
+    """Fill `view` with data received from the socket."""
+    received = 0
+    while received < view.nbytes:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise EOFError("The socket was closed while receiving a frame.")
+        received += count
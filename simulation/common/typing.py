@@ -20,7 +20,7 @@ Scalar = Union[bool, bytes, float, int, str]
 # Value types for common.MetricsRecord
 MetricsScalar = Union[int, float]
 MetricsScalarList = Union[list[int], list[float]]
-MetricsRecordValues = Union[MetricsScalar, MetricsScalarList]
+MetricsRecordValues = Union[MetricsScalar, MetricsScalarList, NDArray]
 # Value types for common.ConfigsRecord
 ConfigsScalar = Union[MetricsScalar, str, bytes, bool]
 ConfigsScalarList = Union[MetricsScalarList, list[str], list[bytes], list[bool]]
@@ -47,10 +47,17 @@ class Code(Enum):
     EVALUATE_NOT_IMPLEMENTED = 4
 
 
+# The types exchanged with every client in every round declare `__slots__`, which
+# makes them smaller and faster to access than with an instance `__dict__`. The
+# instructions also keep a `__weakref__` slot, they are cached by identity.
+
+
 @dataclass
 class Status:
     """Client status."""
 
+    __slots__ = ("code", "message")
+
     code: Code
     message: str
 
@@ -59,6 +66,8 @@ class Status:
 class Parameters:
     """Model parameters."""
 
+    __slots__ = ("tensors", "tensor_type")
+
     tensors: list[bytes]
     tensor_type: str
 
@@ -67,6 +76,8 @@ class Parameters:
 class GetParametersIns:
     """Parameters request for a client."""
 
+    __slots__ = ("config",)
+
     config: Config
 
 
@@ -74,6 +85,8 @@ class GetParametersIns:
 class GetParametersRes:
     """Response when asked to return parameters."""
 
+    __slots__ = ("status", "parameters")
+
     status: Status
     parameters: Parameters
 
@@ -82,6 +95,8 @@ class GetParametersRes:
 class FitIns:
     """Fit instructions for a client."""
 
+    __slots__ = ("parameters", "config", "__weakref__")
+
     parameters: Parameters
     config: dict[str, Scalar]
 
@@ -90,6 +105,8 @@ class FitIns:
 class FitRes:
     """Fit response from a client."""
 
+    __slots__ = ("status", "parameters", "num_examples", "metrics")
+
     status: Status
     parameters: Parameters
     num_examples: int
@@ -100,6 +117,8 @@ class FitRes:
 class EvaluateIns:
     """Evaluate instructions for a client."""
 
+    __slots__ = ("parameters", "config", "__weakref__")
+
     parameters: Parameters
     config: dict[str, Scalar]
 
@@ -108,6 +127,8 @@ class EvaluateIns:
 class EvaluateRes:
     """Evaluate response from a client."""
 
+    __slots__ = ("status", "loss", "num_examples", "metrics")
+
     status: Status
     loss: float
     num_examples: int
@@ -118,6 +139,8 @@ class EvaluateRes:
 class GetPropertiesIns:
     """Properties request for a client."""
 
+    __slots__ = ("config",)
+
     config: Config
 
 
@@ -125,6 +148,8 @@ class GetPropertiesIns:
 class GetPropertiesRes:
     """Properties response from a client."""
 
+    __slots__ = ("status", "properties")
+
     status: Status
     properties: Properties
 
@@ -184,5 +209,14 @@ class Run:
         )
     
 
+@dataclass
+class NodeChanges:
+    """Nodes that joined or left a run since a version of its node registry."""
+
+    version: int
+    joined: list[int]
+    left: list[int]
+
+
 class RunNotRunningException(BaseException):
     """Raised when a run is not running."""
\ No newline at end of file
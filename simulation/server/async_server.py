@@ -0,0 +1,307 @@
+"""Flower server training asynchronously with buffered updates (FedBuff)."""
+
+
+import concurrent.futures
+import timeit
+from logging import INFO, WARN
+from typing import Optional, Union
+
+import numpy as np
+
+from common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Parameters,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from common.logger import log
+from server.client_manager import ClientManager, IdleClientManager
+from server.client_proxy import ClientProxy
+from server.strategy import Strategy
+
+from .executor import ExecutorError, RoundExecutor
+from .history import History
+from .server import Server, fit_client, fit_client_async, resolve_client_call
+
+
+class AsyncServer(Server):
+    """Flower server training asynchronously with buffered updates (FedBuff).
+
+    Instead of waiting for all clients of a round, the server keeps `concurrency`
+    clients training at all times. Whenever a client returns, a new idle client
+    starts training on the latest global model. Results are buffered, and every
+    `buffer_size` results the global model is updated with their weighted average
+    update. One such update counts as one round: `num_rounds` is the number of
+    updates of the global model.
+
+    Clients train on the model version that was current when they started, so a
+    result can be stale by the number of updates applied since then. Each update
+    (the difference between the client's model and the model it started from) is
+    scaled by `(1 + staleness) ** -staleness_exponent` and rebased onto the current
+    model, then the strategy's `aggregate_fit` averages the results weighted by
+    their number of examples. Hence stale updates move the model less, even if all
+    updates of a buffer are equally stale. The global model moves by
+    `server_learning_rate` times that average update.
+
+    Clients to train are chosen by the strategy's `configure_fit`, called with a
+    view of the `ClientManager` that only contains idle clients.
+
+    Parameters
+    ----------
+    client_manager : ClientManager
+        The ClientManager of the available clients.
+    strategy : Optional[Strategy] (default: None)
+        The strategy configuring and aggregating training. If None, `FedAvg` is
+        used.
+    concurrency : int (default: 10)
+        Number of clients training at the same time.
+    buffer_size : int (default: 10)
+        Number of results aggregated into each update of the global model.
+    staleness_exponent : float (default: 0.5)
+        Exponent of the polynomial down-weighting of stale results. 0 disables
+        staleness weighting.
+    server_learning_rate : float (default: 1.0)
+        Step size applied to the aggregated update.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        *,
+        client_manager: ClientManager,
+        strategy: Optional[Strategy] = None,
+        concurrency: int = 10,
+        buffer_size: int = 10,
+        staleness_exponent: float = 0.5,
+        server_learning_rate: float = 1.0,
+    ) -> None:
+        super().__init__(client_manager=client_manager, strategy=strategy)
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be a positive integer.")
+        if buffer_size < 1:
+            raise ValueError("`buffer_size` must be a positive integer.")
+        if staleness_exponent < 0.0:
+            raise ValueError("`staleness_exponent` must not be negative.")
+        self.concurrency = concurrency
+        self.buffer_size = buffer_size
+        self.staleness_exponent = staleness_exponent
+        self.server_learning_rate = server_learning_rate
+
+    def staleness_weight(self, staleness: int) -> float:
+        """Return the factor applied to the update of a result of given staleness."""
+        return float((1.0 + staleness) ** -self.staleness_exponent)
+
+    def fit(self, num_rounds: int, timeout: Optional[float]) -> tuple[History, float]:
+        """Run asynchronous federated learning for a number of model updates."""
+        max_workers = max(self.max_workers or 0, self.concurrency)
+        self._executor = RoundExecutor(self.executor_type, max_workers)
+        try:
+            return self._fit(num_rounds, timeout)
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.strategy.shutdown()
+
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    def _fit(self, num_rounds: int, timeout: Optional[float]) -> tuple[History, float]:
+        """Keep clients training and update the global model every buffer."""
+        history = History()
+
+        # Initialize parameters
+        log(INFO, "[INIT]")
+        self.parameters = self._get_initial_parameters(server_round=0, timeout=timeout)
+        log(INFO, "Starting evaluation of initial global parameters")
+        res = self.strategy.evaluate(0, parameters=self.parameters)
+        if res is not None:
+            log(
+                INFO,
+                "initial parameters (loss, other metrics): %s, %s",
+                res[0],
+                res[1],
+            )
+            history.add_loss_centralized(server_round=0, loss=res[0])
+            history.add_metrics_centralized(server_round=0, metrics=res[1])
+
+        start_time = timeit.default_timer()
+        executor: RoundExecutor = self._executor  # type: ignore[assignment]
+        busy: set[str] = set()
+        idle_clients = IdleClientManager(self._client_manager, busy=busy)
+
+        # The clients in flight, the model version they started from, and the
+        # models of those versions (as long as they are needed for rebasing)
+        version = 0
+        inflight: dict[
+            concurrent.futures.Future, tuple[ClientProxy, int]  # type: ignore[type-arg]
+        ] = {}
+        base_models: dict[int, NDArrays] = {}
+        base_refs: dict[int, int] = {}
+
+        results: list[tuple[ClientProxy, FitRes, int]] = []
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]] = []
+        executor.reset_metrics()
+
+        while version < num_rounds:
+            # Keep `concurrency` clients training on the latest model
+            free_slots = self.concurrency - len(inflight)
+            if free_slots > 0:
+                client_instructions = self.strategy.configure_fit(
+                    server_round=version + 1,
+                    parameters=self.parameters,
+                    client_manager=idle_clients,
+                )
+                for client, ins in client_instructions[:free_slots]:
+                    call = resolve_client_call(
+                        executor, client, fit_client, fit_client_async
+                    )
+                    inflight[
+                        executor.submit(call, client, ins, timeout, version + 1)
+                    ] = (client, version)
+                    busy.add(client.cid)
+                    if version not in base_models:
+                        base_models[version] = parameters_to_ndarrays(
+                            self.parameters, copy=False
+                        )
+                    base_refs[version] = base_refs.get(version, 0) + 1
+
+            if not inflight:
+                log(WARN, "AsyncServer: no clients available for training, stopping")
+                break
+
+            # Wait for at least one client to finish
+            done_fs, _ = concurrent.futures.wait(
+                inflight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done_fs:
+                client, client_version = inflight.pop(future)
+                busy.discard(client.cid)
+                failure = future.exception()
+                if isinstance(failure, ExecutorError):
+                    raise failure
+                if failure is not None:
+                    failures.append(failure)
+                else:
+                    _, fit_res = future.result()
+                    if fit_res.status.code == Code.OK:
+                        if client_version != version:
+                            fit_res = self._rebase(
+                                fit_res,
+                                base_models[client_version],
+                                self.staleness_weight(version - client_version),
+                            )
+                        results.append((client, fit_res, version - client_version))
+                    else:
+                        failures.append((client, fit_res))
+                base_refs[client_version] -= 1
+                if base_refs[client_version] == 0:
+                    del base_refs[client_version]
+                    if client_version != version:
+                        del base_models[client_version]
+
+            if len(results) < self.buffer_size:
+                continue
+
+            # Apply the buffered updates to the global model
+            version += 1
+            log(INFO, "")
+            log(INFO, "[ROUND %s]", version)
+            staleness = [item[2] for item in results]
+            parameters_prime, fit_metrics = self.strategy.aggregate_fit(
+                version,
+                [(client, fit_res) for client, fit_res, _ in results],
+                failures,
+            )
+            log(
+                INFO,
+                "aggregate_fit: received %s results and %s failures "
+                "(staleness: mean %.2f, max %s)",
+                len(results),
+                len(failures),
+                float(np.mean(staleness)),
+                max(staleness),
+            )
+            results, failures = [], []
+            if parameters_prime is not None:
+                self.parameters = self._step(parameters_prime)
+            history.add_metrics_distributed_fit(
+                server_round=version, metrics=fit_metrics
+            )
+            if version - 1 not in base_refs:
+                base_models.pop(version - 1, None)
+
+            # Evaluate model using strategy implementation
+            res_cen = self.strategy.evaluate(version, parameters=self.parameters)
+            if res_cen is not None:
+                loss_cen, metrics_cen = res_cen
+                log(
+                    INFO,
+                    "fit progress: (%s, %s, %s, %s)",
+                    version,
+                    loss_cen,
+                    metrics_cen,
+                    timeit.default_timer() - start_time,
+                )
+                history.add_loss_centralized(server_round=version, loss=loss_cen)
+                history.add_metrics_centralized(
+                    server_round=version, metrics=metrics_cen
+                )
+
+            # Record how busy the executor was since the previous update
+            executor_metrics = executor.metrics()
+            log(INFO, "executor: %s", executor_metrics)
+            history.add_metrics_executor(server_round=version, metrics=executor_metrics)
+            executor.reset_metrics()
+
+        # Clients still training are not needed anymore
+        for future in inflight:
+            future.cancel()
+        if inflight:
+            history.add_stragglers(
+                server_round=version,
+                cids=[client.cid for client, _ in inflight.values()],
+            )
+
+        # Evaluate the final model on a sample of clients
+        res_fed = self.evaluate_round(server_round=version, timeout=timeout)
+        if res_fed is not None:
+            loss_fed, evaluate_metrics_fed, _ = res_fed
+            if loss_fed is not None:
+                history.add_loss_distributed(server_round=version, loss=loss_fed)
+                history.add_metrics_distributed(
+                    server_round=version, metrics=evaluate_metrics_fed
+                )
+
+        elapsed = timeit.default_timer() - start_time
+        return history, elapsed
+
+    def _rebase(self, fit_res: FitRes, base: NDArrays, weight: float) -> FitRes:
+        """Apply the update a client made to `base`, times `weight`, to the model."""
+        current = parameters_to_ndarrays(self.parameters, copy=False)
+        rebased = [
+            (layer + weight * (update - base_layer)).astype(layer.dtype, copy=False)
+            for layer, update, base_layer in zip(
+                current, parameters_to_ndarrays(fit_res.parameters, copy=False), base
+            )
+        ]
+        return FitRes(
+            status=fit_res.status,
+            parameters=ndarrays_to_parameters(rebased),
+            num_examples=fit_res.num_examples,
+            metrics=fit_res.metrics,
+        )
+
+    def _step(self, parameters_aggregated: Parameters) -> Parameters:
+        """Move the global model towards the aggregate by the server learning rate."""
+        if self.server_learning_rate == 1.0:
+            return parameters_aggregated
+        current = parameters_to_ndarrays(self.parameters, copy=False)
+        aggregated = parameters_to_ndarrays(parameters_aggregated, copy=False)
+        return ndarrays_to_parameters(
+            [
+                (layer + self.server_learning_rate * (new - layer)).astype(
+                    layer.dtype, copy=False
+                )
+                for layer, new in zip(current, aggregated)
+            ]
+        )
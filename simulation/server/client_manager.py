@@ -190,4 +190,69 @@ class SimpleClientManager(ClientManager):
             return []
 
         sampled_cids = random.sample(available_cids, num_clients)
-        return [self.clients[cid] for cid in sampled_cids]
\ No newline at end of file
+        return [self.clients[cid] for cid in sampled_cids]
+
+
+class IdleClientManager(ClientManager):
+    """View of a `ClientManager` restricted to the clients not training right now.
+
+    Sampling never blocks: if fewer clients are idle than requested, `sample`
+    returns an empty list.
+    """
+
+    def __init__(self, client_manager: ClientManager, busy: set[str]) -> None:
+        self._client_manager = client_manager
+        self._busy = busy
+
+    def num_available(self) -> int:
+        """Return the number of idle clients."""
+        return len(self.all())
+
+    def register(self, client: ClientProxy) -> bool:
+        """Register a client with the underlying ClientManager."""
+        return self._client_manager.register(client)
+
+    def unregister(self, client: ClientProxy) -> None:
+        """Unregister a client from the underlying ClientManager."""
+        self._client_manager.unregister(client)
+
+    def all(self) -> dict[str, ClientProxy]:
+        """Return all idle clients."""
+        return {
+            cid: client
+            for cid, client in self._client_manager.all().items()
+            if cid not in self._busy
+        }
+
+    def wait_for(self, num_clients: int, timeout: int = 0) -> bool:
+        """Return whether at least `num_clients` are idle, without waiting."""
+        return self.num_available() >= num_clients
+
+    def sample(
+        self,
+        num_clients: int,
+        min_num_clients: Optional[int] = None,
+        criterion: Optional[Criterion] = None,
+    ) -> list[ClientProxy]:
+        """Sample idle clients, or return an empty list if too few are idle."""
+        if min_num_clients is not None and not self.wait_for(min_num_clients):
+            return []
+        return self._client_manager.sample(
+            num_clients,
+            min_num_clients=0,
+            criterion=_IdleCriterion(self._busy, criterion),
+        )
+
+
+class _IdleCriterion(Criterion):
+    """Select idle clients that also meet an optional criterion."""
+
+    def __init__(self, busy: set[str], criterion: Optional[Criterion]) -> None:
+        self._busy = busy
+        self._criterion = criterion
+
+    def select(self, client: ClientProxy) -> bool:
+        """Decide whether a client is idle and eligible for sampling."""
+        if client.cid in self._busy:
+            return False
+        return self._criterion is None or self._criterion.select(client)
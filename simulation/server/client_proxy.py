@@ -1,6 +1,8 @@
 """Flower client (abstract base class)."""
 
 
+import asyncio
+import concurrent.futures
 from abc import ABC, abstractmethod
 from typing import Optional
 
@@ -72,4 +74,138 @@ class ClientProxy(ABC):
         group_id: Optional[int],
     ) -> DisconnectRes:
         """Disconnect and (optionally) reconnect later."""
-        
\ No newline at end of file
+
+    def withdraw(self, group_id: Optional[int]) -> None:
+        """Withdraw the instructions of `group_id` the client has not received yet.
+
+        The calls waiting for the results of withdrawn instructions fail without
+        waiting any longer. Client proxies that cannot withdraw instructions (the
+        default) do nothing.
+        """
+
+    def start_fit(
+        self,
+        ins: FitIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> Optional[concurrent.futures.Future[FitRes]]:
+        """Send the instructions of `fit` and return a future for its result.
+
+        Lets the `Server` start the calls of all the clients of a round at once,
+        without a thread waiting for each of them. The future is running, it
+        cannot be cancelled (see `withdraw`). Client proxies that cannot call the
+        client without waiting (the default) return None, `fit` is called instead.
+        """
+        return None
+
+    def start_evaluate(
+        self,
+        ins: EvaluateIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> Optional[concurrent.futures.Future[EvaluateRes]]:
+        """Send the instructions of `evaluate` and return a future for its result.
+
+        See `start_fit`.
+        """
+        return None
+        
+
+class AsyncClientProxy(ClientProxy):
+    """Abstract base class for client proxies whose calls are coroutines.
+
+    A `Server` using the `"asyncio"` executor awaits the `*_async` methods on its
+    event loop, so waiting for a client does not occupy a thread. The synchronous
+    methods run the corresponding coroutine to completion in a new event loop.
+    """
+
+    @abstractmethod
+    async def get_properties_async(
+        self,
+        ins: GetPropertiesIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> GetPropertiesRes:
+        """Return the client's properties."""
+
+    @abstractmethod
+    async def get_parameters_async(
+        self,
+        ins: GetParametersIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> GetParametersRes:
+        """Return the current local model parameters."""
+
+    @abstractmethod
+    async def fit_async(
+        self,
+        ins: FitIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> FitRes:
+        """Refine the provided parameters using the locally held dataset."""
+
+    @abstractmethod
+    async def evaluate_async(
+        self,
+        ins: EvaluateIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> EvaluateRes:
+        """Evaluate the provided parameters using the locally held dataset."""
+
+    @abstractmethod
+    async def reconnect_async(
+        self,
+        ins: ReconnectIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> DisconnectRes:
+        """Disconnect and (optionally) reconnect later."""
+
+    def get_properties(
+        self,
+        ins: GetPropertiesIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> GetPropertiesRes:
+        """Return the client's properties."""
+        return asyncio.run(self.get_properties_async(ins, timeout, group_id))
+
+    def get_parameters(
+        self,
+        ins: GetParametersIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> GetParametersRes:
+        """Return the current local model parameters."""
+        return asyncio.run(self.get_parameters_async(ins, timeout, group_id))
+
+    def fit(
+        self,
+        ins: FitIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> FitRes:
+        """Refine the provided parameters using the locally held dataset."""
+        return asyncio.run(self.fit_async(ins, timeout, group_id))
+
+    def evaluate(
+        self,
+        ins: EvaluateIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> EvaluateRes:
+        """Evaluate the provided parameters using the locally held dataset."""
+        return asyncio.run(self.evaluate_async(ins, timeout, group_id))
+
+    def reconnect(
+        self,
+        ins: ReconnectIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> DisconnectRes:
+        """Disconnect and (optionally) reconnect later."""
+        return asyncio.run(self.reconnect_async(ins, timeout, group_id))
+
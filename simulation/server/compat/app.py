@@ -10,7 +10,7 @@ from server.server_config import ServerConfig
 from server.strategy import Strategy
 from server.history import History
 from server.client_manager import ClientManager
-from ..driver import Driver
+from ..driver import Driver, MessageDispatcher, SyncDriverBridge
 from .app_utils import start_update_client_manager_thread
 
 
@@ -31,7 +31,13 @@ def start_driver(
     server : Optional[flwr.server.Server] (default: None)
         A server implementation, either `flwr.server.Server` or a subclass
         thereof. If no instance is provided, then `start_driver` will create
-        one.
+        one. If its executor type is `"asyncio"`, the clients are called through
+        an `AsyncDriver` bridging `driver`, so a single event loop waits for all
+        of them. Otherwise, the server hands the messages of all clients of a
+        round over at once (see `ClientProxy.start_fit`), without a thread per
+        client. Either way, the messages of a round are pushed, and their
+        replies pulled, in batches by a `MessageDispatcher`. Its executor type
+        cannot be `"process"`: the client proxies of a Driver cannot be pickled.
     config : Optional[ServerConfig] (default: None)
         Currently supported values are `num_rounds` (int, default: 1) and
         `round_timeout` in seconds (float, default: None).
@@ -56,6 +62,11 @@ def start_driver(
         strategy=strategy,
         client_manager=client_manager,
     )
+    if initialized_server.executor_type == "process":
+        raise ValueError(
+            "The `process` executor type cannot be used with a Driver, its client "
+            "proxies cannot be pickled. Use the `thread` or `asyncio` executor type."
+        )
     log(
         INFO,
         "Starting Flower ServerApp, config: %s",
@@ -63,9 +74,19 @@ def start_driver(
     )
     log(INFO, "")
 
+    # Messages of all clients are pushed, and their replies pulled, in batches
+    dispatcher = MessageDispatcher(driver)
+
+    # With the asyncio executor, clients are awaited from its event loop
+    async_driver = (
+        SyncDriverBridge(driver, dispatcher)
+        if initialized_server.executor_type == "asyncio"
+        else None
+    )
+
     # Start the thread updating nodes
     thread, f_stop, c_done = start_update_client_manager_thread(
-        driver, initialized_server.client_manager()
+        driver, initialized_server.client_manager(), async_driver, dispatcher
     )
 
     # Wait until the node registration done
@@ -80,5 +101,6 @@ def start_driver(
     # Terminate the thread
     f_stop.set()
     thread.join()
+    dispatcher.close()
 
     return hist
\ No newline at end of file
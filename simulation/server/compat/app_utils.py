@@ -2,21 +2,34 @@
 
 
 import threading
+from typing import Optional, Union
 
 from common.typing import RunNotRunningException
 from server.client_manager import ClientManager
-from server.driver import Driver
+from server.driver import AsyncDriver, Driver, MessageDispatcher
+from .async_driver_client_proxy import AsyncDriverClientProxy
+from .broadcast_cache import BroadcastCache
 from .driver_client_proxy import DriverClientProxy
 
+# Longest time in seconds the thread waits for node changes before checking if it
+# should stop
+_NODE_CHANGES_TIMEOUT = 0.2
+
+
 def start_update_client_manager_thread(
     driver: Driver,
     client_manager: ClientManager,
+    async_driver: Optional[AsyncDriver] = None,
+    dispatcher: Optional[MessageDispatcher] = None,
 ) -> tuple[threading.Thread, threading.Event, threading.Event]:
-    """Periodically update the nodes list in the client manager in a thread.
+    """Keep the nodes list in the client manager up to date in a thread.
 
-    This function starts a thread that periodically uses the associated driver to
-    get all node_ids. Each node_id is then converted into a `DriverClientProxy`
-    instance and stored in the `registered_nodes` dictionary with node_id as key.
+    This function starts a thread that waits for the driver to report the nodes
+    that joined or left (see `Driver.get_node_changes`), so changes are applied as
+    soon as they happen, in time proportional to their number. Each new node_id is
+    converted into a `DriverClientProxy` instance (an `AsyncDriverClientProxy`
+    sending messages through `async_driver`, if given) and stored in the
+    `registered_nodes` dictionary with node_id as key.
 
     New nodes will be added to the ClientManager via `client_manager.register()`,
     and dead nodes will be removed from the ClientManager via
@@ -28,6 +41,11 @@ def start_update_client_manager_thread(
         The Driver object to use.
     client_manager : ClientManager
         The ClientManager object to be updated.
+    async_driver : Optional[AsyncDriver] (default: None)
+        If given, the client proxies send messages through it instead of `driver`.
+    dispatcher : Optional[MessageDispatcher] (default: None)
+        If given, the `DriverClientProxy` instances send messages through it, so
+        the messages of a round are pushed and their replies pulled in batches.
 
     Returns
     -------
@@ -47,6 +65,8 @@ def start_update_client_manager_thread(
             client_manager,
             f_stop,
             c_done,
+            async_driver,
+            dispatcher,
         ),
         daemon=True,
     )
@@ -60,32 +80,48 @@ def _update_client_manager(
     client_manager: ClientManager,
     f_stop: threading.Event,
     c_done: threading.Event,
+    async_driver: Optional[AsyncDriver] = None,
+    dispatcher: Optional[MessageDispatcher] = None,
 ) -> None:
     """Update the nodes list in the client manager."""
     # Loop until the driver is disconnected
-    registered_nodes: dict[int, DriverClientProxy] = {}
+    registered_nodes: dict[int, Union[DriverClientProxy, AsyncDriverClientProxy]] = {}
+    # Shared by all proxies, so instructions are converted once per round
+    broadcast_cache = BroadcastCache()
+    version = 0
+    timeout = 0.0  # The first pass registers the nodes already known
     while not f_stop.is_set():
         try:
-            all_node_ids = set(driver.get_node_ids())
+            changes = driver.get_node_changes(version, timeout=timeout)
         except RunNotRunningException:
             f_stop.set()
             break
-        dead_nodes = set(registered_nodes).difference(all_node_ids)
-        new_nodes = all_node_ids.difference(registered_nodes)
+        version = changes.version
 
         # Unregister dead nodes
-        for node_id in dead_nodes:
-            client_proxy = registered_nodes[node_id]
-            client_manager.unregister(client_proxy)
-            del registered_nodes[node_id]
+        for node_id in changes.left:
+            client_proxy = registered_nodes.pop(node_id, None)
+            if client_proxy is not None:
+                client_manager.unregister(client_proxy)
 
         # Register new nodes
-        for node_id in new_nodes:
-            client_proxy = DriverClientProxy(
-                node_id=node_id,
-                driver=driver,
-                run_id=driver.run.run_id,
-            )
+        for node_id in changes.joined:
+            client_proxy: Union[DriverClientProxy, AsyncDriverClientProxy]
+            if async_driver is not None:
+                client_proxy = AsyncDriverClientProxy(
+                    node_id=node_id,
+                    driver=async_driver,
+                    run_id=driver.run.run_id,
+                    broadcast_cache=broadcast_cache,
+                )
+            else:
+                client_proxy = DriverClientProxy(
+                    node_id=node_id,
+                    driver=driver,
+                    run_id=driver.run.run_id,
+                    broadcast_cache=broadcast_cache,
+                    dispatcher=dispatcher,
+                )
             if client_manager.register(client_proxy):
                 registered_nodes[node_id] = client_proxy
             else:
@@ -93,7 +129,4 @@ def _update_client_manager(
 
         # Flag first pass for nodes registration is completed
         c_done.set()
-
-        # Sleep for 3 seconds
-        if not f_stop.is_set():
-            f_stop.wait(3)
\ No newline at end of file
+        timeout = _NODE_CHANGES_TIMEOUT
@@ -0,0 +1,119 @@
+"""Flower ClientProxy implementation for the asyncio Driver API."""
+
+
+from typing import Optional
+
+import common
+from common import recordset_compat as compat
+from common import MessageType, MessageTypeLegacy, RecordSet
+from server.driver.async_driver import AsyncDriver
+from server.client_proxy import AsyncClientProxy
+
+from .broadcast_cache import BroadcastCache
+from .driver_client_proxy import (
+    InFlightMessages,
+    evaluateins_to_recordset,
+    fitins_to_recordset,
+    reply_content,
+)
+
+
+class AsyncDriverClientProxy(AsyncClientProxy):
+    """Flower client proxy which delegates work using the `AsyncDriver` API.
+
+    Awaiting a reply does not block a thread, so a `Server` using the `"asyncio"`
+    executor can wait for all the clients of a round from a single event loop.
+    """
+
+    def __init__(
+        self,
+        node_id: int,
+        driver: AsyncDriver,
+        run_id: int,
+        broadcast_cache: Optional[BroadcastCache] = None,
+    ):
+        super().__init__(str(node_id))
+        self.node_id = node_id
+        self.driver = driver
+        self.run_id = run_id
+        self.broadcast_cache = broadcast_cache
+        self._in_flight = InFlightMessages()
+
+    async def get_properties_async(
+        self,
+        ins: common.GetPropertiesIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> common.GetPropertiesRes:
+        """Return client's properties."""
+        out_recordset = compat.getpropertiesins_to_recordset(ins)
+        in_recordset = await self._send_receive_recordset(
+            out_recordset, MessageTypeLegacy.GET_PROPERTIES, timeout, group_id
+        )
+        return compat.recordset_to_getpropertiesres(in_recordset)
+
+    async def get_parameters_async(
+        self,
+        ins: common.GetParametersIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> common.GetParametersRes:
+        """Return the current local model parameters."""
+        out_recordset = compat.getparametersins_to_recordset(ins)
+        in_recordset = await self._send_receive_recordset(
+            out_recordset, MessageTypeLegacy.GET_PARAMETERS, timeout, group_id
+        )
+        return compat.recordset_to_getparametersres(in_recordset, False)
+
+    async def fit_async(
+        self, ins: common.FitIns, timeout: Optional[float], group_id: Optional[int]
+    ) -> common.FitRes:
+        """Train model parameters on the locally held dataset."""
+        out_recordset = fitins_to_recordset(ins, group_id, self.broadcast_cache)
+        in_recordset = await self._send_receive_recordset(
+            out_recordset, MessageType.TRAIN, timeout, group_id
+        )
+        return compat.recordset_to_fitres(in_recordset, keep_input=False)
+
+    async def evaluate_async(
+        self, ins: common.EvaluateIns, timeout: Optional[float], group_id: Optional[int]
+    ) -> common.EvaluateRes:
+        """Evaluate model parameters on the locally held dataset."""
+        out_recordset = evaluateins_to_recordset(ins, group_id, self.broadcast_cache)
+        in_recordset = await self._send_receive_recordset(
+            out_recordset, MessageType.EVALUATE, timeout, group_id
+        )
+        return compat.recordset_to_evaluateres(in_recordset)
+
+    async def reconnect_async(
+        self,
+        ins: common.ReconnectIns,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> common.DisconnectRes:
+        """Disconnect and (optionally) reconnect later."""
+        return common.DisconnectRes(reason="")  # Nothing to do here (yet)
+
+    def withdraw(self, group_id: Optional[int]) -> None:
+        """Withdraw the messages of `group_id` not yet delivered to the node."""
+        self._in_flight.withdraw(self.driver, group_id)
+
+    async def _send_receive_recordset(
+        self,
+        recordset: RecordSet,
+        message_type: str,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> RecordSet:
+        message = self.driver.create_message(
+            content=recordset,
+            message_type=message_type,
+            dst_node_id=self.node_id,
+            group_id=str(group_id) if group_id else "",
+            ttl=timeout,
+        )
+        with self._in_flight.track(message):
+            messages = await self.driver.send_and_receive(
+                messages=[message], timeout=timeout
+            )
+        return reply_content(list(messages))
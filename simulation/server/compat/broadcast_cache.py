@@ -0,0 +1,140 @@
+"""Round-level cache of the RecordSets broadcast to the clients."""
+
+
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from common import (
+    ConfigsRecord,
+    EvaluateIns,
+    FitIns,
+    MessageType,
+    MetricsRecord,
+    ParametersRecord,
+    RecordSet,
+)
+from common import recordset_compat as compat
+from common.record.recordset import RecordType
+
+InsType = TypeVar("InsType", FitIns, EvaluateIns)
+
+
+class _ReadOnlyRecordMixin:
+    """Reject modifications of a record once it is shared between messages."""
+
+    __slots__ = ()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if getattr(self, "_read_only", False):
+            _raise_read_only(self)
+        super().__setitem__(key, value)  # type: ignore[misc]
+
+    def __delitem__(self, key: str) -> None:
+        if getattr(self, "_read_only", False):
+            _raise_read_only(self)
+        super().__delitem__(key)  # type: ignore[misc]
+
+    def _update_trusted(self, items: Iterable[tuple[str, Any]]) -> None:
+        # Also called by `update_many`, which bypasses `__setitem__`
+        if getattr(self, "_read_only", False):
+            _raise_read_only(self)
+        super()._update_trusted(items)  # type: ignore[misc]
+
+
+def _raise_read_only(record: object) -> None:
+    raise TypeError(
+        f"`{type(record).__name__}` is shared by all messages of the round and "
+        "cannot be modified. Replace it in the RecordSet of the message instead."
+    )
+
+
+class SharedParametersRecord(_ReadOnlyRecordMixin, ParametersRecord):
+    """A read-only `ParametersRecord` shared by several messages."""
+
+    __slots__ = ("_read_only",)
+
+
+class SharedConfigsRecord(_ReadOnlyRecordMixin, ConfigsRecord):
+    """A read-only `ConfigsRecord` shared by several messages."""
+
+    __slots__ = ("_read_only",)
+
+
+class SharedMetricsRecord(_ReadOnlyRecordMixin, MetricsRecord):
+    """A read-only `MetricsRecord` shared by several messages."""
+
+    __slots__ = ("_read_only",)
+
+
+def _share(record: RecordType) -> RecordType:
+    """Return a read-only copy of a record (the values are not copied)."""
+    shared: Union[SharedParametersRecord, SharedConfigsRecord, SharedMetricsRecord]
+    # The values were checked when they were added to `record`
+    if isinstance(record, ParametersRecord):
+        shared = SharedParametersRecord.from_trusted(record)
+    elif isinstance(record, ConfigsRecord):
+        shared = SharedConfigsRecord.from_trusted(record)
+    else:
+        shared = SharedMetricsRecord.from_trusted(record)
+    shared._read_only = True  # pylint: disable=protected-access
+    return shared
+
+
+class BroadcastCache:
+    """Round-level cache of the RecordSets broadcast to the clients.
+
+    Strategies usually send the same `FitIns` (or `EvaluateIns`) object to all
+    clients sampled in a round. Instead of converting it into a `RecordSet` once per
+    client, the cache converts it once per round and gives every message its own
+    shallow copy of the result. The copies share the same, read-only, records, so
+    the global parameters are wrapped into a `ParametersRecord` only once. The
+    sharing is copy-on-write: replacing a record in the `RecordSet` of one message
+    does not affect the other messages, while modifying a shared record in place
+    raises a `TypeError`.
+
+    An instruction is identified by the identity of the `FitIns`/`EvaluateIns`
+    object and by the round (`group_id`). Only the instruction of the latest round
+    is kept for each message type.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[
+            str, tuple[weakref.ReferenceType[Any], Optional[int], RecordSet]
+        ] = {}
+
+    def fitins_to_recordset(self, ins: FitIns, group_id: Optional[int]) -> RecordSet:
+        """Return a RecordSet for a FitIns, converting it once per round."""
+        return self._get_recordset(
+            MessageType.TRAIN, ins, group_id, compat.fitins_to_recordset
+        )
+
+    def evaluateins_to_recordset(
+        self, ins: EvaluateIns, group_id: Optional[int]
+    ) -> RecordSet:
+        """Return a RecordSet for an EvaluateIns, converting it once per round."""
+        return self._get_recordset(
+            MessageType.EVALUATE, ins, group_id, compat.evaluateins_to_recordset
+        )
+
+    def _get_recordset(
+        self,
+        message_type: str,
+        ins: InsType,
+        group_id: Optional[int],
+        to_recordset: Callable[[InsType, bool], RecordSet],
+    ) -> RecordSet:
+        # Convert the instruction while holding the lock, so that clients of the
+        # same round wait for the first conversion instead of repeating it
+        with self._lock:
+            entry = self._entries.get(message_type)
+            if entry is None or entry[0]() is not ins or entry[1] != group_id:
+                template = to_recordset(ins, True)
+                for key, record in list(template.items()):
+                    template[key] = _share(record)
+                entry = (weakref.ref(ins), group_id, template)
+                self._entries[message_type] = entry
+            template = entry[2]
+        return RecordSet.from_trusted(template)
@@ -1,23 +1,51 @@
 """Flower ClientProxy implementation for Driver API."""
 
 
-from typing import Optional
+import concurrent.futures
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Optional, Union
 
 import common
 from common import recordset_compat as compat
 from common import Message, MessageType, MessageTypeLegacy, RecordSet
+from server.driver.async_driver import AsyncDriver
+from server.driver.dispatcher import MessageDispatcher
 from server.driver.driver import Driver
 from server.client_proxy import ClientProxy
 
+from .broadcast_cache import BroadcastCache
+
 
 class DriverClientProxy(ClientProxy):
-    """Flower client proxy which delegates work using the Driver API."""
+    """Flower client proxy which delegates work using the Driver API.
+
+    Proxies sharing a `BroadcastCache` convert the `FitIns`/`EvaluateIns` sent to
+    all clients of a round into a `RecordSet` only once. Proxies sharing a
+    `MessageDispatcher` push the messages of a round and pull their replies in
+    batches, instead of each proxy pushing its message and polling for its reply.
+    With a dispatcher, `start_fit` and `start_evaluate` hand the message over and
+    return at once, so the `Server` waits for all clients of a round without a
+    thread per client.
+    """
 
-    def __init__(self, node_id: int, driver: Driver, run_id: int):
+    def __init__(  # pylint: disable=too-many-arguments,R0917
+        self,
+        node_id: int,
+        driver: Driver,
+        run_id: int,
+        broadcast_cache: Optional[BroadcastCache] = None,
+        dispatcher: Optional[MessageDispatcher] = None,
+    ):
         super().__init__(str(node_id))
         self.node_id = node_id
         self.driver = driver
         self.run_id = run_id
+        self.broadcast_cache = broadcast_cache
+        self.dispatcher = dispatcher
+        self._in_flight = InFlightMessages()
 
     def get_properties(
         self,
@@ -56,7 +84,7 @@ class DriverClientProxy(ClientProxy):
     ) -> common.FitRes:
         """Train model parameters on the locally held dataset."""
         # Ins to RecordSet
-        out_recordset = compat.fitins_to_recordset(ins, keep_input=True)
+        out_recordset = fitins_to_recordset(ins, group_id, self.broadcast_cache)
         # Fetch response
         in_recordset = self._send_receive_recordset(
             out_recordset, MessageType.TRAIN, timeout, group_id
@@ -69,7 +97,7 @@ class DriverClientProxy(ClientProxy):
     ) -> common.EvaluateRes:
         """Evaluate model parameters on the locally held dataset."""
         # Ins to RecordSet
-        out_recordset = compat.evaluateins_to_recordset(ins, keep_input=True)
+        out_recordset = evaluateins_to_recordset(ins, group_id, self.broadcast_cache)
         # Fetch response
         in_recordset = self._send_receive_recordset(
             out_recordset, MessageType.EVALUATE, timeout, group_id
@@ -77,6 +105,36 @@ class DriverClientProxy(ClientProxy):
         # RecordSet to Res
         return compat.recordset_to_evaluateres(in_recordset)
 
+    def start_fit(
+        self, ins: common.FitIns, timeout: Optional[float], group_id: Optional[int]
+    ) -> Optional[concurrent.futures.Future[common.FitRes]]:
+        """Hand the message to the dispatcher, return a future for the result."""
+        if self.dispatcher is None:
+            return None
+        out_recordset = fitins_to_recordset(ins, group_id, self.broadcast_cache)
+        return self._start_recordset(
+            out_recordset,
+            MessageType.TRAIN,
+            timeout,
+            group_id,
+            partial(compat.recordset_to_fitres, keep_input=False),
+        )
+
+    def start_evaluate(
+        self, ins: common.EvaluateIns, timeout: Optional[float], group_id: Optional[int]
+    ) -> Optional[concurrent.futures.Future[common.EvaluateRes]]:
+        """Hand the message to the dispatcher, return a future for the result."""
+        if self.dispatcher is None:
+            return None
+        out_recordset = evaluateins_to_recordset(ins, group_id, self.broadcast_cache)
+        return self._start_recordset(
+            out_recordset,
+            MessageType.EVALUATE,
+            timeout,
+            group_id,
+            compat.recordset_to_evaluateres,
+        )
+
     def reconnect(
         self,
         ins: common.ReconnectIns,
@@ -86,16 +144,19 @@ class DriverClientProxy(ClientProxy):
         """Disconnect and (optionally) reconnect later."""
         return common.DisconnectRes(reason="")  # Nothing to do here (yet)
 
-    def _send_receive_recordset(
+    def withdraw(self, group_id: Optional[int]) -> None:
+        """Withdraw the messages of `group_id` not yet delivered to the node."""
+        self._in_flight.withdraw(self.driver, group_id)
+
+    def _create_message(
         self,
         recordset: RecordSet,
         message_type: str,
         timeout: Optional[float],
         group_id: Optional[int],
-    ) -> RecordSet:
-
-        # Create message
-        message = self.driver.create_message(
+    ) -> Message:
+        """Create a message to the node of this proxy."""
+        return self.driver.create_message(
             content=recordset,
             message_type=message_type,
             dst_node_id=self.node_id,
@@ -103,18 +164,178 @@ class DriverClientProxy(ClientProxy):
             ttl=timeout,
         )
 
+    def _send_receive_recordset(
+        self,
+        recordset: RecordSet,
+        message_type: str,
+        timeout: Optional[float],
+        group_id: Optional[int],
+    ) -> RecordSet:
+
+        # Create message
+        message = self._create_message(recordset, message_type, timeout, group_id)
+
         # Send message and wait for reply
-        messages = list(self.driver.send_and_receive(messages=[message]))
-
-        # A single reply is expected
-        if len(messages) != 1:
-            raise ValueError(f"Expected one Message but got: {len(messages)}")
-
-        # Only messages without errors can be handled beyond these point
-        msg: Message = messages[0]
-        if msg.has_error():
-            raise ValueError(
-                f"Message contains an Error (reason: {msg.error.reason}). "
-                "It originated during client-side execution of a message."
-            )
-        return msg.content
\ No newline at end of file
+        if self.dispatcher is None:
+            with self._in_flight.track(message):
+                messages = list(
+                    self.driver.send_and_receive(messages=[message], timeout=timeout)
+                )
+            return reply_content(messages)
+        (future,) = self.dispatcher.send([message])
+        with self._in_flight.track(message, future):
+            try:
+                future.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+            except concurrent.futures.CancelledError:
+                pass  # Withdrawn before the dispatcher pushed it
+            return dispatched_reply_content(future)
+
+    def _start_recordset(  # pylint: disable=too-many-arguments,R0917
+        self,
+        recordset: RecordSet,
+        message_type: str,
+        timeout: Optional[float],
+        group_id: Optional[int],
+        convert: Callable[[RecordSet], Any],
+    ) -> concurrent.futures.Future[Any]:
+        """Hand a message to the dispatcher, return a future for its converted reply.
+
+        The future is resolved by the dispatcher thread once the reply arrives, or
+        fails once the TTL of the message passes.
+        """
+        message = self._create_message(recordset, message_type, timeout, group_id)
+        result: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        # The call starts now, like a call running in an executor
+        result.set_running_or_notify_cancel()
+        (future,) = self.dispatcher.send([message])  # type: ignore[union-attr]
+        self._in_flight.add(message, future)
+        future.add_done_callback(partial(self._resolve, message, result, convert))
+        return result
+
+    def _resolve(
+        self,
+        message: Message,
+        result: concurrent.futures.Future[Any],
+        convert: Callable[[RecordSet], Any],
+        future: concurrent.futures.Future[Message],
+    ) -> None:
+        """Resolve the future of `_start_recordset` with the converted reply."""
+        self._in_flight.discard(message)
+        try:
+            result.set_result(convert(dispatched_reply_content(future)))
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            result.set_exception(ex)
+
+
+class InFlightMessages:
+    """The messages a client proxy sent and awaits the replies of.
+
+    Lets the proxy withdraw the messages of a round that were not delivered yet,
+    see `ClientProxy.withdraw`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._messages: dict[
+            int, tuple[Message, Optional[concurrent.futures.Future[Message]]]
+        ] = {}
+
+    @contextmanager
+    def track(
+        self,
+        message: Message,
+        future: Optional[concurrent.futures.Future[Message]] = None,
+    ) -> Iterator[None]:
+        """Track `message` (and the future of its reply) until the block exits."""
+        self.add(message, future)
+        try:
+            yield
+        finally:
+            self.discard(message)
+
+    def add(
+        self,
+        message: Message,
+        future: Optional[concurrent.futures.Future[Message]] = None,
+    ) -> None:
+        """Track `message` (and the future of its reply) until it is discarded."""
+        with self._lock:
+            self._messages[id(message)] = (message, future)
+
+    def discard(self, message: Message) -> None:
+        """Stop tracking `message`."""
+        with self._lock:
+            self._messages.pop(id(message), None)
+
+    def withdraw(
+        self, driver: Union[Driver, AsyncDriver], group_id: Optional[int]
+    ) -> None:
+        """Withdraw the tracked messages of `group_id` not delivered yet."""
+        group = str(group_id) if group_id else ""
+        with self._lock:
+            messages = [
+                (message, future)
+                for message, future in self._messages.values()
+                if message.metadata.group_id == group
+            ]
+        message_ids: list[str] = []
+        for message, future in messages:
+            if message.metadata.message_id:
+                message_ids.append(message.metadata.message_id)
+            elif future is not None:
+                # Not pushed yet, the dispatcher skips cancelled messages
+                future.cancel()
+        if message_ids:
+            driver.cancel_messages(message_ids)
+
+
+def fitins_to_recordset(
+    ins: common.FitIns,
+    group_id: Optional[int],
+    broadcast_cache: Optional[BroadcastCache],
+) -> RecordSet:
+    """Convert `FitIns` to a `RecordSet`, once per round if a cache is given."""
+    if broadcast_cache is not None:
+        return broadcast_cache.fitins_to_recordset(ins, group_id)
+    return compat.fitins_to_recordset(ins, keep_input=True)
+
+
+def evaluateins_to_recordset(
+    ins: common.EvaluateIns,
+    group_id: Optional[int],
+    broadcast_cache: Optional[BroadcastCache],
+) -> RecordSet:
+    """Convert `EvaluateIns` to a `RecordSet`, once per round if a cache is given."""
+    if broadcast_cache is not None:
+        return broadcast_cache.evaluateins_to_recordset(ins, group_id)
+    return compat.evaluateins_to_recordset(ins, keep_input=True)
+
+
+def dispatched_reply_content(
+    future: concurrent.futures.Future[Message],
+) -> RecordSet:
+    """Return the content of the reply resolved by a `MessageDispatcher` future.
+
+    Raises the error of the future if the message could not be sent or timed out.
+    """
+    if future.cancelled():
+        return reply_content([])
+    return reply_content([future.result()])
+
+
+def reply_content(messages: list[Message]) -> RecordSet:
+    """Return the content of the single reply to a message sent to a client."""
+    # A single reply is expected
+    if len(messages) != 1:
+        raise ValueError(f"Expected one Message but got: {len(messages)}")
+
+    # Only messages without errors can be handled beyond these point
+    msg: Message = messages[0]
+    if msg.has_error():
+        raise ValueError(
+            f"Message contains an Error (reason: {msg.error.reason}). "
+            "It originated during client-side execution of a message."
+        )
+    return msg.content
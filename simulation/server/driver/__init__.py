@@ -1,8 +1,16 @@
 """Flower driver SDK."""
 
 
-from .driver import Driver
+from .async_driver import AsyncDriver, SyncDriverBridge
+from .dispatcher import MessageDispatcher
+from .driver import Driver, PullInterrupt
+from .inmemory_driver import InMemoryDriver
 
 __all__ = [
+    "AsyncDriver",
     "Driver",
-]
\ No newline at end of file
+    "InMemoryDriver",
+    "MessageDispatcher",
+    "PullInterrupt",
+    "SyncDriverBridge",
+]
@@ -0,0 +1,216 @@
+"""Asyncio Driver (abstract base class) and its bridge to a synchronous Driver."""
+
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Optional
+
+from common import RecordSet, Message
+from common.typing import NodeChanges, Run
+from .dispatcher import MessageDispatcher
+from .driver import _POLL_INTERVAL, Driver, _NodeSnapshots
+
+
+class AsyncDriver(ABC):
+    """Abstract base class of a Driver whose calls are coroutines.
+
+    It offers the same API as `Driver`, but waiting for replies does not block a
+    thread: many `send_and_receive` calls can be awaited concurrently from a single
+    event loop. Only `create_message`, which does not communicate with the
+    SuperLink, is a regular method.
+    """
+
+    # Node IDs seen by the default `get_node_changes`, created on its first call
+    _node_snapshots: Optional[_NodeSnapshots] = None
+
+    @property
+    @abstractmethod
+    def run(self) -> Run:
+        """Run information."""
+
+    @abstractmethod
+    def create_message(  # pylint: disable=too-many-arguments,R0917
+        self,
+        content: RecordSet,
+        message_type: str,
+        dst_node_id: int,
+        group_id: str,
+        ttl: Optional[float] = None,
+    ) -> Message:
+        """Create a new message with specified parameters.
+
+        See `Driver.create_message`.
+        """
+
+    @abstractmethod
+    async def get_node_ids(self) -> Iterable[int]:
+        """Get node IDs."""
+
+    async def get_node_changes(
+        self, since_version: int, timeout: Optional[float] = None
+    ) -> NodeChanges:
+        """Get the nodes that joined or left since a version of the node registry.
+
+        See `Driver.get_node_changes`. This default implementation polls
+        `get_node_ids`, like that of `Driver`.
+        """
+        if self._node_snapshots is None:
+            self._node_snapshots = _NodeSnapshots()
+        snapshots = self._node_snapshots
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            changes = snapshots.changes(since_version, await self.get_node_ids())
+            if changes is not None:
+                return changes
+            if end_time is not None and time.time() >= end_time:
+                return NodeChanges(version=snapshots.version, joined=[], left=[])
+            since_version = snapshots.version
+            remaining = _POLL_INTERVAL
+            if end_time is not None:
+                remaining = min(remaining, max(0.0, end_time - time.time()))
+            await asyncio.sleep(remaining)
+
+    @abstractmethod
+    async def push_messages(self, messages: Iterable[Message]) -> Iterable[str]:
+        """Push messages to specified node IDs.
+
+        See `Driver.push_messages`.
+        """
+
+    @abstractmethod
+    async def pull_messages(self, message_ids: Iterable[str]) -> Iterable[Message]:
+        """Pull messages based on message IDs.
+
+        See `Driver.pull_messages`.
+        """
+
+    @abstractmethod
+    async def send_and_receive(
+        self,
+        messages: Iterable[Message],
+        *,
+        timeout: Optional[float] = None,
+    ) -> Iterable[Message]:
+        """Push messages to specified node IDs and pull the reply messages.
+
+        See `Driver.send_and_receive`. Concurrent calls must not block each other.
+        """
+
+    def cancel_messages(self, message_ids: Iterable[str]) -> list[str]:
+        """Withdraw pushed messages that were not delivered to their nodes yet.
+
+        See `Driver.cancel_messages`. Not a coroutine, so that it can be called
+        from outside of the event loop. This default implementation cannot
+        withdraw messages.
+        """
+        return []
+
+
+class SyncDriverBridge(AsyncDriver):
+    """`AsyncDriver` calling a synchronous `Driver`.
+
+    Pushes and pulls run in the default executor of the event loop, so they never
+    block the loop. `send_and_receive` hands its messages to a `MessageDispatcher`
+    and awaits their replies: the messages of all concurrent calls are pushed and
+    their replies pulled in batches, by the single thread of the dispatcher.
+
+    Parameters
+    ----------
+    driver : Driver
+        The synchronous Driver to call.
+    dispatcher : Optional[MessageDispatcher] (default: None)
+        The dispatcher sending the messages of `send_and_receive`, e.g. shared
+        with the synchronous client proxies of the same Driver. If None, the
+        bridge creates one, which `close` closes.
+    pull_interval : float (default=0.1)
+        Time in seconds to wait between retrieving replies, if the bridge creates
+        its dispatcher.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        dispatcher: Optional[MessageDispatcher] = None,
+        pull_interval: float = 0.1,
+    ) -> None:
+        self.driver = driver
+        self._owns_dispatcher = dispatcher is None
+        self.dispatcher = (
+            dispatcher
+            if dispatcher is not None
+            else MessageDispatcher(driver, pull_interval)
+        )
+
+    @property
+    def run(self) -> Run:
+        """Run information."""
+        return self.driver.run
+
+    def create_message(  # pylint: disable=too-many-arguments,R0917
+        self,
+        content: RecordSet,
+        message_type: str,
+        dst_node_id: int,
+        group_id: str,
+        ttl: Optional[float] = None,
+    ) -> Message:
+        """Create a new message with specified parameters."""
+        return self.driver.create_message(
+            content, message_type, dst_node_id, group_id, ttl
+        )
+
+    async def get_node_ids(self) -> Iterable[int]:
+        """Get node IDs."""
+        return await asyncio.to_thread(self.driver.get_node_ids)
+
+    async def get_node_changes(
+        self, since_version: int, timeout: Optional[float] = None
+    ) -> NodeChanges:
+        """Get the nodes that joined or left since a version of the node registry."""
+        return await asyncio.to_thread(
+            self.driver.get_node_changes, since_version, timeout
+        )
+
+    async def push_messages(self, messages: Iterable[Message]) -> Iterable[str]:
+        """Push messages to specified node IDs."""
+        return await asyncio.to_thread(
+            lambda: list(self.driver.push_messages(messages))
+        )
+
+    async def pull_messages(self, message_ids: Iterable[str]) -> Iterable[Message]:
+        """Pull messages based on message IDs."""
+        return await asyncio.to_thread(
+            lambda: list(self.driver.pull_messages(message_ids))
+        )
+
+    async def send_and_receive(
+        self,
+        messages: Iterable[Message],
+        *,
+        timeout: Optional[float] = None,
+    ) -> Iterable[Message]:
+        """Push messages to specified node IDs and pull the reply messages.
+
+        Raises a `ValueError` if one of the messages could not be pushed, and a
+        `TimeoutError` if the TTL of one of them passed before its reply arrived.
+        """
+        futures = [
+            asyncio.wrap_future(future) for future in self.dispatcher.send(messages)
+        ]
+        if not futures:
+            return []
+        done, pending = await asyncio.wait(futures, timeout=timeout)
+        for future in pending:
+            future.cancel()
+        return [future.result() for future in futures if future in done]
+
+    def cancel_messages(self, message_ids: Iterable[str]) -> list[str]:
+        """Withdraw pushed messages that were not delivered to their nodes yet."""
+        return self.driver.cancel_messages(message_ids)
+
+    def close(self) -> None:
+        """Close the dispatcher of the bridge, if it created it."""
+        if self._owns_dispatcher:
+            self.dispatcher.close()
@@ -0,0 +1,265 @@
+"""Batched sending of the messages of concurrent callers through a Driver."""
+
+
+import concurrent.futures
+import heapq
+import threading
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+from common import Message
+from .driver import Driver, PullInterrupt
+
+# The expiry index is rebuilt once it holds this many more entries than there are
+# awaited messages (entries of messages whose replies arrived)
+_MIN_STALE_EXPIRY_ENTRIES = 1024
+
+
+class MessageDispatcher:
+    """Send the messages of many concurrent callers in batches.
+
+    Instead of every caller pushing its own messages and pulling its own replies
+    (one `push_messages` and one pull loop per client of a round), callers hand
+    their messages to the dispatcher and wait on futures. A single background
+    thread pushes all the messages handed over since its previous push in one
+    `push_messages` call, waits for the replies to all awaited messages in one
+    `pull_messages_blocking` call and resolves the future of each message with its
+    reply. Hence messages handed over in quick succession (e.g. all those of a
+    round, by a `Server` using the `"asyncio"` executor) are pushed together, and
+    the number of pulls depends on how the replies arrive, not on how many
+    clients a round has. Handing over messages interrupts the pending pull, so
+    they are pushed without waiting for a reply. The future of a message whose TTL
+    passes before its reply arrives fails with a `TimeoutError`, so callers can
+    wait on it without a timeout of their own.
+
+    Parameters
+    ----------
+    driver : Driver
+        The Driver to send messages with.
+    pull_interval : float (default=0.1)
+        Longest time in seconds to wait for replies in one pull. Also the longest
+        time messages handed over during a pull wait to be pushed, for Drivers
+        that override `pull_messages_blocking` without supporting interrupts.
+    linger : float (default=0.005)
+        Time in seconds to wait for more messages before pushing the queued ones,
+        so that messages handed over in quick succession are pushed together.
+    """
+
+    def __init__(
+        self, driver: Driver, pull_interval: float = 0.1, linger: float = 0.005
+    ) -> None:
+        self.driver = driver
+        self.pull_interval = pull_interval
+        self.linger = linger
+        self.num_pushes = 0
+        self.num_pulls = 0
+
+        self._cv = threading.Condition()
+        self._outbox: list[tuple[Message, concurrent.futures.Future[Message]]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Interrupts the pull in progress, if any
+        self._pull_interrupt: Optional[PullInterrupt] = None
+
+    def send(
+        self, messages: Iterable[Message]
+    ) -> list[concurrent.futures.Future[Message]]:
+        """Queue messages for sending and return a future for the reply of each.
+
+        A future fails with a `ValueError` if its message could not be pushed, and
+        with a `TimeoutError` if its TTL passes before the reply arrives.
+        Cancel the future of a reply no longer awaited (e.g. after a timeout), a
+        message whose future is cancelled before it is pushed is not pushed.
+        """
+        futures: list[concurrent.futures.Future[Message]] = []
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("Cannot send messages after the dispatcher closed")
+            for message in messages:
+                future: concurrent.futures.Future[Message] = (
+                    concurrent.futures.Future()
+                )
+                self._outbox.append((message, future))
+                futures.append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="message-dispatcher", daemon=True
+                )
+                self._thread.start()
+            self._cv.notify()
+            pull_interrupt = self._pull_interrupt
+        if pull_interrupt is not None:
+            pull_interrupt.interrupt()
+        return futures
+
+    def close(self) -> None:
+        """Stop sending messages and cancel the replies still awaited."""
+        with self._cv:
+            self._closed = True
+            self._cv.notify()
+            thread = self._thread
+            pull_interrupt = self._pull_interrupt
+        if pull_interrupt is not None:
+            pull_interrupt.interrupt()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        """Push queued messages and pull awaited replies until closed."""
+        waiters: dict[str, concurrent.futures.Future[Message]] = {}
+        # Time at which the TTL of each awaited message passes
+        expiry: list[tuple[float, str]] = []
+        resolved = False
+        while True:
+            with self._cv:
+                if not waiters:
+                    self._cv.wait_for(lambda: self._closed or len(self._outbox) > 0)
+                elif resolved:
+                    # Callers that just got their reply often send again at once
+                    self._cv.wait_for(
+                        lambda: self._closed or len(self._outbox) > 0,
+                        timeout=self.linger,
+                    )
+                self._linger()
+                if self._closed:
+                    break
+                batch, self._outbox = self._outbox, []
+
+            if batch:
+                self._push(batch, waiters, expiry)
+            for message_id in [
+                message_id
+                for message_id, future in waiters.items()
+                if future.cancelled()
+            ]:
+                del waiters[message_id]
+            resolved = _expire(waiters, expiry)
+            if len(expiry) > 2 * len(waiters) + _MIN_STALE_EXPIRY_ENTRIES:
+                expiry[:] = [entry for entry in expiry if entry[1] in waiters]
+                heapq.heapify(expiry)
+            if waiters:
+                with self._cv:
+                    timeout = (
+                        0.0 if self._outbox or self._closed else self.pull_interval
+                    )
+                    # Wake up when the next TTL passes
+                    timeout = min(timeout, max(0.0, expiry[0][0] - time.time()))
+                    self._pull_interrupt = PullInterrupt()
+                    pull_interrupt = self._pull_interrupt
+                try:
+                    if self._pull(waiters, timeout, pull_interrupt):
+                        resolved = True
+                finally:
+                    with self._cv:
+                        self._pull_interrupt = None
+
+        # Closed: nobody will resolve the remaining futures
+        with self._cv:
+            batch, self._outbox = self._outbox, []
+        for future in [*waiters.values(), *(future for _, future in batch)]:
+            future.cancel()
+
+    def _linger(self) -> None:
+        """Wait until no more messages are queued for `linger` seconds.
+
+        Must be called holding the lock. Waits at most `pull_interval` seconds.
+        """
+        end_time = time.time() + self.pull_interval
+        while self._outbox and not self._closed and time.time() < end_time:
+            size = len(self._outbox)
+            if not self._cv.wait_for(
+                lambda size=size: self._closed or len(self._outbox) > size,
+                timeout=min(self.linger, max(0.0, end_time - time.time())),
+            ):
+                break
+
+    def _push(
+        self,
+        batch: list[tuple[Message, concurrent.futures.Future[Message]]],
+        waiters: dict[str, concurrent.futures.Future[Message]],
+        expiry: list[tuple[float, str]],
+    ) -> None:
+        """Push a batch of messages and await the replies to those pushed."""
+        # Skip the messages withdrawn (or no longer awaited) before their push
+        batch = [(message, future) for message, future in batch if not future.done()]
+        if not batch:
+            return
+        self.num_pushes += 1
+        try:
+            message_ids = list(
+                self.driver.push_messages([message for message, _ in batch])
+            )
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            for _, future in batch:
+                _set_exception(future, ex)
+            return
+        for (message, future), message_id in zip(batch, message_ids):
+            if message_id:
+                waiters[message_id] = future
+                expires_at = message.metadata.created_at + message.metadata.ttl
+                heapq.heappush(expiry, (expires_at, message_id))
+            else:
+                _set_exception(
+                    future,
+                    ValueError(
+                        "Message to node "
+                        f"{message.metadata.dst_node_id} could not be pushed"
+                    ),
+                )
+
+    def _pull(
+        self,
+        waiters: dict[str, concurrent.futures.Future[Message]],
+        timeout: float,
+        interrupt: PullInterrupt,
+    ) -> bool:
+        """Wait for replies to the awaited messages and resolve their futures.
+
+        Returns whether a future was resolved.
+        """
+        self.num_pulls += 1
+        try:
+            replies = list(
+                self.driver.pull_messages_blocking(list(waiters), timeout, interrupt)
+            )
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            for future in waiters.values():
+                _set_exception(future, ex)
+            waiters.clear()
+            return True
+        for reply in replies:
+            future = waiters.pop(reply.metadata.reply_to_message, None)
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_result(reply)
+        return len(replies) > 0
+
+
+def _expire(
+    waiters: dict[str, concurrent.futures.Future[Message]],
+    expiry: list[tuple[float, str]],
+) -> bool:
+    """Fail the futures of the messages whose TTL has passed.
+
+    Returns whether a future was resolved.
+    """
+    now = time.time()
+    expired = False
+    while expiry and expiry[0][0] <= now:
+        _, message_id = heapq.heappop(expiry)
+        future = waiters.pop(message_id, None)
+        if future is not None:
+            _set_exception(
+                future,
+                TimeoutError(f"No reply to message {message_id} within its TTL"),
+            )
+            expired = True
+    return expired
+
+
+def _set_exception(
+    future: concurrent.futures.Future[Message], exception: BaseException
+) -> None:
+    """Fail `future` unless it was cancelled."""
+    if future.set_running_or_notify_cancel():
+        future.set_exception(exception)
@@ -1,17 +1,98 @@
 """Driver (abstract base class)."""
 
 
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
-from typing import Optional
+from typing import Callable, Optional
 
 from common import RecordSet, Message
-from common.typing import Run
+from common.typing import NodeChanges, Run
+
+# Time in seconds between two pulls of `Driver.pull_messages_blocking`, and
+# between two snapshots of the default `Driver.get_node_changes`
+_POLL_INTERVAL = 0.1
+
+
+class PullInterrupt:
+    """Ends a `Driver.pull_messages_blocking` call early, from another thread.
+
+    Pass it to `pull_messages_blocking` and call `interrupt` to make the call
+    return the replies available by then, possibly none. Interrupting before the
+    call starts waiting makes it return without waiting. An interrupt cannot be
+    reset, use a new one for every call.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def interrupted(self) -> bool:
+        """Whether `interrupt` was called."""
+        return self._event.is_set()
+
+    def interrupt(self) -> None:
+        """End the call waiting for replies, or the next one to wait."""
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to `timeout` seconds for `interrupt`, return `interrupted`."""
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` once interrupted, at once if already interrupted."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+class _NodeSnapshots:
+    """Node changes computed from successive snapshots of the node IDs of a run.
+
+    Backs the default `get_node_changes` of drivers that can only list the current
+    nodes. The version is incremented whenever a snapshot differs from the
+    previous one. Only the latest snapshot is kept, so changes are computed since
+    that version or since version 0 (no nodes); any other `since_version` is
+    treated as 0.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.node_ids: frozenset[int] = frozenset()
+
+    def changes(
+        self, since_version: int, node_ids: Iterable[int]
+    ) -> Optional[NodeChanges]:
+        """Record a snapshot, return the changes since `since_version` if any."""
+        since = self.node_ids if since_version == self.version else frozenset()
+        current = frozenset(node_ids)
+        if current != self.node_ids:
+            self.version += 1
+            self.node_ids = current
+        if current == since:
+            return None
+        return NodeChanges(
+            version=self.version,
+            joined=sorted(current - since),
+            left=sorted(since - current),
+        )
 
 
 class Driver(ABC):
     """Abstract base Driver class for the ServerAppIo API."""
 
+    # Node IDs seen by the default `get_node_changes`, created on its first call
+    _node_snapshots: Optional[_NodeSnapshots] = None
+
     @abstractmethod
     def set_run(self, run_id: int) -> None:
         """Request a run to the SuperLink with a given `run_id`.
@@ -74,6 +155,47 @@ class Driver(ABC):
     def get_node_ids(self) -> Iterable[int]:
         """Get node IDs."""
 
+    def get_node_changes(
+        self, since_version: int, timeout: Optional[float] = None
+    ) -> NodeChanges:
+        """Get the nodes that joined or left since a version of the node registry.
+
+        This default implementation polls `get_node_ids` and compares the node IDs
+        with those of the previous call (see `_NodeSnapshots`); drivers that are
+        notified of node changes override it to return as soon as one happens.
+
+        Parameters
+        ----------
+        since_version : int
+            The `version` returned by the previous call, or 0 to get all the nodes
+            that joined so far.
+        timeout : Optional[float] (default: None)
+            The time in seconds to wait for a change if there was none since
+            `since_version`. If `None`, waits until there is one.
+
+        Returns
+        -------
+        changes : NodeChanges
+            The IDs of the nodes that joined and left since `since_version` (both
+            empty if the timeout passed without a change), and the current version
+            of the node registry.
+        """
+        if self._node_snapshots is None:
+            self._node_snapshots = _NodeSnapshots()
+        snapshots = self._node_snapshots
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            changes = snapshots.changes(since_version, self.get_node_ids())
+            if changes is not None:
+                return changes
+            if end_time is not None and time.time() >= end_time:
+                return NodeChanges(version=snapshots.version, joined=[], left=[])
+            since_version = snapshots.version
+            remaining = _POLL_INTERVAL
+            if end_time is not None:
+                remaining = min(remaining, max(0.0, end_time - time.time()))
+            time.sleep(remaining)
+
     @abstractmethod
     def push_messages(self, messages: Iterable[Message]) -> Iterable[str]:
         """Push messages to specified node IDs.
@@ -90,7 +212,8 @@ class Driver(ABC):
         -------
         message_ids : Iterable[str]
             An iterable of IDs for the messages that were sent, which can be used
-            to pull replies.
+            to pull replies. It holds one ID per message, in the order of
+            `messages`, and the ID of a message that could not be sent is empty.
         """
 
     @abstractmethod
@@ -111,6 +234,72 @@ class Driver(ABC):
             An iterable of messages received.
         """
 
+    def cancel_messages(self, message_ids: Iterable[str]) -> list[str]:
+        """Withdraw pushed messages that were not delivered to their nodes yet.
+
+        A withdrawn message is never delivered and its reply, once pulled, is an
+        error reply. This default implementation cannot withdraw messages.
+
+        Parameters
+        ----------
+        message_ids : Iterable[str]
+            An iterable of IDs of the messages to withdraw.
+
+        Returns
+        -------
+        message_ids : list[str]
+            The IDs of the messages that were withdrawn.
+        """
+        return []
+
+    def pull_messages_blocking(
+        self,
+        message_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        interrupt: Optional[PullInterrupt] = None,
+    ) -> Iterable[Message]:
+        """Pull messages based on message IDs, waiting for at least one.
+
+        Like `pull_messages`, but if none of the messages has a reply yet, waits
+        until one does, `timeout` seconds have passed or `interrupt` is
+        interrupted. This default implementation polls `pull_messages`; drivers
+        that can be notified of replies override it to return as soon as a reply
+        is stored.
+
+        Parameters
+        ----------
+        message_ids : Iterable[str]
+            An iterable of message IDs for which reply messages are to be retrieved.
+        timeout : Optional[float] (default: None)
+            The time in seconds to wait for a reply. If `None`, waits until there
+            is one.
+        interrupt : Optional[PullInterrupt] (default: None)
+            Lets another thread end the wait early.
+
+        Returns
+        -------
+        messages : Iterable[Message]
+            An iterable of messages received, empty if the timeout passed or the
+            call was interrupted before a reply arrived.
+        """
+        message_ids = list(message_ids)
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            messages = list(self.pull_messages(message_ids))
+            if (
+                messages
+                or (end_time is not None and time.time() >= end_time)
+                or (interrupt is not None and interrupt.interrupted)
+            ):
+                return messages
+            remaining = _POLL_INTERVAL
+            if end_time is not None:
+                remaining = min(remaining, max(0.0, end_time - time.time()))
+            if interrupt is not None:
+                interrupt.wait(remaining)
+            else:
+                time.sleep(remaining)
+
     @abstractmethod
     def send_and_receive(
         self,
@@ -140,8 +329,8 @@ class Driver(ABC):
 
         Notes
         -----
-        This method uses `push_messages` to send the messages and `pull_messages`
-        to collect the replies. If `timeout` is set, the method may not return
-        replies for all sent messages. A message remains valid until its TTL,
-        which is not affected by `timeout`.
+        This method uses `push_messages` to send the messages and
+        `pull_messages_blocking` to collect the replies. If `timeout` is set, the
+        method may not return replies for all sent messages. A message remains
+        valid until its TTL, which is not affected by `timeout`.
         """
\ No newline at end of file
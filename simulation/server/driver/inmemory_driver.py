@@ -0,0 +1,173 @@
+"""Flower in-memory Driver."""
+
+
+import time
+from collections.abc import Iterable
+from typing import Optional, cast
+
+from common import RecordSet, Message
+from common.constant import SUPERLINK_NODE_ID
+from common.message import DEFAULT_TTL, Metadata
+from common.typing import NodeChanges, Run, RunNotRunningException
+from server.superlink import InMemoryLinkState
+from .driver import Driver, PullInterrupt
+
+
+class InMemoryDriver(Driver):
+    """`InMemoryDriver` class provides an interface to the ServerAppIo API.
+
+    Messages are exchanged with the nodes through an `InMemoryLinkState` living in
+    the same process, so no SuperLink needs to be running.
+
+    Parameters
+    ----------
+    state : InMemoryLinkState
+        The state shared with the nodes (e.g. with the simulation engine).
+    """
+
+    def __init__(self, state: InMemoryLinkState) -> None:
+        self._run: Optional[Run] = None
+        self.state = state
+
+    def _check_message(self, message: Message) -> None:
+        # Check if the message is valid
+        if not (
+            message.metadata.run_id == cast(Run, self._run).run_id
+            and message.metadata.src_node_id == SUPERLINK_NODE_ID
+            and message.metadata.message_id == ""
+            and message.metadata.reply_to_message == ""
+            and message.metadata.ttl > 0
+        ):
+            raise ValueError(f"Invalid message: {message}")
+
+    def set_run(self, run_id: int) -> None:
+        """Initialize the run."""
+        run = self.state.get_run(run_id)
+        if run is None:
+            raise RuntimeError(f"Cannot find the run with ID: {run_id}")
+        self._run = run
+
+    @property
+    def run(self) -> Run:
+        """Run ID."""
+        return Run(**vars(cast(Run, self._run)))
+
+    def create_message(  # pylint: disable=too-many-arguments,R0917
+        self,
+        content: RecordSet,
+        message_type: str,
+        dst_node_id: int,
+        group_id: str,
+        ttl: Optional[float] = None,
+    ) -> Message:
+        """Create a new message with specified parameters.
+
+        This method constructs a new `Message` with given content and metadata.
+        The `run_id` and `src_node_id` will be set automatically.
+        """
+        ttl_ = DEFAULT_TTL if ttl is None else ttl
+        metadata = Metadata(
+            run_id=cast(Run, self._run).run_id,
+            message_id="",  # Will be set by the state
+            src_node_id=SUPERLINK_NODE_ID,
+            dst_node_id=dst_node_id,
+            reply_to_message="",
+            group_id=group_id,
+            ttl=ttl_,
+            message_type=message_type,
+        )
+        return Message(metadata=metadata, content=content)
+
+    def get_node_ids(self) -> list[int]:
+        """Get node IDs."""
+        run_id = cast(Run, self._run).run_id
+        if self.state.get_run(run_id) is None:
+            raise RunNotRunningException
+        return list(self.state.get_nodes(run_id))
+
+    def get_node_changes(
+        self, since_version: int, timeout: Optional[float] = None
+    ) -> NodeChanges:
+        """Get the nodes that joined or left since a version of the node registry.
+
+        The call returns as soon as a node joins or leaves, it does not poll.
+        """
+        run_id = cast(Run, self._run).run_id
+        if self.state.get_run(run_id) is None:
+            raise RunNotRunningException
+        return self.state.get_node_changes(run_id, since_version, timeout)
+
+    def push_messages(self, messages: Iterable[Message]) -> Iterable[str]:
+        """Push messages to specified node IDs.
+
+        This method takes an iterable of messages and sends each message
+        to the node specified in `dst_node_id`. The ID of a message the state
+        rejected (e.g. because its node is unknown) is an empty string.
+        """
+        message_ids: list[str] = []
+        for msg in messages:
+            # Check message
+            self._check_message(msg)
+            # Store in state
+            message_id = self.state.store_message_ins(msg)
+            message_ids.append(message_id or "")
+
+        return message_ids
+
+    def pull_messages(self, message_ids: Iterable[str]) -> Iterable[Message]:
+        """Pull messages based on message IDs.
+
+        This method is used to collect messages from the state that correspond
+        to a set of given message IDs.
+        """
+        return self.state.get_message_res(message_ids)
+
+    def cancel_messages(self, message_ids: Iterable[str]) -> list[str]:
+        """Withdraw pushed messages that were not delivered to their nodes yet."""
+        return self.state.cancel_message_ins(message_ids)
+
+    def pull_messages_blocking(
+        self,
+        message_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        interrupt: Optional[PullInterrupt] = None,
+    ) -> Iterable[Message]:
+        """Pull messages based on message IDs, waiting for at least one.
+
+        The call does not poll: it returns as soon as a reply to one of the
+        messages is stored in the state, `interrupt` is interrupted or `timeout`
+        seconds have passed.
+        """
+        return self.state.wait_for_message_res(message_ids, timeout, interrupt)
+
+    def send_and_receive(
+        self,
+        messages: Iterable[Message],
+        *,
+        timeout: Optional[float] = None,
+    ) -> Iterable[Message]:
+        """Push messages to specified node IDs and pull the reply messages.
+
+        This method sends a list of messages to their destination node IDs and then
+        waits for the replies. It continues to wait for replies until either all
+        replies are received or the specified timeout duration is exceeded. Each
+        reply is received as soon as it is stored in the state.
+        """
+        # Push messages
+        msg_ids = {msg_id for msg_id in self.push_messages(messages) if msg_id}
+
+        # Wait for replies
+        end_time = time.time() + (timeout if timeout is not None else 0.0)
+        ret: list[Message] = []
+        while msg_ids:
+            remaining = None
+            if timeout is not None:
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    break
+            res_msgs = list(self.pull_messages_blocking(msg_ids, remaining))
+            ret.extend(res_msgs)
+            msg_ids.difference_update(
+                {msg.metadata.reply_to_message for msg in res_msgs}
+            )
+        return ret
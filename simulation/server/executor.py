@@ -0,0 +1,341 @@
+"""Long-lived executor running the client calls of a Server."""
+
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Optional
+
+from common.typing import Scalar
+
+EXECUTOR_TYPES = ("thread", "process", "asyncio")
+
+
+class ExecutorError(RuntimeError):
+    """A `RoundExecutor` could not run a call.
+
+    Unlike an exception raised by the call itself, this is not a client failure
+    (e.g. the arguments of the call could not be pickled for a process pool): the
+    `Server` raises it instead of counting it as a failure of the round.
+    """
+
+
+def _timed_call(
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    start: Optional[Callable[[], bool]] = None,
+) -> Optional[tuple[bool, Any, float, float]]:
+    """Call `fn` and return whether it succeeded, its result and when it ran.
+
+    If `start` is given, it is called first and the call is skipped (None is
+    returned) if it returns False.
+    """
+    if start is not None and not start():
+        return None
+    started = time.time()
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as ex:  # pylint: disable=broad-exception-caught
+        return False, ex, started, time.time()
+    return True, result, started, time.time()
+
+
+async def _timed_call_async(
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    start: Callable[[], bool],
+) -> Optional[tuple[bool, Any, float, float]]:
+    """Await `fn` if it is a coroutine function, else run it in the default pool."""
+    if asyncio.iscoroutinefunction(fn):
+        if not start():
+            return None
+        started = time.time()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return False, ex, started, time.time()
+        return True, result, started, time.time()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _timed_call, fn, args, kwargs, start)
+
+
+class _Window:  # pylint: disable=too-few-public-methods
+    """Measurements of the calls submitted within a measurement window."""
+
+    __slots__ = (
+        "start",
+        "num_submitted",
+        "num_completed",
+        "queue_depth_sum",
+        "queue_depth_max",
+        "busy_time",
+    )
+
+    def __init__(self) -> None:
+        self.start = time.time()
+        self.num_submitted = 0
+        self.num_completed = 0
+        self.queue_depth_sum = 0
+        self.queue_depth_max = 0
+        self.busy_time = 0.0
+
+
+class RoundExecutor(concurrent.futures.Executor):
+    """Executor reused by every round of a `Server`.
+
+    The executor is created once, when training starts, so worker threads (and
+    their thread-local state) or worker processes survive from one round to the
+    next. It also records how busy it is, see `metrics`. Calls are measured in
+    the window of the thread submitting them (see `measure`), so the calls of
+    rounds that overlap (e.g. the evaluation of a round and the training of the
+    next one) are measured separately.
+
+    Parameters
+    ----------
+    executor_type : str (default: "thread")
+        One of `"thread"` (a thread pool), `"process"` (a process pool, requires
+        the client proxies and instructions to be picklable) or `"asyncio"` (an
+        event loop running in a background thread; coroutine functions are awaited
+        on the loop, other functions run in its default thread pool).
+    max_workers : Optional[int] (default: None)
+        The maximum number of concurrent calls. If None, the default of
+        `concurrent.futures.ThreadPoolExecutor` (thread, asyncio) or the number of
+        CPUs (process) is used.
+
+    Like with the executors of `concurrent.futures`, a call can only be cancelled
+    before it starts running, except with `"process"`, where cancelling the
+    future of a running call only discards its result.
+    """
+
+    def __init__(
+        self, executor_type: str = "thread", max_workers: Optional[int] = None
+    ) -> None:
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Executor type `{executor_type}` is not supported. "
+                f"Choose one of: {list(EXECUTOR_TYPES)}."
+            )
+        if max_workers is None:
+            num_cpus = os.cpu_count() or 1
+            if executor_type == "process":
+                max_workers = num_cpus
+            else:
+                max_workers = min(32, num_cpus + 4)
+        self.executor_type = executor_type
+        self.num_workers = max_workers
+
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        if executor_type == "thread":
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="server"
+            )
+        elif executor_type == "process":
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._loop.set_default_executor(
+                concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="server"
+                )
+            )
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="server-loop", daemon=True
+            )
+            self._loop_thread.start()
+
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._num_inflight = 0
+        self._windows: dict[Hashable, _Window] = {}
+        self._local = threading.local()
+        self.reset_metrics()
+
+    @property
+    def awaits_coroutines(self) -> bool:
+        """Whether coroutine functions are awaited on the loop of the executor."""
+        return self._loop is not None
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> concurrent.futures.Future:  # type: ignore[type-arg]
+        """Schedule `fn(*args, **kwargs)` and return a future for its result."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._num_inflight += 1
+            queue_depth = max(0, self._num_inflight - self.num_workers)
+            window = self._windows.get(getattr(self._local, "window", None))
+            if window is not None:
+                window.num_submitted += 1
+                window.queue_depth_sum += queue_depth
+                window.queue_depth_max = max(window.queue_depth_max, queue_depth)
+
+        outer: concurrent.futures.Future = (  # type: ignore[type-arg]
+            concurrent.futures.Future()
+        )
+        # The future of the call is running once the call starts, unless cancelled
+        start = outer.set_running_or_notify_cancel
+        inner: concurrent.futures.Future  # type: ignore[type-arg]
+        if self._loop is not None:
+            inner = asyncio.run_coroutine_threadsafe(
+                _timed_call_async(fn, args, kwargs, start), self._loop
+            )
+        elif self.executor_type == "thread":
+            inner = self._pool.submit(  # type: ignore[union-attr]
+                _timed_call, fn, args, kwargs, start
+            )
+        else:
+            # The call starts in another process, which cannot update `outer`
+            inner = self._pool.submit(  # type: ignore[union-attr]
+                _timed_call, fn, args, kwargs
+            )
+        outer.add_done_callback(partial(_cancel_inner, inner))
+        inner.add_done_callback(partial(self._on_done, outer, window))
+        return outer
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting calls and release the workers.
+
+        With `wait=False`, the calls still running are not waited for: coroutines
+        are cancelled, and calls running in a thread or process finish in the
+        background.
+        """
+        with self._lock:
+            self._shutdown = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+        if self._loop is not None:
+            loop = self._loop
+            if not wait:
+                asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result()
+            asyncio.run_coroutine_threadsafe(
+                loop.shutdown_default_executor(), loop
+            ).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join()  # type: ignore[union-attr]
+            loop.close()
+
+    def reset_metrics(self, window: Hashable = None) -> None:
+        """Start a new measurement window (e.g. at the start of a round).
+
+        Calls are measured in the window None unless submitted within `measure`.
+        """
+        with self._lock:
+            self._windows[window] = _Window()
+
+    @contextmanager
+    def measure(self, window: Hashable) -> Iterator[None]:
+        """Measure the calls submitted by the current thread in `window`."""
+        previous = getattr(self._local, "window", None)
+        self._local.window = window
+        try:
+            yield
+        finally:
+            self._local.window = previous
+
+    def metrics(self, window: Hashable = None) -> dict[str, Scalar]:
+        """Return the metrics of a measurement window.
+
+        `queue_depth_max` and `queue_depth_mean` are the number of calls waiting
+        for a free worker when a call is submitted; `utilization` is the fraction
+        of the window's worker time spent running calls.
+        """
+        with self._lock:
+            return _window_metrics(self._windows[window], self.num_workers)
+
+    def end_metrics(self, window: Hashable) -> dict[str, Scalar]:
+        """Return the metrics of a measurement window and stop measuring it."""
+        with self._lock:
+            return _window_metrics(self._windows.pop(window), self.num_workers)
+
+    def _on_done(
+        self,
+        outer: concurrent.futures.Future,  # type: ignore[type-arg]
+        window: Optional[_Window],
+        inner: concurrent.futures.Future,  # type: ignore[type-arg]
+    ) -> None:
+        """Record the metrics of a finished call and resolve its future."""
+        with self._lock:
+            self._num_inflight -= 1
+        if inner.cancelled():
+            if not outer.cancel():
+                # Running coroutine cancelled by `shutdown`
+                outer.set_exception(concurrent.futures.CancelledError())
+            return
+        failure = inner.exception()
+        if failure is not None:
+            # The call could not be run at all (e.g. arguments not picklable)
+            error = ExecutorError(
+                f"The {self.executor_type} executor could not run a call: {failure!r}"
+            )
+            error.__cause__ = failure
+            if _resolvable(outer):
+                outer.set_exception(error)
+            return
+
+        result = inner.result()
+        if result is None:
+            return  # Cancelled before it started
+        succeeded, value, started, finished = result
+        if window is not None:
+            with self._lock:
+                window.num_completed += 1
+                window.busy_time += finished - started
+        if not _resolvable(outer):
+            return
+        if succeeded:
+            outer.set_result(value)
+        else:
+            outer.set_exception(value)
+
+
+def _window_metrics(window: _Window, num_workers: int) -> dict[str, Scalar]:
+    """Compute the metrics of a measurement window."""
+    elapsed = time.time() - window.start
+    num_submitted = window.num_submitted
+    return {
+        "tasks_submitted": num_submitted,
+        "tasks_completed": window.num_completed,
+        "queue_depth_max": window.queue_depth_max,
+        "queue_depth_mean": (
+            window.queue_depth_sum / num_submitted if num_submitted else 0.0
+        ),
+        "utilization": (
+            min(1.0, window.busy_time / (num_workers * elapsed))
+            if elapsed > 0
+            else 0.0
+        ),
+    }
+
+
+async def _cancel_tasks() -> None:
+    """Cancel the other tasks of the running loop and wait for them to finish."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _resolvable(
+    outer: concurrent.futures.Future,  # type: ignore[type-arg]
+) -> bool:
+    """Mark `outer` as running if it is not yet, return False if it was cancelled."""
+    return outer.running() or outer.set_running_or_notify_cancel()
+
+
+def _cancel_inner(
+    inner: concurrent.futures.Future,  # type: ignore[type-arg]
+    outer: concurrent.futures.Future,  # type: ignore[type-arg]
+) -> None:
+    """Cancel the scheduled call if its future was cancelled."""
+    if outer.cancelled():
+        inner.cancel()
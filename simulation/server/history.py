@@ -16,6 +16,8 @@ class History:
         self.metrics_distributed_fit: dict[str, list[tuple[int, Scalar]]] = {}
         self.metrics_distributed: dict[str, list[tuple[int, Scalar]]] = {}
         self.metrics_centralized: dict[str, list[tuple[int, Scalar]]] = {}
+        self.metrics_executor: dict[str, list[tuple[int, Scalar]]] = {}
+        self.stragglers: list[tuple[int, list[str]]] = []
 
     def add_loss_distributed(self, server_round: int, loss: float) -> None:
         """Add one loss entry (from distributed evaluation)."""
@@ -58,6 +60,19 @@ class History:
                 self.metrics_centralized[key] = []
             self.metrics_centralized[key].append((server_round, metrics[key]))
 
+    def add_metrics_executor(
+        self, server_round: int, metrics: dict[str, Scalar]
+    ) -> None:
+        """Add metrics entries (from the executor running the client calls)."""
+        for key in metrics:
+            if key not in self.metrics_executor:
+                self.metrics_executor[key] = []
+            self.metrics_executor[key].append((server_round, metrics[key]))
+
+    def add_stragglers(self, server_round: int, cids: list[str]) -> None:
+        """Add the clients whose training results arrived too late to be used."""
+        self.stragglers.append((server_round, cids))
+
     def __repr__(self) -> str:
         """Create a representation of History.
 
@@ -68,6 +83,8 @@ class History:
         * distributed training metrics.
         * distributed evaluation metrics.
         * centralized metrics.
+        * executor metrics.
+        * stragglers.
 
         Returns
         -------
@@ -107,4 +124,20 @@ class History:
             rep += "History (metrics, centralized):\n" + pprint.pformat(
                 self.metrics_centralized
             )
+        if self.metrics_executor:
+            if self.metrics_centralized:
+                rep += "\n"
+            rep += "History (metrics, executor):\n" + pprint.pformat(
+                self.metrics_executor
+            )
+        if self.stragglers:
+            if self.metrics_centralized or self.metrics_executor:
+                rep += "\n"
+            rep += "History (stragglers):\n" + reduce(
+                lambda a, b: a + b,
+                [
+                    f"\tround {server_round}: {cids}\n"
+                    for server_round, cids in self.stragglers
+                ],
+            )
         return rep
\ No newline at end of file
@@ -2,17 +2,28 @@
 
 
 import io
+import time
 import timeit
 import concurrent.futures
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
 
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 from logging import INFO, WARN
 
-from .server_config import ServerConfig
-from server.client_manager import ClientManager, SimpleClientManager
+from .server_config import InflightLimit, ServerConfig
+from server.client_manager import (
+    ClientManager,
+    IdleClientManager,
+    SimpleClientManager,
+)
 from server.strategy import Strategy, FedAvg
-from server.client_proxy import ClientProxy
+from server.client_proxy import AsyncClientProxy, ClientProxy
+from .executor import EXECUTOR_TYPES, ExecutorError, RoundExecutor
 from .history import History
+from .spill import parameters_nbytes, spill_parameters
 from common.logger import log
 from common import (
     Code,
@@ -57,22 +68,92 @@ class Server:
         )
         self.strategy: Strategy = strategy if strategy is not None else FedAvg()
         self.max_workers: Optional[int] = None
+        self.aggregation_max_workers: Optional[int] = None
+        self.executor_type = "thread"
+        self._executor: Optional[RoundExecutor] = None
+        self._stragglers: list[ClientProxy] = []
+        # Clients still running the call of a round closed without them
+        self._busy: set[str] = set()
+        self.pipelined_evaluation = False
+        self.inflight_limit: Optional[InflightLimit] = None
 
     def set_max_workers(self, max_workers: Optional[int]) -> None:
         """Set the max_workers used by ThreadPoolExecutor."""
         self.max_workers = max_workers
 
+    def set_executor_type(self, executor_type: str) -> None:
+        """Set the type of executor running client calls during `fit`.
+
+        One of `"thread"` (default), `"process"` or `"asyncio"`, see
+        `RoundExecutor`. The executor is created when `fit` starts and reused by
+        every round. With `"asyncio"`, the calls to `AsyncClientProxy` instances
+        are awaited on the event loop of the executor instead of taking a thread.
+        `"process"` requires picklable client proxies, which the proxies of a
+        Driver are not: `start_driver` rejects it. A call the executor cannot run
+        raises an `ExecutorError` from `fit`.
+        """
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Executor type `{executor_type}` is not supported. "
+                f"Choose one of: {list(EXECUTOR_TYPES)}."
+            )
+        self.executor_type = executor_type
+
+    def set_pipelined_evaluation(self, enabled: bool) -> None:
+        """Overlap the evaluation of each round with the next round of training.
+
+        If enabled, the centralized and federated evaluation of the model of round
+        N run in a background thread while round N + 1 trains. The results are
+        still added to the History under round N, in round order. At most one
+        evaluation runs in the background: round N + 2 only starts training once
+        the evaluation of round N has finished.
+        """
+        self.pipelined_evaluation = enabled
+
+    def set_inflight_limit(self, inflight_limit: Optional[InflightLimit]) -> None:
+        """Cap the model updates a round of training keeps in memory.
+
+        See `InflightLimit`. If None (default), all clients of a round are called
+        at once and their updates are kept in memory until aggregated.
+        """
+        self.inflight_limit = inflight_limit
+
+    def set_aggregation_max_workers(self, max_workers: Optional[int]) -> None:
+        """Set the maximum number of threads the strategy uses to aggregate."""
+        self.aggregation_max_workers = max_workers
+        self.strategy.set_aggregation_max_workers(max_workers)
+
     def set_strategy(self, strategy: Strategy) -> None:
         """Replace server strategy."""
         self.strategy = strategy
+        if self.aggregation_max_workers is not None:
+            self.strategy.set_aggregation_max_workers(self.aggregation_max_workers)
 
     def client_manager(self) -> ClientManager:
         """Return ClientManager."""
         return self._client_manager
 
-    # pylint: disable=too-many-locals
+    def _idle_client_manager(self) -> ClientManager:
+        """Return the ClientManager to sample from, without the busy stragglers."""
+        if not self._busy:
+            return self._client_manager
+        return IdleClientManager(self._client_manager, self._busy)
+
     def fit(self, num_rounds: int, timeout: Optional[float]) -> tuple[History, float]:
         """Run federated averaging for a number of rounds."""
+        # All rounds share the same executor (and hence the same workers)
+        self._executor = RoundExecutor(self.executor_type, self.max_workers)
+        try:
+            return self._fit(num_rounds, timeout)
+        finally:
+            # Don't wait for stragglers still running, their results are ignored
+            self._executor.shutdown(wait=not self._busy)
+            self._executor = None
+            self.strategy.shutdown()
+
+    # pylint: disable=too-many-locals
+    def _fit(self, num_rounds: int, timeout: Optional[float]) -> tuple[History, float]:
+        """Run the rounds of federated learning using the executor of the server."""
         history = History()
 
         # Initialize parameters
@@ -94,70 +175,182 @@ class Server:
 
         # Run federated learning for num_rounds
         start_time = timeit.default_timer()
-
-        for current_round in range(1, num_rounds + 1):
-            log(INFO, "")
-            log(INFO, "[ROUND %s]", current_round)
-            # Train model and replace previous global model
-            res_fit = self.fit_round(
-                server_round=current_round,
-                timeout=timeout,
+        evaluation_pool = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="evaluate"
             )
-            if res_fit is not None:
-                parameters_prime, fit_metrics, _ = res_fit  # fit_metrics_aggregated
-                if parameters_prime:
-                    self.parameters = parameters_prime
-                history.add_metrics_distributed_fit(
-                    server_round=current_round, metrics=fit_metrics
-                )
+            if self.pipelined_evaluation
+            else None
+        )
+        pending_evaluation: Optional[concurrent.futures.Future] = None  # type: ignore
 
-            # Evaluate model using strategy implementation
-            res_cen = self.strategy.evaluate(current_round, parameters=self.parameters)
-            if res_cen is not None:
-                loss_cen, metrics_cen = res_cen
-                log(
-                    INFO,
-                    "fit progress: (%s, %s, %s, %s)",
+        try:
+            for current_round in range(1, num_rounds + 1):
+                pending_evaluation = self._run_round(
+                    history,
                     current_round,
-                    loss_cen,
-                    metrics_cen,
-                    timeit.default_timer() - start_time,
-                )
-                history.add_loss_centralized(server_round=current_round, loss=loss_cen)
-                history.add_metrics_centralized(
-                    server_round=current_round, metrics=metrics_cen
+                    timeout,
+                    start_time,
+                    evaluation_pool,
+                    pending_evaluation,
                 )
-
-            # Evaluate model on a sample of available clients
-            res_fed = self.evaluate_round(server_round=current_round, timeout=timeout)
-            if res_fed is not None:
-                loss_fed, evaluate_metrics_fed, _ = res_fed
-                if loss_fed is not None:
-                    history.add_loss_distributed(
-                        server_round=current_round, loss=loss_fed
-                    )
-                    history.add_metrics_distributed(
-                        server_round=current_round, metrics=evaluate_metrics_fed
-                    )
+            if pending_evaluation is not None:
+                self._record_evaluation(history, *pending_evaluation.result())
+        finally:
+            if evaluation_pool is not None:
+                evaluation_pool.shutdown(wait=True, cancel_futures=True)
 
         # Bookkeeping
         end_time = timeit.default_timer()
         elapsed = end_time - start_time
         return history, elapsed
 
+    # pylint: disable=too-many-arguments
+    def _run_round(
+        self,
+        history: History,
+        current_round: int,
+        timeout: Optional[float],
+        start_time: float,
+        evaluation_pool: Optional[concurrent.futures.Executor],
+        pending_evaluation: Optional[concurrent.futures.Future],  # type: ignore
+    ) -> Optional[concurrent.futures.Future]:  # type: ignore
+        """Train and evaluate the model of one round.
+
+        Returns the future of the evaluation of this round if it runs in the
+        background, after recording the evaluation of the previous round.
+        """
+        log(INFO, "")
+        log(INFO, "[ROUND %s]", current_round)
+        # Measure the calls of this round, its evaluation included
+        self._executor.reset_metrics(current_round)  # type: ignore[union-attr]
+        # Train model and replace previous global model
+        with self._executor.measure(current_round):  # type: ignore[union-attr]
+            res_fit = self.fit_round(
+                server_round=current_round,
+                timeout=timeout,
+            )
+        if res_fit is not None:
+            parameters_prime, fit_metrics, _ = res_fit  # fit_metrics_aggregated
+            if parameters_prime:
+                self.parameters = parameters_prime
+            history.add_metrics_distributed_fit(
+                server_round=current_round, metrics=fit_metrics
+            )
+        if self._stragglers:
+            history.add_stragglers(
+                server_round=current_round,
+                cids=[client.cid for client in self._stragglers],
+            )
+
+        # The evaluation of the previous round is due before another starts
+        if pending_evaluation is not None:
+            self._record_evaluation(history, *pending_evaluation.result())
+
+        # Evaluate the model of this round, in the background if pipelined
+        if evaluation_pool is not None:
+            evaluation = evaluation_pool.submit(
+                self._evaluate_model,
+                current_round,
+                self.parameters,
+                timeout,
+                start_time,
+            )
+        else:
+            self._record_evaluation(
+                history,
+                *self._evaluate_model(
+                    current_round, self.parameters, timeout, start_time
+                ),
+            )
+            evaluation = None
+        return evaluation
+
+    def _evaluate_model(
+        self,
+        server_round: int,
+        parameters: Parameters,
+        timeout: Optional[float],
+        start_time: float,
+    ) -> tuple[
+        int,
+        Optional[tuple[float, dict[str, Scalar]]],
+        Optional[tuple[Optional[float], dict[str, Scalar], EvaluateResultsAndFailures]],
+        float,
+    ]:
+        """Evaluate the model of a round centrally and on a sample of clients."""
+        # Evaluate model using strategy implementation
+        res_cen = self.strategy.evaluate(server_round, parameters=parameters)
+        elapsed = timeit.default_timer() - start_time
+
+        # Evaluate model on a sample of available clients
+        with self._executor.measure(server_round):  # type: ignore[union-attr]
+            res_fed = self.evaluate_round(
+                server_round=server_round, timeout=timeout, parameters=parameters
+            )
+        return server_round, res_cen, res_fed, elapsed
+
+    def _record_evaluation(
+        self,
+        history: History,
+        server_round: int,
+        res_cen: Optional[tuple[float, dict[str, Scalar]]],
+        res_fed: Optional[
+            tuple[Optional[float], dict[str, Scalar], EvaluateResultsAndFailures]
+        ],
+        elapsed: float,
+    ) -> None:
+        """Add the results of `_evaluate_model` to the history.
+
+        The executor metrics of the round are recorded too, as its evaluation
+        is its last use of the executor.
+        """
+        if res_cen is not None:
+            loss_cen, metrics_cen = res_cen
+            log(
+                INFO,
+                "fit progress: (%s, %s, %s, %s)",
+                server_round,
+                loss_cen,
+                metrics_cen,
+                elapsed,
+            )
+            history.add_loss_centralized(server_round=server_round, loss=loss_cen)
+            history.add_metrics_centralized(
+                server_round=server_round, metrics=metrics_cen
+            )
+
+        if res_fed is not None:
+            loss_fed, evaluate_metrics_fed, _ = res_fed
+            if loss_fed is not None:
+                history.add_loss_distributed(server_round=server_round, loss=loss_fed)
+                history.add_metrics_distributed(
+                    server_round=server_round, metrics=evaluate_metrics_fed
+                )
+
+        # Record how busy the executor was during this round
+        executor_metrics = self._executor.end_metrics(  # type: ignore[union-attr]
+            server_round
+        )
+        log(INFO, "executor: %s", executor_metrics)
+        history.add_metrics_executor(
+            server_round=server_round, metrics=executor_metrics
+        )
+
     def evaluate_round(
         self,
         server_round: int,
         timeout: Optional[float],
+        parameters: Optional[Parameters] = None,
     ) -> Optional[
         tuple[Optional[float], dict[str, Scalar], EvaluateResultsAndFailures]
     ]:
-        """Validate current global model on a number of clients."""
+        """Validate the global model (or `parameters`) on a number of clients."""
         # Get clients and their respective instructions from strategy
         client_instructions = self.strategy.configure_evaluate(
             server_round=server_round,
-            parameters=self.parameters,
-            client_manager=self._client_manager,
+            parameters=parameters if parameters is not None else self.parameters,
+            client_manager=self._idle_client_manager(),
         )
         if not client_instructions:
             log(INFO, "configure_evaluate: no clients selected, skipping evaluation")
@@ -175,6 +368,7 @@ class Server:
             max_workers=self.max_workers,
             timeout=timeout,
             group_id=server_round,
+            executor=self._executor,
         )
         log(
             INFO,
@@ -204,7 +398,7 @@ class Server:
         client_instructions = self.strategy.configure_fit(
             server_round=server_round,
             parameters=self.parameters,
-            client_manager=self._client_manager,
+            client_manager=self._idle_client_manager(),
         )
 
         if not client_instructions:
@@ -217,12 +411,28 @@ class Server:
             self._client_manager.num_available(),
         )
 
+        # Let the strategy aggregate results as they arrive (if it supports it)
+        streaming = self.strategy.begin_aggregate_fit(server_round)
+        policy = self.strategy.fit_round_policy(server_round)
+
         # Collect `fit` results from all clients participating in this round
+        self._stragglers = []
         results, failures = fit_clients(
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
             group_id=server_round,
+            executor=self._executor,
+            on_result=(
+                partial(self.strategy.accumulate_fit, server_round)
+                if streaming
+                else None
+            ),
+            num_results=policy.num_results if policy is not None else None,
+            deadline=policy.deadline if policy is not None else None,
+            stragglers=self._stragglers,
+            inflight_limit=self.inflight_limit,
+            busy=self._busy,
         )
         log(
             INFO,
@@ -230,12 +440,26 @@ class Server:
             len(results),
             len(failures),
         )
+        if self._stragglers:
+            log(
+                INFO,
+                "aggregate_fit: closed the round without waiting for %s stragglers",
+                len(self._stragglers),
+            )
 
         # Aggregate training results
         aggregated_result: tuple[
             Optional[Parameters],
             dict[str, Scalar],
-        ] = self.strategy.aggregate_fit(server_round, results, failures)
+        ]
+        if streaming:
+            aggregated_result = self.strategy.finalize_aggregate_fit(
+                server_round, results, failures
+            )
+        else:
+            aggregated_result = self.strategy.aggregate_fit(
+                server_round, results, failures
+            )
 
         parameters_aggregated, metrics_aggregated = aggregated_result
         return parameters_aggregated, metrics_aggregated, (results, failures)
@@ -282,16 +506,70 @@ class Server:
         return get_parameters_res.parameters
     
 
+@contextmanager
+def _client_executor(
+    executor: Optional[concurrent.futures.Executor], max_workers: Optional[int]
+) -> Iterator[concurrent.futures.Executor]:
+    """Yield `executor`, or a thread pool shut down on exit if it is None.
+
+    The thread pool does not wait for calls that are still running when the
+    caller is done (e.g. stragglers of a round closed early).
+    """
+    if executor is not None:
+        yield executor
+        return
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield pool
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def resolve_client_call(
+    pool: concurrent.futures.Executor,
+    client_proxy: ClientProxy,
+    call: Callable[..., Any],
+    async_call: Callable[..., Any],
+) -> Callable[..., Any]:
+    """Return `async_call` if `pool` can await it for `client_proxy`, else `call`.
+
+    The coroutine variant is used for `AsyncClientProxy` instances submitted to a
+    `RoundExecutor` awaiting coroutines on its event loop, so waiting for the
+    client does not occupy a thread.
+    """
+    if isinstance(client_proxy, AsyncClientProxy) and getattr(
+        pool, "awaits_coroutines", False
+    ):
+        return async_call
+    return call
+
+
 def evaluate_clients(
     client_instructions: list[tuple[ClientProxy, EvaluateIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
     group_id: int,
+    executor: Optional[concurrent.futures.Executor] = None,
 ) -> EvaluateResultsAndFailures:
-    """Evaluate parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    """Evaluate parameters concurrently on all selected clients.
+
+    Clients whose proxies can start calls without waiting (see
+    `ClientProxy.start_evaluate`) are all called at once. The other calls are
+    submitted to `executor` if given, otherwise to a thread pool created for this
+    call only.
+    """
+    with _client_executor(executor, max_workers) as pool:
         submitted_fs = {
-            executor.submit(evaluate_client, client_proxy, ins, timeout, group_id)
+            start_evaluate_client(client_proxy, ins, timeout, group_id)
+            or pool.submit(
+                resolve_client_call(
+                    pool, client_proxy, evaluate_client, evaluate_client_async
+                ),
+                client_proxy,
+                ins,
+                timeout,
+                group_id,
+            )
             for client_proxy, ins in client_instructions
         }
         finished_fs, _ = concurrent.futures.wait(
@@ -320,6 +598,28 @@ def evaluate_client(
     return client, evaluate_res
 
 
+async def evaluate_client_async(
+    client: AsyncClientProxy,
+    ins: EvaluateIns,
+    timeout: Optional[float],
+    group_id: int,
+) -> tuple[ClientProxy, EvaluateRes]:
+    """Evaluate parameters on a single client without blocking a thread."""
+    evaluate_res = await client.evaluate_async(ins, timeout=timeout, group_id=group_id)
+    return client, evaluate_res
+
+
+def start_evaluate_client(
+    client: ClientProxy,
+    ins: EvaluateIns,
+    timeout: Optional[float],
+    group_id: int,
+) -> Optional[concurrent.futures.Future]:  # type: ignore[type-arg]
+    """Start evaluating on a single client without waiting, if it supports it."""
+    future = client.start_evaluate(ins, timeout=timeout, group_id=group_id)
+    return None if future is None else _with_client(client, future)
+
+
 def _handle_finished_future_after_evaluate(
     future: concurrent.futures.Future,  # type: ignore
     results: list[tuple[ClientProxy, EvaluateRes]],
@@ -329,6 +629,9 @@ def _handle_finished_future_after_evaluate(
     # Check if there was an exception
     failure = future.exception()
     if failure is not None:
+        if isinstance(failure, ExecutorError):
+            # The call never reached the client, don't count it as a failure
+            raise failure
         failures.append(failure)
         return
 
@@ -345,33 +648,222 @@ def _handle_finished_future_after_evaluate(
     failures.append(result)
 
 
+# pylint: disable=too-many-arguments,too-many-locals,too-many-branches
 def fit_clients(
     client_instructions: list[tuple[ClientProxy, FitIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
     group_id: int,
+    executor: Optional[concurrent.futures.Executor] = None,
+    on_result: Optional[Callable[[tuple[ClientProxy, FitRes]], None]] = None,
+    num_results: Optional[int] = None,
+    deadline: Optional[float] = None,
+    stragglers: Optional[list[ClientProxy]] = None,
+    inflight_limit: Optional[InflightLimit] = None,
+    busy: Optional[set[str]] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(fit_client, client_proxy, ins, timeout, group_id)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    """Refine parameters concurrently on all selected clients.
+
+    Clients whose proxies can start calls without waiting (see
+    `ClientProxy.start_fit`) are called at once, without occupying a thread. The
+    other calls are submitted to `executor` if given, otherwise to a thread pool
+    created for this call only. Results are gathered in the order in which clients
+    finish.
+    If `on_result` is given, it is called with each successful result as soon as it
+    is received, while the remaining clients are still training.
+
+    The round is closed early once `num_results` successful results were received
+    or `deadline` seconds have passed, whichever comes first. Calls that have not
+    started yet are cancelled. The instructions of the calls in progress are
+    withdrawn from the clients that did not receive them yet (see
+    `ClientProxy.withdraw`), the other calls keep running in the background and
+    their results are ignored. The clients that did not finish in time are
+    appended to `stragglers` (if given), and the IDs of those whose calls are still
+    running are kept in `busy` (if given) until their calls return.
+
+    With an `inflight_limit`, clients are called progressively so the updates in
+    memory stay within the limit, and results received while it is exceeded are
+    spilled to disk (see `InflightLimit`).
+    """
+    end_time = time.time() + deadline if deadline is not None else None
 
-    # Gather results
     results: list[tuple[ClientProxy, FitRes]] = []
     failures: list[Union[tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fit(
-            future=future, results=results, failures=failures
+    queued = deque(client_instructions)
+    budget = _InflightBudget(inflight_limit)
+    with _client_executor(executor, max_workers) as pool:
+        submitted_fs: dict[concurrent.futures.Future, ClientProxy] = {}  # type: ignore
+        pending_fs: set[concurrent.futures.Future] = set()  # type: ignore
+        while queued or pending_fs:
+            # Call as many clients as the limit on the updates in memory allows
+            while queued and budget.can_submit(queued[0][1], bool(pending_fs)):
+                client_proxy, ins = queued.popleft()
+                future = start_fit_client(
+                    client_proxy, ins, timeout, group_id
+                ) or pool.submit(
+                    resolve_client_call(
+                        pool, client_proxy, fit_client, fit_client_async
+                    ),
+                    client_proxy,
+                    ins,
+                    timeout,
+                    group_id,
+                )
+                submitted_fs[future] = client_proxy
+                pending_fs.add(future)
+                budget.submitted(future, ins)
+
+            remaining = (
+                max(0.0, end_time - time.time()) if end_time is not None else None
+            )
+            done_fs, pending_fs = concurrent.futures.wait(
+                pending_fs,
+                timeout=remaining,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            if not done_fs:
+                log(INFO, "fit_clients: the deadline of %ss has passed", deadline)
+                break
+
+            closed = False
+            for future in done_fs:
+                if closed:
+                    # Finished too, but after the round was closed
+                    pending_fs.add(future)
+                    continue
+                num_received = len(results)
+                _handle_finished_future_after_fit(
+                    future=future, results=results, failures=failures
+                )
+                if on_result is not None and len(results) > num_received:
+                    on_result(results[-1])
+                budget.received(
+                    future, results[-1] if len(results) > num_received else None
+                )
+                closed = num_results is not None and len(results) >= num_results
+            if closed:
+                break
+
+        # Cancel (or ignore) the work of the clients that did not make it in time
+        for future in pending_fs:
+            client_proxy = submitted_fs[future]
+            if not future.cancel():
+                client_proxy.withdraw(group_id)
+                if busy is not None:
+                    busy.add(client_proxy.cid)
+                    future.add_done_callback(
+                        partial(_discard_when_done, busy, client_proxy.cid)
+                    )
+            if stragglers is not None:
+                stragglers.append(client_proxy)
+        if stragglers is not None:
+            stragglers.extend(client_proxy for client_proxy, _ in queued)
+    if budget.num_spilled > 0:
+        log(
+            INFO,
+            "fit_clients: spilled %s results (%.1f MB) to disk",
+            budget.num_spilled,
+            budget.spilled_bytes / 1e6,
         )
     return results, failures
 
 
+def _discard_when_done(
+    busy: set[str], cid: str, _: concurrent.futures.Future  # type: ignore
+) -> None:
+    """Mark a client whose call returned as idle again."""
+    busy.discard(cid)
+
+
+class _InflightBudget:
+    """Book-keeping of the updates a round of training keeps in memory.
+
+    The number and size of the reserved and held updates are kept as running
+    totals, so checking the limit does not depend on the number of results.
+    """
+
+    def __init__(self, limit: Optional[InflightLimit]) -> None:
+        self.limit = limit
+        self._reserved: dict[concurrent.futures.Future, int] = {}  # type: ignore
+        self._reserved_bytes = 0
+        self._held: deque[tuple[FitRes, int]] = deque()
+        self._held_bytes = 0
+        self.num_spilled = 0
+        self.spilled_bytes = 0
+
+    def _usage(self) -> tuple[int, int]:
+        """Return the number and size of the updates in memory."""
+        return (
+            len(self._reserved) + len(self._held),
+            self._reserved_bytes + self._held_bytes,
+        )
+
+    def _exceeds(self, num_results: int, num_bytes: int) -> bool:
+        limit = self.limit
+        return limit is not None and (
+            (limit.max_results is not None and num_results > limit.max_results)
+            or (limit.max_bytes is not None and num_bytes > limit.max_bytes)
+        )
+
+    def can_submit(self, ins: FitIns, any_pending: bool) -> bool:
+        """Return whether calling one more client stays within the limit.
+
+        Results held in memory are spilled (oldest first) to make room for the
+        call, calls are only throttled if the calls in flight fill the limit.
+        """
+        if self.limit is None:
+            return True
+        num_bytes = parameters_nbytes(ins.parameters)
+        while self._exceeds(*self._with_call(num_bytes)) and self._held:
+            self._spill(*self._held.popleft())
+        return not any_pending or not self._exceeds(*self._with_call(num_bytes))
+
+    def _with_call(self, num_bytes: int) -> tuple[int, int]:
+        """Return the number and size of the updates in memory with one more call."""
+        num_results, num_bytes_used = self._usage()
+        return num_results + 1, num_bytes_used + num_bytes
+
+    def submitted(
+        self, future: concurrent.futures.Future, ins: FitIns  # type: ignore
+    ) -> None:
+        """Reserve memory for the update of a client that was called."""
+        if self.limit is not None:
+            num_bytes = parameters_nbytes(ins.parameters)
+            self._reserved[future] = num_bytes
+            self._reserved_bytes += num_bytes
+
+    def received(
+        self,
+        future: concurrent.futures.Future,  # type: ignore
+        result: Optional[tuple[ClientProxy, FitRes]],
+    ) -> None:
+        """Account for a finished call, spilling its update if over the limit."""
+        if self.limit is None:
+            return
+        self._reserved_bytes -= self._reserved.pop(future, 0)
+        if result is None:
+            return
+        fit_res = result[1]
+        num_bytes = parameters_nbytes(fit_res.parameters)
+        if num_bytes == 0:
+            return  # Already aggregated and released
+        self._held.append((fit_res, num_bytes))
+        self._held_bytes += num_bytes
+        if self._exceeds(*self._usage()):
+            self._spill(*self._held.pop())
+
+    def _spill(self, fit_res: FitRes, num_bytes: int) -> None:
+        """Move the update of a result no longer held in memory to disk."""
+        self._held_bytes -= num_bytes
+        if parameters_nbytes(fit_res.parameters) == 0:
+            return  # Released (e.g. aggregated) since it was received
+        self.spilled_bytes += num_bytes
+        self.num_spilled += 1
+        spill_parameters(
+            fit_res.parameters, self.limit.spill_dir  # type: ignore[union-attr]
+        )
+
+
 def fit_client(
     client: ClientProxy, ins: FitIns, timeout: Optional[float], group_id: int
 ) -> tuple[ClientProxy, FitRes]:
@@ -380,6 +872,48 @@ def fit_client(
     return client, fit_res
 
 
+async def fit_client_async(
+    client: AsyncClientProxy, ins: FitIns, timeout: Optional[float], group_id: int
+) -> tuple[ClientProxy, FitRes]:
+    """Refine parameters on a single client without blocking a thread."""
+    fit_res = await client.fit_async(ins, timeout=timeout, group_id=group_id)
+    return client, fit_res
+
+
+def start_fit_client(
+    client: ClientProxy, ins: FitIns, timeout: Optional[float], group_id: int
+) -> Optional[concurrent.futures.Future]:  # type: ignore[type-arg]
+    """Start training on a single client without waiting, if it supports it."""
+    future = client.start_fit(ins, timeout=timeout, group_id=group_id)
+    return None if future is None else _with_client(client, future)
+
+
+def _with_client(
+    client: ClientProxy,
+    future: concurrent.futures.Future,  # type: ignore[type-arg]
+) -> concurrent.futures.Future:  # type: ignore[type-arg]
+    """Return a future for `(client, result)`, like those of `fit_client`."""
+    outer: concurrent.futures.Future = (  # type: ignore[type-arg]
+        concurrent.futures.Future()
+    )
+    # The call has started, it cannot be cancelled
+    outer.set_running_or_notify_cancel()
+    future.add_done_callback(partial(_resolve_with_client, client, outer))
+    return outer
+
+
+def _resolve_with_client(
+    client: ClientProxy,
+    outer: concurrent.futures.Future,  # type: ignore[type-arg]
+    future: concurrent.futures.Future,  # type: ignore[type-arg]
+) -> None:
+    """Resolve the future of `_with_client` once the call of `client` is done."""
+    try:
+        outer.set_result((client, future.result()))
+    except BaseException as ex:  # pylint: disable=broad-exception-caught
+        outer.set_exception(ex)
+
+
 def _handle_finished_future_after_fit(
     future: concurrent.futures.Future,  # type: ignore
     results: list[tuple[ClientProxy, FitRes]],
@@ -389,6 +923,9 @@ def _handle_finished_future_after_fit(
     # Check if there was an exception
     failure = future.exception()
     if failure is not None:
+        if isinstance(failure, ExecutorError):
+            # The call never reached the client, don't count it as a failure
+            raise failure
         failures.append(failure)
         return
 
@@ -409,11 +946,19 @@ def reconnect_clients(
     client_instructions: list[tuple[ClientProxy, ReconnectIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    executor: Optional[concurrent.futures.Executor] = None,
 ) -> ReconnectResultsAndFailures:
     """Instruct clients to disconnect and never reconnect."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with _client_executor(executor, max_workers) as pool:
         submitted_fs = {
-            executor.submit(reconnect_client, client_proxy, ins, timeout)
+            pool.submit(
+                resolve_client_call(
+                    pool, client_proxy, reconnect_client, reconnect_client_async
+                ),
+                client_proxy,
+                ins,
+                timeout,
+            )
             for client_proxy, ins in client_instructions
         }
         finished_fs, _ = concurrent.futures.wait(
@@ -426,6 +971,8 @@ def reconnect_clients(
     failures: list[Union[tuple[ClientProxy, DisconnectRes], BaseException]] = []
     for future in finished_fs:
         failure = future.exception()
+        if isinstance(failure, ExecutorError):
+            raise failure
         if failure is not None:
             failures.append(failure)
         else:
@@ -448,6 +995,20 @@ def reconnect_client(
     return client, disconnect
 
 
+async def reconnect_client_async(
+    client: AsyncClientProxy,
+    reconnect: ReconnectIns,
+    timeout: Optional[float],
+) -> tuple[ClientProxy, DisconnectRes]:
+    """Instruct client to disconnect without blocking a thread."""
+    disconnect = await client.reconnect_async(
+        reconnect,
+        timeout=timeout,
+        group_id=None,
+    )
+    return client, disconnect
+
+
 def init_defaults(
     server: Optional[Server],
     config: Optional[ServerConfig],
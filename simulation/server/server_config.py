@@ -23,4 +23,47 @@ class ServerConfig:
             if self.round_timeout is None
             else f"round_timeout={self.round_timeout}s"
         )
-        return f"num_rounds={self.num_rounds}, {timeout_string}"
\ No newline at end of file
+        return f"num_rounds={self.num_rounds}, {timeout_string}"
+
+
+@dataclass
+class RoundPolicy:
+    """When to close a round of training.
+
+    A round is closed as soon as `num_results` successful results have arrived or
+    `deadline` seconds have passed since it started, whichever comes first. Clients
+    that have not replied by then are stragglers: their calls are cancelled if they
+    have not started yet and their results are ignored otherwise. If both attributes
+    are None, the round waits for all clients.
+    """
+
+    num_results: Optional[int] = None
+    deadline: Optional[float] = None
+
+
+@dataclass
+class InflightLimit:
+    """Cap on the model updates a round of training keeps in memory.
+
+    Updates count against the cap from the moment their client is called until the
+    strategy has aggregated them (or released them, when aggregating while results
+    arrive). A call in flight counts with the size of the model sent to the client.
+    New clients are only called while the cap allows it (one client is always
+    called), and results received while the cap is exceeded are spilled to files in
+    `spill_dir` until they are aggregated.
+
+    Attributes
+    ----------
+    max_results : Optional[int] (default: None)
+        The maximum number of updates in memory. If None, the number is unlimited.
+    max_bytes : Optional[int] (default: None)
+        The maximum size of the updates in memory, in bytes. If None, the size is
+        unlimited.
+    spill_dir : Optional[str] (default: None)
+        Directory of the spill files. If None, the default temporary directory is
+        used.
+    """
+
+    max_results: Optional[int] = None
+    max_bytes: Optional[int] = None
+    spill_dir: Optional[str] = None
@@ -0,0 +1,90 @@
+"""Spilling of serialized model updates to disk."""
+
+
+import mmap
+import tempfile
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union, overload
+
+from common import Parameters
+
+
+class SpilledTensors(Sequence[memoryview]):
+    """Serialized tensors moved from memory to an (already unlinked) scratch file.
+
+    The tensors are written to the file once and mapped into memory read-only, so
+    reading a tensor returns a `memoryview` of its bytes that the operating system
+    can page in and out on demand. `bytes_to_ndarray(..., copy=False)` turns such a
+    view into an array without copying it. Pickling a `SpilledTensors` gives a list
+    of bytes.
+
+    Parameters
+    ----------
+    tensors : Iterable[bytes]
+        The serialized tensors.
+    spill_dir : Optional[str] (default: None)
+        Directory of the spill file. If None, the default temporary directory is
+        used.
+    """
+
+    def __init__(self, tensors: Iterable[bytes], spill_dir: Optional[str] = None):
+        self._offsets = [0]
+        self._mmap: Optional[mmap.mmap] = None
+        with tempfile.TemporaryFile(dir=spill_dir, prefix="flwr-spill-") as file:
+            for tensor in tensors:
+                file.write(tensor)
+                self._offsets.append(self._offsets[-1] + len(tensor))
+            file.flush()
+            if self.nbytes > 0:
+                # The mapping keeps the file alive after it is closed
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the total size of the tensors."""
+        return self._offsets[-1]
+
+    def __len__(self) -> int:
+        """Return the number of tensors."""
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> memoryview: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[memoryview]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[memoryview, list[memoryview]]:
+        """Return a read-only view of the bytes of a tensor."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("tensor index out of range")
+        begin, end = self._offsets[index], self._offsets[index + 1]
+        if begin == end:
+            return memoryview(b"")
+        return memoryview(self._mmap)[begin:end]  # type: ignore[arg-type]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the tensors as a list of bytes."""
+        return (list, ([bytes(tensor) for tensor in self],))
+
+
+def parameters_nbytes(parameters: Parameters) -> int:
+    """Return the number of bytes of the tensors of `parameters` held in memory."""
+    if isinstance(parameters.tensors, SpilledTensors):
+        return 0
+    return sum(len(tensor) for tensor in parameters.tensors)
+
+
+def spill_parameters(parameters: Parameters, spill_dir: Optional[str] = None) -> None:
+    """Move the tensors of `parameters` to a spill file, in place."""
+    if isinstance(parameters.tensors, SpilledTensors):
+        return
+    parameters.tensors = SpilledTensors(  # type: ignore[assignment]
+        parameters.tensors, spill_dir
+    )
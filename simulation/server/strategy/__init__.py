@@ -2,9 +2,13 @@
 
 
 from .fedavg import FedAvg as FedAvg
+from .hierarchical import HierarchicalFedAvg as HierarchicalFedAvg
+from .sharded import ShardedFedAvg as ShardedFedAvg
 from .stategy import Strategy as Strategy
 
 __all__ = [
     "FedAvg",
+    "HierarchicalFedAvg",
+    "ShardedFedAvg",
     "Strategy",
 ]
\ No newline at end of file
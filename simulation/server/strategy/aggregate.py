@@ -1,17 +1,28 @@
 """Aggregation functions for strategy implementations."""
 
 
+from abc import ABC, abstractmethod
 from functools import reduce, partial
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 
-from common import NDArray, NDArrays, FitRes, parameters_to_ndarrays
+from common import NDArray, NDArrays, FitRes, Parameters, parameters_to_ndarrays
 from server.client_proxy import ClientProxy
 
 
 def aggregate(results: list[tuple[NDArrays, int]]) -> NDArrays:
     """Compute weighted average."""
+    return aggregate_partials([weighted_sum(results)])
+
+
+def weighted_sum(results: list[tuple[NDArrays, int]]) -> tuple[NDArrays, int]:
+    """Compute the sum of the weights multiplied by their number of examples.
+
+    Returns the weighted sum of each layer and the total number of examples, so that
+    partial sums over disjoint sets of results can be combined with
+    `aggregate_partials`.
+    """
     # Calculate the total number of examples used during training
     num_examples_total = sum(num_examples for (_, num_examples) in results)
 
@@ -20,14 +31,90 @@ def aggregate(results: list[tuple[NDArrays, int]]) -> NDArrays:
         [layer * num_examples for layer in weights] for weights, num_examples in results
     ]
 
+    # Sum the weighted weights of each layer
+    layer_sums: NDArrays = [
+        reduce(np.add, layer_updates) for layer_updates in zip(*weighted_weights)
+    ]
+    return layer_sums, num_examples_total
+
+
+def aggregate_partials(partials: list[tuple[NDArrays, int]]) -> NDArrays:
+    """Compute the weighted average from partial sums computed by `weighted_sum`."""
+    num_examples_total = sum(num_examples for (_, num_examples) in partials)
+
     # Compute average weights of each layer
     weights_prime: NDArrays = [
-        reduce(np.add, layer_updates) / num_examples_total
-        for layer_updates in zip(*weighted_weights)
+        reduce(np.add, layer_sums) / num_examples_total
+        for layer_sums in zip(*(layer_sums for layer_sums, _ in partials))
     ]
     return weights_prime
 
 
+class Accumulator(ABC):
+    """Abstract base class for running weighted averages of model updates."""
+
+    @abstractmethod
+    def add(self, weights: NDArrays, num_examples: int) -> None:
+        """Add a model update weighted by its number of examples."""
+
+    @abstractmethod
+    def result(self) -> NDArrays:
+        """Return the weighted average of all updates added so far."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all updates added so far, e.g. at the start of a new round."""
+
+    def add_parameters(self, parameters: Parameters, num_examples: int) -> None:
+        """Add a serialized model update weighted by its number of examples.
+
+        The tensors are deserialized without copying them. Accumulators can
+        override this, e.g. to move the tensors out of memory first.
+        """
+        self.add(parameters_to_ndarrays(parameters, copy=False), num_examples)
+
+    def set_max_workers(self, max_workers: Optional[int]) -> None:
+        """Set the number of threads used to aggregate (ignored by default)."""
+
+    def close(self) -> None:
+        """Release the resources of the accumulator (e.g. its threads).
+
+        The accumulator must not be used afterwards. Does nothing by default.
+        """
+
+
+class WeightedAccumulator(Accumulator):
+    """Running weighted sum of model updates.
+
+    Computes the same weighted average as `aggregate`, but model updates are added
+    one at a time. Only the running sum has to be kept in memory, not every update.
+    """
+
+    def __init__(self) -> None:
+        self.weighted_sum: Optional[NDArrays] = None
+        self.num_examples_total = 0
+
+    def add(self, weights: NDArrays, num_examples: int) -> None:
+        """Add a model update weighted by its number of examples."""
+        if self.weighted_sum is None:
+            self.weighted_sum = [layer * num_examples for layer in weights]
+        else:
+            for layer_sum, layer in zip(self.weighted_sum, weights):
+                np.add(layer_sum, layer * num_examples, out=layer_sum)
+        self.num_examples_total += num_examples
+
+    def result(self) -> NDArrays:
+        """Return the weighted average of all updates added so far."""
+        if self.weighted_sum is None:
+            raise ValueError("No model updates were added to the accumulator.")
+        return [layer / self.num_examples_total for layer in self.weighted_sum]
+
+    def reset(self) -> None:
+        """Forget all updates added so far."""
+        self.weighted_sum = None
+        self.num_examples_total = 0
+
+
 def aggregate_inplace(results: list[tuple[ClientProxy, FitRes]]) -> NDArrays:
     """Compute in-place weighted average."""
     # Count total examples
@@ -41,23 +128,25 @@ def aggregate_inplace(results: list[tuple[ClientProxy, FitRes]]) -> NDArrays:
     def _try_inplace(
         x: NDArray, y: Union[NDArray, np.float64], np_binary_op: np.ufunc
     ) -> NDArray:
+        # Read-only arrays (e.g. views of raw tensors) are not modified
+        out = x if x.flags.writeable else np.empty_like(x)
         return (  # type: ignore[no-any-return]
-            np_binary_op(x, y, out=x)
+            np_binary_op(x, y, out=out)
             if np.can_cast(y, x.dtype, casting="same_kind")
-            else np_binary_op(x, np.array(y, x.dtype), out=x)
+            else np_binary_op(x, np.array(y, x.dtype), out=out)
         )
 
     # Let's do in-place aggregation
     # Get first result, then add up each other
     params = [
         _try_inplace(x, scaling_factors[0], np_binary_op=np.multiply)
-        for x in parameters_to_ndarrays(results[0][1].parameters)
+        for x in parameters_to_ndarrays(results[0][1].parameters, copy=False)
     ]
 
     for i, (_, fit_res) in enumerate(results[1:], start=1):
         res = (
             _try_inplace(x, scaling_factors[i], np_binary_op=np.multiply)
-            for x in parameters_to_ndarrays(fit_res.parameters)
+            for x in parameters_to_ndarrays(fit_res.parameters, copy=False)
         )
         params = [
             reduce(partial(_try_inplace, np_binary_op=np.add), layer_updates)
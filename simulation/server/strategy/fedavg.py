@@ -4,13 +4,22 @@ Paper: arxiv.org/abs/1602.05629
 """
 
 
+import math
 from typing import Optional, Union, Callable
 from logging import WARNING
 
 from .stategy import Strategy
+from .flat_aggregate import FlatBufferAccumulator
 from server.client_manager import ClientManager
 from server.client_proxy import ClientProxy
-from .aggregate import aggregate, aggregate_inplace, weighted_loss_avg
+from server.server_config import RoundPolicy
+from .aggregate import (
+    Accumulator,
+    WeightedAccumulator,
+    aggregate,
+    aggregate_inplace,
+    weighted_loss_avg,
+)
 from common.logger import log
 from common import (
     Scalar, 
@@ -71,6 +80,31 @@ class FedAvg(Strategy):
         Metrics aggregation function, optional.
     inplace : bool (default: True)
         Enable (True) or disable (False) in-place aggregation of model updates.
+    streaming : bool (default: False)
+        Enable (True) or disable (False) streaming aggregation. If enabled, each
+        model update is added to a running weighted sum as soon as it is received
+        and its parameters are released right away, so only the running sum and the
+        updates still being decoded are kept in memory.
+    accumulator_fn : Optional[Callable[[], Accumulator]] (default: None)
+        Function creating the accumulator that computes the weighted average of
+        the model updates, e.g. `FlatBufferAccumulator` to aggregate in one
+        contiguous buffer or `MemmapAccumulator` to aggregate in memory-mapped
+        files within a memory budget. The accumulator is created once and reused
+        in every round. If None, `inplace` selects how results are aggregated and
+        streaming aggregation uses a `WeightedAccumulator`.
+    aggregation_max_workers : Optional[int] (default: None)
+        Maximum number of threads aggregating chunks of the model in parallel. If
+        set and `accumulator_fn` is None, results are aggregated with a
+        `FlatBufferAccumulator`, whose results do not depend on the number of
+        threads. If None, aggregation runs in a single thread, as selected by
+        `inplace` and `streaming`.
+    over_selection : float (default: 1.0)
+        Factor by which to over-sample clients for training. The round is closed as
+        soon as the originally requested number of clients returned a result, the
+        remaining clients are reported as stragglers. Must be at least 1.0.
+    round_deadline : Optional[float] (default: None)
+        Seconds after which a round of training is closed and the results received
+        so far are aggregated. If None, the round has no deadline.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -95,6 +129,11 @@ class FedAvg(Strategy):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         inplace: bool = True,
+        streaming: bool = False,
+        accumulator_fn: Optional[Callable[[], Accumulator]] = None,
+        aggregation_max_workers: Optional[int] = None,
+        over_selection: float = 1.0,
+        round_deadline: Optional[float] = None,
     ) -> None:
         super().__init__()
 
@@ -103,6 +142,8 @@ class FedAvg(Strategy):
             or min_evaluate_clients > min_available_clients
         ):
             log(WARNING, WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW)
+        if over_selection < 1.0:
+            raise ValueError("`over_selection` must be greater than or equal to 1.0")
 
         self.fraction_fit = fraction_fit
         self.fraction_evaluate = fraction_evaluate
@@ -117,6 +158,13 @@ class FedAvg(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self.streaming = streaming
+        self.accumulator_fn = accumulator_fn
+        self.aggregation_max_workers = aggregation_max_workers
+        self.over_selection = over_selection
+        self.round_deadline = round_deadline
+        self._num_fit_results_needed: Optional[int] = None
+        self._accumulator: Optional[Accumulator] = None
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -166,9 +214,16 @@ class FedAvg(Strategy):
         fit_ins = FitIns(parameters, config)
 
         # Sample clients
-        sample_size, min_num_clients = self.num_fit_clients(
-            client_manager.num_available()
-        )
+        num_available = client_manager.num_available()
+        sample_size, min_num_clients = self.num_fit_clients(num_available)
+        self._num_fit_results_needed = None
+        if self.over_selection > 1.0:
+            # Sample extra clients, the slowest of them will be ignored
+            self._num_fit_results_needed = sample_size
+            sample_size = max(
+                sample_size,
+                min(math.ceil(sample_size * self.over_selection), num_available),
+            )
         clients = client_manager.sample(
             num_clients=sample_size, min_num_clients=min_num_clients
         )
@@ -176,6 +231,14 @@ class FedAvg(Strategy):
         # Return client/config pairs
         return [(client, fit_ins) for client in clients]
 
+    def fit_round_policy(self, server_round: int) -> Optional[RoundPolicy]:
+        """Close the round once enough clients replied or the deadline passed."""
+        if self._num_fit_results_needed is None and self.round_deadline is None:
+            return None
+        return RoundPolicy(
+            num_results=self._num_fit_results_needed, deadline=self.round_deadline
+        )
+
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
     ) -> list[tuple[ClientProxy, EvaluateIns]]:
@@ -215,28 +278,108 @@ class FedAvg(Strategy):
         if not self.accept_failures and failures:
             return None, {}
 
-        if self.inplace:
+        if self.accumulator_fn is not None or self.aggregation_max_workers is not None:
+            # Add up the results in the accumulator of the strategy
+            accumulator = self._reset_accumulator()
+            for _, fit_res in results:
+                accumulator.add_parameters(fit_res.parameters, fit_res.num_examples)
+            aggregated_ndarrays = accumulator.result()
+        elif self.inplace:
             # Does in-place weighted average of results
             aggregated_ndarrays = aggregate_inplace(results)
         else:
             # Convert results
             weights_results = [
-                (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+                (
+                    parameters_to_ndarrays(fit_res.parameters, copy=False),
+                    fit_res.num_examples,
+                )
                 for _, fit_res in results
             ]
             aggregated_ndarrays = aggregate(weights_results)
 
         parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
+        metrics_aggregated = self._aggregate_fit_metrics(server_round, results)
+        return parameters_aggregated, metrics_aggregated
 
-        # Aggregate custom metrics if aggregation fn was provided
+    def set_aggregation_max_workers(self, max_workers: Optional[int]) -> None:
+        """Set the maximum number of threads used to aggregate fit results."""
+        self.aggregation_max_workers = max_workers
+        # Let the next round pick the accumulator matching the new setting
+        self._close_accumulator()
+
+    def shutdown(self) -> None:
+        """Release the accumulator, it is created again if needed."""
+        self._close_accumulator()
+
+    def _close_accumulator(self) -> None:
+        """Close the accumulator of the strategy (e.g. stop its threads)."""
+        if self._accumulator is not None:
+            self._accumulator.close()
+            self._accumulator = None
+
+    def begin_aggregate_fit(self, server_round: int) -> bool:
+        """Start a new running weighted sum if streaming aggregation is enabled."""
+        if not self.streaming:
+            return False
+        self._reset_accumulator()
+        return True
+
+    def accumulate_fit(
+        self, server_round: int, result: tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Add a fit result to the running weighted sum and release its parameters."""
+        if self._accumulator is None:
+            raise RuntimeError("`begin_aggregate_fit` was not called for this round.")
+        _, fit_res = result
+        self._accumulator.add_parameters(fit_res.parameters, fit_res.num_examples)
+        # The update is part of the running sum, don't keep it in memory
+        fit_res.parameters = Parameters(
+            tensors=[], tensor_type=fit_res.parameters.tensor_type
+        )
+
+    def finalize_aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Return the weighted average of the fit results accumulated this round."""
+        if not results or self._accumulator is None:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+
+        parameters_aggregated = ndarrays_to_parameters(self._accumulator.result())
+        metrics_aggregated = self._aggregate_fit_metrics(server_round, results)
+        return parameters_aggregated, metrics_aggregated
+
+    def _reset_accumulator(self) -> Accumulator:
+        """Return an empty accumulator, creating it the first time."""
+        if self._accumulator is None:
+            if self.accumulator_fn is not None:
+                self._accumulator = self.accumulator_fn()
+            elif self.aggregation_max_workers is not None:
+                self._accumulator = FlatBufferAccumulator()
+            else:
+                self._accumulator = WeightedAccumulator()
+            self._accumulator.set_max_workers(self.aggregation_max_workers)
+        else:
+            self._accumulator.reset()
+        return self._accumulator
+
+    def _aggregate_fit_metrics(
+        self, server_round: int, results: list[tuple[ClientProxy, FitRes]]
+    ) -> dict[str, Scalar]:
+        """Aggregate custom metrics if aggregation fn was provided."""
         metrics_aggregated = {}
         if self.fit_metrics_aggregation_fn:
             fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
             metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
         elif server_round == 1:  # Only log this warning once
             log(WARNING, "No fit_metrics_aggregation_fn provided")
-
-        return parameters_aggregated, metrics_aggregated
+        return metrics_aggregated
 
     def aggregate_evaluate(
         self,
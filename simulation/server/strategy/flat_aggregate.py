@@ -0,0 +1,304 @@
+"""Aggregation of model updates in flat, contiguous buffers."""
+
+
+import timeit
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import INFO
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from common import NDArray, NDArrays
+from common.logger import log
+
+from .aggregate import Accumulator
+
+# Number of elements of the scratch block updates are scaled into before being added
+# to the running sum. Small enough for the block to stay in the CPU cache.
+_BLOCK_SIZE = 1 << 16
+
+# Minimum number of elements of a chunk aggregated by its own thread
+_MIN_CHUNK_SIZE = 1 << 18
+
+
+class LayerLayout:
+    """Shapes, dtypes and offsets of the layers of a model in a flat buffer.
+
+    Layer `i` occupies the elements `offsets[i]:offsets[i + 1]` of the buffer.
+
+    Parameters
+    ----------
+    shapes : list[tuple[int, ...]]
+        The shape of each layer.
+    dtypes : list[npt.DTypeLike]
+        The original dtype of each layer.
+    """
+
+    def __init__(
+        self, shapes: list[tuple[int, ...]], dtypes: list[npt.DTypeLike]
+    ) -> None:
+        self.shapes = [tuple(shape) for shape in shapes]
+        self.dtypes = [np.dtype(dtype) for dtype in dtypes]
+        self.offsets = [0]
+        for shape in self.shapes:
+            self.offsets.append(self.offsets[-1] + int(np.prod(shape, dtype=np.int64)))
+
+    @classmethod
+    def from_ndarrays(cls, ndarrays: NDArrays) -> "LayerLayout":
+        """Create the layout of a list of NumPy ndarrays."""
+        return cls([layer.shape for layer in ndarrays], [x.dtype for x in ndarrays])
+
+    @property
+    def size(self) -> int:
+        """Return the total number of elements of all layers."""
+        return self.offsets[-1]
+
+    def __len__(self) -> int:
+        """Return the number of layers."""
+        return len(self.shapes)
+
+    def matches(self, ndarrays: NDArrays) -> bool:
+        """Return True if the layers in `ndarrays` have the shapes of this layout."""
+        return len(ndarrays) == len(self.shapes) and all(
+            layer.shape == shape for layer, shape in zip(ndarrays, self.shapes)
+        )
+
+    def unflatten(self, buffer: NDArray) -> NDArrays:
+        """Split a flat buffer into layers.
+
+        Floating point layers are cast back to their original dtype, other layers
+        (e.g. integer counters) keep the dtype of the buffer, just like the result
+        of `aggregate`. Layers that need no cast are views into `buffer`.
+        """
+        layers: NDArrays = []
+        for i, (shape, dtype) in enumerate(zip(self.shapes, self.dtypes)):
+            layer = buffer[self.offsets[i] : self.offsets[i + 1]].reshape(shape)
+            if dtype.kind == "f":
+                layer = layer.astype(dtype, copy=False)
+            layers.append(layer)
+        return layers
+
+
+def _accumulator_dtype(ndarrays: NDArrays) -> np.dtype:  # type: ignore[type-arg]
+    """Use float32 if every layer fits into it without loss, float64 otherwise."""
+    if all(x.dtype.kind == "f" and x.dtype.itemsize <= 4 for x in ndarrays):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+class FlatBufferAccumulator(Accumulator):
+    """Weighted average of model updates computed in one contiguous buffer.
+
+    The running sum of all layers is one flat buffer described by a `LayerLayout`.
+    Each model update is scaled into a small, cache-resident scratch block and added
+    to the running sum one block at a time, so consecutive small layers share a
+    single `np.add` and no temporary is allocated per layer. The buffers are
+    allocated for the first update and reused in later rounds as long as the model
+    keeps its shape. The averaged layers are returned in their original dtype.
+
+    With `max_workers` greater than one, the flat buffer is split into contiguous
+    chunks that are aggregated in parallel by a thread pool (NumPy releases the GIL
+    in its ufuncs). Every element goes through the same operations in the same
+    order whatever the chunking, so results are bit-identical to the serial ones.
+
+    Float32 updates accumulated in float32 give results identical to `aggregate`.
+
+    Parameters
+    ----------
+    dtype : Optional[str] (default: None)
+        Dtype of the running sum, either `"float32"` or `"float64"`. If None, it is
+        float32 if all layers are float16 or float32, float64 otherwise.
+    max_workers : Optional[int] (default: None)
+        Maximum number of threads aggregating chunks of the model in parallel. If
+        None, aggregation runs in the calling thread.
+    """
+
+    def __init__(
+        self, dtype: Optional[str] = None, max_workers: Optional[int] = None
+    ) -> None:
+        if dtype is not None and np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(
+                f"The accumulator dtype must be float32 or float64, not `{dtype}`."
+            )
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.layout: Optional[LayerLayout] = None
+        self._sum: Optional[NDArray] = None
+        self._chunks: list[tuple[int, int]] = []
+        self._scratch: list[NDArray] = []
+        self.num_examples_total = 0
+        self.num_updates = 0
+        self._num_bytes = 0
+        self._elapsed = 0.0
+        self.max_workers: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.set_max_workers(max_workers)
+
+    @property
+    def throughput(self) -> float:
+        """Return the rate at which updates were aggregated this round, in GB/s."""
+        if self._elapsed == 0.0:
+            return 0.0
+        return self._num_bytes / self._elapsed / 1e9
+
+    def set_max_workers(self, max_workers: Optional[int]) -> None:
+        """Set the maximum number of threads aggregating chunks in parallel."""
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("`max_workers` must be a positive integer or None.")
+        self.close()
+        self.max_workers = max_workers
+        if max_workers is not None and max_workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="aggregate"
+            )
+
+    def close(self) -> None:
+        """Stop the threads aggregating chunks in parallel."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def add(self, weights: NDArrays, num_examples: int) -> None:
+        """Add a model update weighted by its number of examples."""
+        start_time = timeit.default_timer()
+        if self.num_updates == 0:
+            self._allocate(weights)
+        elif not self.layout.matches(weights):  # type: ignore[union-attr]
+            raise ValueError(
+                "The shapes of the layers differ from those of the first update "
+                "added to the accumulator."
+            )
+
+        self._run_chunks(
+            partial(
+                self._accumulate_chunk,
+                weights,
+                num_examples,
+                first=self.num_updates == 0,
+            )
+        )
+
+        self.num_examples_total += num_examples
+        self.num_updates += 1
+        self._num_bytes += sum(layer.nbytes for layer in weights)
+        self._elapsed += timeit.default_timer() - start_time
+
+    def result(self) -> NDArrays:
+        """Return the weighted average of all updates added so far."""
+        if self.num_updates == 0:
+            raise ValueError("No model updates were added to the accumulator.")
+        start_time = timeit.default_timer()
+        total: NDArray = self._sum  # type: ignore[assignment]
+        average = np.empty_like(total)
+
+        def _divide_chunk(chunk_index: int) -> None:
+            begin, end = self._chunks[chunk_index]
+            np.divide(total[begin:end], self.num_examples_total, out=average[begin:end])
+
+        self._run_chunks(_divide_chunk)
+        layers = self.layout.unflatten(average)  # type: ignore[union-attr]
+        self._elapsed += timeit.default_timer() - start_time
+
+        log(
+            INFO,
+            "FlatBufferAccumulator: aggregated %s updates (%.3f GB, %s, %s chunks) "
+            "at %.2f GB/s",
+            self.num_updates,
+            self._num_bytes / 1e9,
+            average.dtype,
+            len(self._chunks),
+            self.throughput,
+        )
+        return layers
+
+    def reset(self) -> None:
+        """Forget all updates added so far, but keep the buffers for reuse."""
+        self.num_examples_total = 0
+        self.num_updates = 0
+        self._num_bytes = 0
+        self._elapsed = 0.0
+
+    def _allocate(self, weights: NDArrays) -> None:
+        """Create the layout of the model and (re)allocate the buffers if needed."""
+        dtype = self.dtype if self.dtype is not None else _accumulator_dtype(weights)
+        self.layout = LayerLayout.from_ndarrays(weights)
+        size = self.layout.size
+        if self._sum is None or self._sum.size != size or self._sum.dtype != dtype:
+            self._sum = np.empty(size, dtype=dtype)
+            self._chunks = []
+
+        # Split the buffer into chunks large enough to be worth a thread each
+        num_chunks = max(1, min(self.max_workers or 1, size // _MIN_CHUNK_SIZE))
+        if len(self._chunks) == num_chunks:
+            return
+        bounds = [size * i // num_chunks for i in range(num_chunks + 1)]
+        self._chunks = list(zip(bounds[:-1], bounds[1:]))
+        self._scratch = [
+            np.empty(min(end - begin, _BLOCK_SIZE), dtype=dtype)
+            for begin, end in self._chunks
+        ]
+
+    def _run_chunks(self, fn: Callable[[int], None]) -> None:
+        """Call `fn` with the index of every chunk, in parallel if possible."""
+        if self._executor is None or len(self._chunks) == 1:
+            for chunk_index in range(len(self._chunks)):
+                fn(chunk_index)
+            return
+        # Consume the results to propagate exceptions
+        for _ in self._executor.map(fn, range(len(self._chunks))):
+            pass
+
+    def _accumulate_chunk(
+        self, weights: NDArrays, num_examples: int, chunk_index: int, *, first: bool
+    ) -> None:
+        """Add `weights * num_examples` to one chunk of the running sum.
+
+        The first update of a round is written into the running sum directly, later
+        updates are scaled into the scratch block of the chunk and added to the
+        running sum whenever the block is full.
+        """
+        total: NDArray = self._sum  # type: ignore[assignment]
+        offsets = self.layout.offsets  # type: ignore[union-attr]
+        begin, end = self._chunks[chunk_index]
+        scratch = self._scratch[chunk_index]
+        block_size = scratch.size
+        position = begin  # Offset of the current block in the running sum
+        filled = 0  # Number of elements of the current block written so far
+
+        for i in range(max(0, bisect_right(offsets, begin) - 1), len(weights)):
+            layer_begin, layer_end = max(begin, offsets[i]), min(end, offsets[i + 1])
+            if offsets[i] >= end:
+                break
+            if layer_begin >= layer_end:
+                continue
+            flat = weights[i].ravel()[layer_begin - offsets[i] : layer_end - offsets[i]]
+            if first:
+                np.multiply(
+                    flat,
+                    num_examples,
+                    out=total[layer_begin:layer_end],
+                    dtype=total.dtype,
+                )
+                continue
+
+            start = 0
+            while start < flat.size:
+                count = min(block_size - filled, flat.size - start)
+                np.multiply(
+                    flat[start : start + count],
+                    num_examples,
+                    out=scratch[filled : filled + count],
+                    dtype=total.dtype,
+                )
+                start += count
+                filled += count
+                if filled == block_size:
+                    block = total[position : position + block_size]
+                    np.add(block, scratch, out=block)
+                    position += block_size
+                    filled = 0
+        if filled > 0:
+            block = total[position : position + filled]
+            np.add(block, scratch[:filled], out=block)
@@ -0,0 +1,208 @@
+"""Federated Averaging with hierarchical aggregation across aggregator processes."""
+
+
+import concurrent.futures
+import multiprocessing
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from common import FitRes, NDArrays, Parameters, Scalar, ndarrays_to_parameters
+from common.parameter import bytes_to_ndarray
+from server.client_proxy import ClientProxy
+
+from .aggregate import aggregate_partials, weighted_sum
+from .fedavg import FedAvg
+
+# A group of client updates: the serialized tensors and number of examples of each
+UpdateGroup = list[tuple[list[bytes], int]]
+
+
+def _aggregate_group(group: UpdateGroup) -> tuple[NDArrays, int]:
+    """Reduce a group of serialized client updates to a partial weighted sum."""
+    return weighted_sum(
+        [
+            ([bytes_to_ndarray(tensor, copy=False) for tensor in tensors], num_examples)
+            for tensors, num_examples in group
+        ]
+    )
+
+
+class HierarchicalFedAvg(FedAvg):
+    """Federated Averaging with a tree of aggregators.
+
+    Client updates are split into groups of `group_size`. Each group is reduced to
+    a partial weighted sum (and its number of examples) by one of `num_aggregators`
+    local aggregator processes, and the strategy only combines the partial sums.
+    The weighted average is the one computed by `aggregate`, with the same weights
+    and the same division by the total number of examples; only the order in which
+    the weighted updates are added differs, so results match flat `FedAvg` up to
+    floating-point rounding.
+
+    With `streaming=True` (the default), a group is handed to an aggregator as soon
+    as it is complete, while the other clients are still training, and the
+    parameters of the `FitRes` are released. The strategy then holds at most one
+    incomplete group of updates plus the partial sums.
+
+    The aggregator processes are started with the first group and stopped when
+    the server calls `shutdown`, once training ends.
+
+    Parameters
+    ----------
+    num_aggregators : int (default: 2)
+        Number of aggregator processes.
+    group_size : int (default: 32)
+        Number of client updates reduced by an aggregator in one task.
+    start_method : Optional[str] (default: None)
+        The multiprocessing start method of the aggregator processes. If None,
+        `"forkserver"` is used where available and `"spawn"` otherwise, as forking
+        the multi-threaded server process is unsafe.
+    **kwargs : Any
+        Arguments of `FedAvg`.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_aggregators: int = 2,
+        group_size: int = 32,
+        start_method: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        kwargs.setdefault("streaming", True)
+        super().__init__(**kwargs)
+        if num_aggregators < 1:
+            raise ValueError("`num_aggregators` must be a positive integer.")
+        if group_size < 1:
+            raise ValueError("`group_size` must be a positive integer.")
+        self.num_aggregators = num_aggregators
+        self.group_size = group_size
+        if start_method is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+        self._ctx = multiprocessing.get_context(start_method)
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._group: UpdateGroup = []
+        self._partials: list[concurrent.futures.Future] = []  # type: ignore[type-arg]
+
+    def __repr__(self) -> str:
+        """Compute a string representation of the strategy."""
+        rep = (
+            f"HierarchicalFedAvg(accept_failures={self.accept_failures}, "
+            f"num_aggregators={self.num_aggregators})"
+        )
+        return rep
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Aggregate fit results in groups, in the aggregator processes."""
+        if not results:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+
+        self._reset_groups()
+        for _, fit_res in results:
+            self._add_to_group(fit_res)
+        return self._combine_partials(server_round, results)
+
+    def begin_aggregate_fit(self, server_round: int) -> bool:
+        """Start collecting groups of fit results if streaming is enabled."""
+        if not self.streaming:
+            return False
+        self._reset_groups()
+        return True
+
+    def accumulate_fit(
+        self, server_round: int, result: tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Add a fit result to the current group and release its parameters."""
+        _, fit_res = result
+        self._add_to_group(fit_res)
+        # The update is on its way to an aggregator, don't keep it in memory
+        fit_res.parameters = Parameters(
+            tensors=[], tensor_type=fit_res.parameters.tensor_type
+        )
+
+    def finalize_aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Combine the partial sums of the groups of fit results of this round."""
+        if not results:
+            self._reset_groups()
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            self._reset_groups()
+            return None, {}
+        return self._combine_partials(server_round, results)
+
+    def shutdown(self) -> None:
+        """Stop the aggregator processes, they are started again if needed."""
+        self._reset_groups()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        super().shutdown()
+
+    def _reset_groups(self) -> None:
+        """Forget the groups and partial sums of a previous round."""
+        for future in self._partials:
+            future.cancel()
+        self._group = []
+        self._partials = []
+
+    def _add_to_group(self, fit_res: FitRes) -> None:
+        """Add an update to the current group, submitting the group once full."""
+        # `bytes` materializes views (e.g. of received tensors) so they can be sent
+        tensors = [bytes(tensor) for tensor in fit_res.parameters.tensors]
+        self._group.append((tensors, fit_res.num_examples))
+        if len(self._group) >= self.group_size:
+            self._submit_group()
+
+    def _submit_group(self) -> None:
+        """Hand the current group to an aggregator process."""
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.num_aggregators, mp_context=self._ctx
+            )
+        self._partials.append(self._pool.submit(_aggregate_group, self._group))
+        self._group = []
+
+    def _combine_partials(
+        self, server_round: int, results: list[tuple[ClientProxy, FitRes]]
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Wait for the partial sums of all groups and compute the average."""
+        if self._group:
+            self._submit_group()
+
+        # Add up the partial sums in submission order, as they become available
+        layer_sums: Optional[NDArrays] = None
+        num_examples_total = 0
+        for future in self._partials:
+            partial_sums, num_examples = future.result()
+            if layer_sums is None:
+                layer_sums = partial_sums
+            else:
+                for layer_sum, partial_sum in zip(layer_sums, partial_sums):
+                    np.add(layer_sum, partial_sum, out=layer_sum)
+            num_examples_total += num_examples
+        self._partials = []
+
+        aggregated_ndarrays = aggregate_partials(
+            [(layer_sums, num_examples_total)]  # type: ignore[list-item]
+        )
+        parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
+        metrics_aggregated = self._aggregate_fit_metrics(server_round, results)
+        return parameters_aggregated, metrics_aggregated
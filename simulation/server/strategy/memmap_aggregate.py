@@ -0,0 +1,232 @@
+"""Out-of-core aggregation of model updates in memory-mapped files."""
+
+
+import mmap
+import tempfile
+import timeit
+from logging import INFO
+from typing import Optional
+
+import numpy as np
+
+from common import NDArray, NDArrays, Parameters, parameters_to_ndarrays
+from common.logger import log
+from server.spill import spill_parameters
+
+from .aggregate import Accumulator
+from .flat_aggregate import LayerLayout, _accumulator_dtype
+
+# Default memory budget of the accumulator, in bytes
+DEFAULT_MEMORY_BUDGET = 1 << 26
+
+
+class _MappedBuffer:
+    """A flat array backed by an anonymous (already unlinked) scratch file.
+
+    The elements touched since the last release are tracked, so that their pages
+    are written back and dropped from memory in one go, once they exceed a budget.
+    """
+
+    def __init__(
+        self, size: int, dtype: np.dtype, scratch_dir: Optional[str]  # type: ignore
+    ) -> None:
+        nbytes = max(1, size * dtype.itemsize)
+        with tempfile.TemporaryFile(dir=scratch_dir, prefix="flwr-aggregate-") as file:
+            file.truncate(nbytes)
+            # The mapping keeps the file alive after it is closed
+            self.mmap = mmap.mmap(file.fileno(), nbytes)
+        self.array: NDArray = np.frombuffer(self.mmap, dtype=dtype, count=size)
+        self._touched_begin = 0
+        self._touched_end = 0
+
+    def touch(self, begin: int, end: int, budget: int) -> None:
+        """Mark elements `begin:end` as resident in memory.
+
+        Once the touched elements span more than `budget` bytes, they are released.
+        """
+        if self._touched_begin == self._touched_end:
+            self._touched_begin, self._touched_end = begin, end
+        else:
+            self._touched_begin = min(self._touched_begin, begin)
+            self._touched_end = max(self._touched_end, end)
+        if (self._touched_end - self._touched_begin) * self.array.itemsize > budget:
+            self.release()
+
+    def release(self) -> None:
+        """Write the touched elements to the file and drop their pages from memory."""
+        begin, end = self._touched_begin, self._touched_end
+        self._touched_begin = self._touched_end = 0
+        itemsize = self.array.itemsize
+        start = begin * itemsize // mmap.PAGESIZE * mmap.PAGESIZE
+        length = min(end * itemsize, len(self.mmap)) - start
+        if length <= 0:
+            return
+        self.mmap.flush(start, length)
+        if hasattr(mmap, "MADV_DONTNEED"):
+            self.mmap.madvise(mmap.MADV_DONTNEED, start, length)
+
+
+class MemmapAccumulator(Accumulator):
+    """Weighted average of model updates computed in memory-mapped scratch files.
+
+    The running sum of all layers is a flat array in a file under `scratch_dir`,
+    mapped into memory. Updates are streamed into it one tensor at a time, in
+    blocks of at most half of `memory_budget`: each block is scaled into a small
+    scratch buffer and added to the running sum. Once the touched part of the
+    running sum exceeds the other half of the budget, its dirty pages are written
+    back and dropped from memory (a single `msync` for many small tensors), so the
+    resident memory of the accumulator stays within the budget whatever the size
+    of the model and the number of clients.
+
+    Serialized updates passed to `add_parameters` are first moved to a scratch
+    file under `scratch_dir` (unless already spilled to disk), so the server does
+    not hold them in memory while they are added: the mapped tensors are read one
+    block at a time and their clean pages can be dropped by the operating system
+    at no cost. Updates passed to `add` may be memory-mapped arrays too.
+
+    The average is written to a new memory-mapped file; the returned layers are
+    views into it if they need no cast to their original dtype.
+
+    Float32 updates accumulated in float32 give results identical to `aggregate`.
+
+    Parameters
+    ----------
+    scratch_dir : Optional[str] (default: None)
+        Directory of the scratch files. If None, the default temporary directory
+        is used. The files are deleted as soon as they are created, their space is
+        released when the accumulator (or the returned layers) are garbage
+        collected.
+    memory_budget : int (default: 64 MiB)
+        Number of bytes of the running sum and scratch buffer that may be resident
+        in memory at once (half for each).
+    dtype : Optional[str] (default: None)
+        Dtype of the running sum, either `"float32"` or `"float64"`. If None, it is
+        float32 if all layers are float16 or float32, float64 otherwise.
+    """
+
+    def __init__(
+        self,
+        scratch_dir: Optional[str] = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        dtype: Optional[str] = None,
+    ) -> None:
+        if memory_budget < mmap.PAGESIZE:
+            raise ValueError(
+                f"`memory_budget` must be at least one page ({mmap.PAGESIZE} bytes)."
+            )
+        if dtype is not None and np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(
+                f"The accumulator dtype must be float32 or float64, not `{dtype}`."
+            )
+        self.scratch_dir = scratch_dir
+        self.memory_budget = memory_budget
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.layout: Optional[LayerLayout] = None
+        self._sum: Optional[_MappedBuffer] = None
+        self._scratch: Optional[NDArray] = None
+        self.num_examples_total = 0
+        self.num_updates = 0
+        self._num_bytes = 0
+        self._elapsed = 0.0
+
+    def add_parameters(self, parameters: Parameters, num_examples: int) -> None:
+        """Move a serialized model update to a scratch file, then add it.
+
+        The tensors of `parameters` are replaced, in place, by views of the file.
+        """
+        spill_parameters(parameters, self.scratch_dir)
+        self.add(parameters_to_ndarrays(parameters, copy=False), num_examples)
+
+    def add(self, weights: NDArrays, num_examples: int) -> None:
+        """Stream a model update weighted by its number of examples into the sum."""
+        start_time = timeit.default_timer()
+        first = self.num_updates == 0
+        if first:
+            self._allocate(weights)
+        elif not self.layout.matches(weights):  # type: ignore[union-attr]
+            raise ValueError(
+                "The shapes of the layers differ from those of the first update "
+                "added to the accumulator."
+            )
+
+        mapped: _MappedBuffer = self._sum  # type: ignore[assignment]
+        total = mapped.array
+        scratch: NDArray = self._scratch  # type: ignore[assignment]
+        block_size = scratch.size
+        budget = block_size * total.itemsize
+        for layer, offset in zip(weights, self.layout.offsets):  # type: ignore
+            flat = layer.reshape(-1)
+            for start in range(0, flat.size, block_size):
+                block = flat[start : start + block_size]
+                begin, end = offset + start, offset + start + block.size
+                out = total[begin:end]
+                if first:
+                    np.multiply(block, num_examples, out=out, dtype=total.dtype)
+                else:
+                    buf = scratch[: block.size]
+                    np.multiply(block, num_examples, out=buf, dtype=total.dtype)
+                    np.add(out, buf, out=out)
+                mapped.touch(begin, end, budget)
+
+        self.num_examples_total += num_examples
+        self.num_updates += 1
+        self._num_bytes += sum(layer.nbytes for layer in weights)
+        self._elapsed += timeit.default_timer() - start_time
+
+    def result(self) -> NDArrays:
+        """Return the weighted average of all updates added so far."""
+        if self.num_updates == 0:
+            raise ValueError("No model updates were added to the accumulator.")
+        start_time = timeit.default_timer()
+        total = self._sum.array  # type: ignore[union-attr]
+        average = _MappedBuffer(total.size, total.dtype, self.scratch_dir)
+        block_size = self._scratch.size  # type: ignore[union-attr]
+        budget = block_size * total.itemsize
+        for begin in range(0, total.size, block_size):
+            end = min(begin + block_size, total.size)
+            np.divide(
+                total[begin:end], self.num_examples_total, out=average.array[begin:end]
+            )
+            average.touch(begin, end, budget)
+            self._sum.touch(begin, end, budget)  # type: ignore[union-attr]
+        layers = self.layout.unflatten(average.array)  # type: ignore[union-attr]
+        self._elapsed += timeit.default_timer() - start_time
+
+        log(
+            INFO,
+            "MemmapAccumulator: aggregated %s updates (%.3f GB, %s) in %.2fs "
+            "with a memory budget of %.1f MB",
+            self.num_updates,
+            self._num_bytes / 1e9,
+            total.dtype,
+            self._elapsed,
+            self.memory_budget / 1e6,
+        )
+        return layers
+
+    def reset(self) -> None:
+        """Forget all updates added so far, but keep the scratch file for reuse."""
+        self.num_examples_total = 0
+        self.num_updates = 0
+        self._num_bytes = 0
+        self._elapsed = 0.0
+
+    def _allocate(self, weights: NDArrays) -> None:
+        """Create the layout of the model and (re)create the scratch file if needed."""
+        dtype = self.dtype if self.dtype is not None else _accumulator_dtype(weights)
+        self.layout = LayerLayout.from_ndarrays(weights)
+        size = self.layout.size
+        if (
+            self._sum is None
+            or self._sum.array.size != size
+            or self._sum.array.dtype != dtype
+        ):
+            self._sum = _MappedBuffer(size, dtype, self.scratch_dir)
+        # Half of the budget for the scratch block, half for the running sum
+        block_size = min(max(1, size), self.memory_budget // (2 * dtype.itemsize))
+        if (
+            self._scratch is None
+            or self._scratch.dtype != dtype
+            or self._scratch.size != block_size
+        ):
+            self._scratch = np.empty(block_size, dtype=dtype)
@@ -0,0 +1,360 @@
+"""Federated Averaging with the aggregation sharded across processes by layer."""
+
+
+import multiprocessing
+import traceback
+from logging import DEBUG, ERROR
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Any, Optional, Union
+
+from common import FitRes, Parameters, Scalar
+from common.logger import log
+from common.parameter import bytes_to_ndarray, ndarray_to_bytes
+from server.client_proxy import ClientProxy
+
+from .aggregate import WeightedAccumulator
+from .fedavg import FedAvg
+
+# Seconds to wait for a shard process to exit before killing it
+_TERMINATE_TIMEOUT = 5.0
+
+# Errors raised when talking to a shard process that died
+_SHARD_ERRORS = (EOFError, OSError)
+
+
+class ShardPlan:
+    """Assignment of the tensors of a model to shards.
+
+    Tensors are assigned greedily, largest first, to the shard holding the fewest
+    bytes so far, so that shards hold about the same number of bytes.
+
+    Parameters
+    ----------
+    tensor_shards : list[int]
+        The shard owning each tensor of the model.
+    num_shards : int
+        The number of shards.
+    """
+
+    def __init__(self, tensor_shards: list[int], num_shards: int) -> None:
+        self.tensor_shards = tensor_shards
+        self.num_shards = num_shards
+        self.shard_tensors: list[list[int]] = [[] for _ in range(num_shards)]
+        for index, shard in enumerate(tensor_shards):
+            self.shard_tensors[shard].append(index)
+
+    @classmethod
+    def balanced(cls, tensor_sizes: list[int], num_shards: int) -> "ShardPlan":
+        """Create a plan balancing the number of bytes held by each shard."""
+        shard_bytes = [0] * num_shards
+        tensor_shards = [0] * len(tensor_sizes)
+        for index in sorted(
+            range(len(tensor_sizes)), key=lambda i: tensor_sizes[i], reverse=True
+        ):
+            shard = shard_bytes.index(min(shard_bytes))
+            tensor_shards[index] = shard
+            shard_bytes[shard] += tensor_sizes[index]
+        return cls(tensor_shards, num_shards)
+
+    def matches(self, tensors: list[bytes]) -> bool:
+        """Return True if `tensors` has the number of tensors of this plan."""
+        return len(tensors) == len(self.tensor_shards)
+
+    def split(self, tensors: list[bytes]) -> list[list[bytes]]:
+        """Split the tensors of a model into the slices owned by each shard."""
+        # `bytes` materializes views (e.g. of spilled tensors) so they can be sent
+        return [[bytes(tensors[i]) for i in indices] for indices in self.shard_tensors]
+
+    def merge(self, slices: list[list[bytes]]) -> list[bytes]:
+        """Reassemble the tensors of a model from the slices of all shards."""
+        tensors: list[bytes] = [b""] * len(self.tensor_shards)
+        for indices, tensor_slice in zip(self.shard_tensors, slices):
+            for index, tensor in zip(indices, tensor_slice):
+                tensors[index] = tensor
+        return tensors
+
+
+def _shard_loop(conn: Connection, tensor_type: str) -> None:
+    """Add up the slices of the updates sent to this shard until told to stop.
+
+    Only `commit` is answered; an error raised by an earlier command of the round
+    is reported in its reply.
+    """
+    accumulator = WeightedAccumulator()
+    error: Optional[str] = None
+    while True:
+        try:
+            command = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if command is None:
+            break
+
+        name, payload = command
+        if name == "reset":
+            accumulator.reset()
+            error = None
+            continue
+        try:
+            if name == "add" and error is None:
+                tensors, num_examples = payload
+                accumulator.add(
+                    [bytes_to_ndarray(tensor, copy=False) for tensor in tensors],
+                    num_examples,
+                )
+            elif name == "commit":
+                if error is not None:
+                    conn.send(("error", error))
+                else:
+                    layers = accumulator.result()
+                    conn.send(
+                        ("ok", [ndarray_to_bytes(x, tensor_type) for x in layers])
+                    )
+                accumulator.reset()
+                error = None
+        except Exception:  # pylint: disable=broad-exception-caught
+            error = traceback.format_exc()
+            if name == "commit":
+                conn.send(("error", error))
+                accumulator.reset()
+                error = None
+    conn.close()
+
+
+class _ShardActor:
+    """A long-lived process aggregating the slice of the model owned by a shard."""
+
+    def __init__(self, ctx: BaseContext, tensor_type: str) -> None:
+        self.conn, child_conn = ctx.Pipe()  # type: ignore[attr-defined]
+        self.process: BaseProcess = ctx.Process(  # type: ignore[attr-defined]
+            target=_shard_loop, args=(child_conn, tensor_type), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def send(self, name: str, payload: Any = None) -> None:
+        """Send a command to the shard process without waiting for it."""
+        self.conn.send((name, payload))
+
+    def receive_commit(self) -> tuple[str, Any]:
+        """Wait for the reply to a `commit` command: a status and the slice."""
+        return self.conn.recv()  # type: ignore[no-any-return]
+
+    def terminate(self) -> None:
+        """Ask the shard process to exit and kill it if it does not."""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=_TERMINATE_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ShardedFedAvg(FedAvg):
+    """Federated Averaging with the aggregation sharded across processes.
+
+    The tensors of the model are split between `num_shards` local shard processes
+    according to a `ShardPlan`, created from the first update received. Each shard
+    owns its slice of the model and keeps the running weighted sum of that slice
+    only. As results arrive, the serialized tensors of each update are routed to
+    the shards owning them and released, so the server process never holds the
+    updates or the running sums. At the end of the round, the server commits the
+    shards: each returns the average of its slice and the strategy reassembles the
+    new global model from the slices.
+
+    Every tensor goes through the same operations as with `FedAvg(streaming=True)`,
+    so results are identical.
+
+    If a shard process dies, the updates of the round are lost: the round fails
+    (no new global model is returned) and the shards are started again for the
+    next round. The server stops the shard processes once training ends, see
+    `shutdown`.
+
+    Parameters
+    ----------
+    num_shards : int (default: 2)
+        Number of shard processes.
+    start_method : Optional[str] (default: None)
+        The multiprocessing start method of the shard processes. If None,
+        `"forkserver"` is used where available and `"spawn"` otherwise, as forking
+        the multi-threaded server process is unsafe.
+    **kwargs : Any
+        Arguments of `FedAvg`. Streaming is always enabled.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_shards: int = 2,
+        start_method: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        kwargs["streaming"] = True
+        super().__init__(**kwargs)
+        if num_shards < 1:
+            raise ValueError("`num_shards` must be a positive integer.")
+        self.num_shards = num_shards
+        if start_method is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+        self._ctx = multiprocessing.get_context(start_method)
+        self.plan: Optional[ShardPlan] = None
+        self._shards: list[_ShardActor] = []
+        self._tensor_type: Optional[str] = None
+        self._num_updates = 0
+        self._failed = False
+
+    def __repr__(self) -> str:
+        """Compute a string representation of the strategy."""
+        rep = (
+            f"ShardedFedAvg(accept_failures={self.accept_failures}, "
+            f"num_shards={self.num_shards})"
+        )
+        return rep
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Aggregate fit results by routing them to the shards and committing."""
+        if not results:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+        self.begin_aggregate_fit(server_round)
+        for result in results:
+            self.accumulate_fit(server_round, result)
+        return self.finalize_aggregate_fit(server_round, results, failures)
+
+    def begin_aggregate_fit(self, server_round: int) -> bool:
+        """Discard what the shards accumulated in an earlier, unfinished round."""
+        if self._num_updates > 0:
+            try:
+                for shard in self._shards:
+                    shard.send("reset")
+            except _SHARD_ERRORS:
+                # Start the shards again with the first update of this round
+                self.shutdown()
+        self._num_updates = 0
+        self._failed = False
+        return True
+
+    def accumulate_fit(
+        self, server_round: int, result: tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Route the slices of a fit result to their shards and release it."""
+        _, fit_res = result
+        if not self._failed:
+            self._route(server_round, fit_res)
+        # The update is now owned by the shards, don't keep it in memory
+        fit_res.parameters = Parameters(
+            tensors=[], tensor_type=fit_res.parameters.tensor_type
+        )
+
+    def finalize_aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Commit the shards and reassemble the new global model."""
+        if self._failed or not results or self._num_updates == 0:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            self.begin_aggregate_fit(server_round)
+            return None, {}
+
+        # All shards compute the average of their slice concurrently
+        try:
+            for shard in self._shards:
+                shard.send("commit")
+            replies = [shard.receive_commit() for shard in self._shards]
+        except _SHARD_ERRORS as ex:
+            self._fail_round(server_round, ex)
+            return None, {}
+        self._num_updates = 0
+        for status, payload in replies:
+            if status != "ok":
+                raise RuntimeError(f"Shard failed to aggregate the updates:\n{payload}")
+        slices = [payload for _, payload in replies]
+
+        parameters_aggregated = Parameters(
+            tensors=self.plan.merge(slices),  # type: ignore[union-attr]
+            tensor_type=self._tensor_type,  # type: ignore[arg-type]
+        )
+        metrics_aggregated = self._aggregate_fit_metrics(server_round, results)
+        return parameters_aggregated, metrics_aggregated
+
+    def shutdown(self) -> None:
+        """Stop the shard processes, they are started again if needed."""
+        for shard in self._shards:
+            shard.terminate()
+        self._shards = []
+        self.plan = None
+        self._num_updates = 0
+        super().shutdown()
+
+    def _route(self, server_round: int, fit_res: FitRes) -> None:
+        """Send the slices of an update to their shards."""
+        tensors = fit_res.parameters.tensors
+        if self.plan is None or (
+            self._num_updates == 0 and not self.plan.matches(tensors)
+        ):
+            self._start_shards(fit_res.parameters)
+        elif not self.plan.matches(tensors):
+            raise ValueError(
+                "The number of tensors differs from that of the first update "
+                "received this round."
+            )
+        try:
+            for shard, tensor_slice in zip(
+                self._shards, self.plan.split(tensors)  # type: ignore[union-attr]
+            ):
+                shard.send("add", (tensor_slice, fit_res.num_examples))
+        except _SHARD_ERRORS as ex:
+            self._fail_round(server_round, ex)
+            return
+        self._num_updates += 1
+
+    def _fail_round(self, server_round: int, error: BaseException) -> None:
+        """Give up the round after a shard process died and stop the others."""
+        log(
+            ERROR,
+            "ShardedFedAvg: a shard process died in round %s (%r), the updates of "
+            "this round are discarded",
+            server_round,
+            error,
+        )
+        self.shutdown()
+        self._failed = True
+
+    def _start_shards(self, parameters: Parameters) -> None:
+        """Plan the shards for the model of `parameters` and start their processes."""
+        self.shutdown()
+        self._tensor_type = parameters.tensor_type
+        self.plan = ShardPlan.balanced(
+            [len(tensor) for tensor in parameters.tensors],
+            min(self.num_shards, max(1, len(parameters.tensors))),
+        )
+        self._shards = [
+            _ShardActor(self._ctx, parameters.tensor_type)
+            for _ in range(self.plan.num_shards)
+        ]
+        log(
+            DEBUG,
+            "ShardedFedAvg: started %s shards for %s tensors",
+            len(self._shards),
+            len(parameters.tensors),
+        )
@@ -7,6 +7,7 @@ from typing import Optional, Union
 from common import EvaluateIns, EvaluateRes, FitIns, FitRes, Parameters, Scalar
 from server.client_manager import ClientManager
 from server.client_proxy import ClientProxy
+from server.server_config import RoundPolicy
 
 
 class Strategy(ABC):
@@ -91,6 +92,97 @@ class Strategy(ABC):
             the global model parameters remain the same.
         """
 
+    def set_aggregation_max_workers(self, max_workers: Optional[int]) -> None:
+        """Set the maximum number of threads used to aggregate results.
+
+        Strategies that cannot aggregate in parallel ignore this setting.
+
+        Parameters
+        ----------
+        max_workers : Optional[int]
+            The maximum number of threads. None lets the strategy aggregate in a
+            single thread.
+        """
+        _ = max_workers
+
+    def fit_round_policy(self, server_round: int) -> Optional[RoundPolicy]:
+        """Return when the server should close the current round of training.
+
+        Called after `configure_fit`, so strategies can, for example, sample more
+        clients than they need and close the round once enough results arrived.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+
+        Returns
+        -------
+        policy : Optional[RoundPolicy]
+            The policy for this round. None (the default) waits for all clients.
+        """
+        _ = server_round
+        return None
+
+    def begin_aggregate_fit(self, server_round: int) -> bool:
+        """Prepare the streaming aggregation of this round's training results.
+
+        Strategies that support it can aggregate training results one at a time, as
+        they arrive, instead of receiving all of them at once in `aggregate_fit`.
+        The server then passes each successful result to `accumulate_fit` and calls
+        `finalize_aggregate_fit` once the round is over.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+
+        Returns
+        -------
+        streaming : bool
+            True if results of this round should be streamed to `accumulate_fit`,
+            False (the default) if they should be passed to `aggregate_fit`.
+        """
+        _ = server_round
+        return False
+
+    def accumulate_fit(
+        self, server_round: int, result: tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Fold a single successful training result into the running aggregate.
+
+        Only called if `begin_aggregate_fit` returned True for this round.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the selected clients.
+        """
+
+    def finalize_aggregate_fit(
+        self,
+        server_round: int,
+        results: list[tuple[ClientProxy, FitRes]],
+        failures: list[Union[tuple[ClientProxy, FitRes], BaseException]],
+    ) -> tuple[Optional[Parameters], dict[str, Scalar]]:
+        """Return the aggregate of the results accumulated during this round.
+
+        Only called if `begin_aggregate_fit` returned True for this round. The
+        arguments and return value have the same meaning as in `aggregate_fit`,
+        except that the parameters of the results in `results` might have already
+        been released by `accumulate_fit`.
+        """
+        return self.aggregate_fit(server_round, results, failures)
+
+    def shutdown(self) -> None:
+        """Release the resources of the strategy, e.g. its worker processes.
+
+        Called by the server once training ends, whether it succeeded or not. A
+        strategy used again afterwards must acquire its resources again.
+        """
+
     @abstractmethod
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
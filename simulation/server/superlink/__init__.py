@@ -0,0 +1,10 @@
+"""Local SuperLink stand-in."""
+
+
+from .in_memory_linkstate import InMemoryLinkState as InMemoryLinkState
+from .message_store import MessageStore as MessageStore
+
+__all__ = [
+    "InMemoryLinkState",
+    "MessageStore",
+]
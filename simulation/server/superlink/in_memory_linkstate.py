@@ -0,0 +1,360 @@
+"""In-memory LinkState implementation."""
+
+
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Container, Iterable
+from datetime import datetime, timezone
+from logging import ERROR
+from typing import TYPE_CHECKING, Optional
+from uuid import uuid4
+
+from common import Message
+from common.constant import ErrorCode
+from common.logger import log
+from common.message import Error
+from common.typing import NodeChanges, Run, UserConfig
+from .message_store import MessageStore
+
+if TYPE_CHECKING:
+    from server.driver import PullInterrupt
+
+
+class InMemoryLinkState:  # pylint: disable=too-many-instance-attributes
+    """In-memory state shared by a Driver and the nodes it sends messages to.
+
+    The state keeps track of runs and registered nodes, stores the messages pushed
+    by the Driver until a node picks them up and holds the replies until the Driver
+    pulls them. All methods are thread-safe.
+
+    Messages and replies are held in a `MessageStore`, which delivers messages in
+    the order in which they were pushed (to any node, or to a given one) and evicts
+    them once their TTL has passed, so that messages never pulled do not
+    accumulate. The cost of pushing, fetching and pulling a message is constant,
+    no matter how many nodes are registered or messages are stored.
+
+    Every node registration and removal increments the version of the node registry
+    and is appended to a log of changes, so that the Driver can wait for the nodes
+    that joined or left since the version it last saw, see `get_node_changes`. The
+    changes older than every version returned to a caller that did not pass it back
+    yet are dropped, so the log does not grow with the number of changes.
+    """
+
+    def __init__(self) -> None:
+        self.run_ids: dict[int, Run] = {}
+        self.node_ids: set[int] = set()
+
+        # Node registrations (True) and removals (False), the version of the node
+        # registry after the i-th change is `_node_log_base` + i + 1
+        self._node_log: list[tuple[int, bool]] = []
+        self._node_log_base = 0
+        # Versions returned by `get_node_changes` and not passed back to it yet,
+        # with their number of callers; changes older than all of them are dropped
+        self._node_versions_in_use: Counter[int] = Counter()
+
+        # Pushed messages and their replies, evicted once their TTL has passed
+        self._messages = MessageStore()
+
+        # All conditions share one lock: `_cv` is notified of new messages,
+        # `_nodes_cv` of node changes and the waiter registered for a message of
+        # its reply
+        self._lock = threading.RLock()
+        self._cv = threading.Condition(self._lock)
+        self._nodes_cv = threading.Condition(self._lock)
+        self._res_waiters: dict[str, _ReplyWaiter] = {}
+
+    def create_run(self, run_config: Optional[UserConfig] = None) -> int:
+        """Create a new run and return its ID."""
+        with self._cv:
+            run_id = _generate_id(self.run_ids)
+            run = Run.create_empty(run_id)
+            run.override_config = dict(run_config or {})
+            self.run_ids[run_id] = run
+        return run_id
+
+    def get_run(self, run_id: int) -> Optional[Run]:
+        """Return the run with the given ID, or None if it does not exist."""
+        with self._cv:
+            return self.run_ids.get(run_id)
+
+    def create_node(self) -> int:
+        """Register a new node and return its ID."""
+        with self._cv:
+            node_id = _generate_id(self.node_ids)
+            self.node_ids.add(node_id)
+            self._node_log.append((node_id, True))
+            self._nodes_cv.notify_all()
+        return node_id
+
+    def delete_node(self, node_id: int) -> None:
+        """Unregister a node."""
+        with self._cv:
+            if node_id not in self.node_ids:
+                raise ValueError(f"Node {node_id} not found")
+            self.node_ids.remove(node_id)
+            self._node_log.append((node_id, False))
+            self._nodes_cv.notify_all()
+
+    def get_nodes(self, run_id: int) -> set[int]:
+        """Return the IDs of all nodes available in the given run."""
+        with self._cv:
+            if run_id not in self.run_ids:
+                return set()
+            return set(self.node_ids)
+
+    def get_node_changes(
+        self, run_id: int, since_version: int, timeout: Optional[float] = None
+    ) -> NodeChanges:
+        """Return the nodes that joined or left the run since `since_version`.
+
+        Waits up to `timeout` seconds (indefinitely if None) for a change if there
+        was none since `since_version`. Pass the returned `version` to the next call
+        to only get the changes that happened in between. Changes that cancel out
+        (e.g. a node that joined and left) are not reported.
+
+        Passing the returned `version` to the next call releases `since_version`:
+        only the changes since the versions returned and not passed back yet are
+        kept. A `since_version` whose changes were dropped is treated as 0: all
+        registered nodes are reported as joined.
+        """
+        with self._cv:
+            if run_id not in self.run_ids:
+                return NodeChanges(version=since_version, joined=[], left=[])
+            self._nodes_cv.wait_for(
+                lambda: self._node_version() > since_version, timeout=timeout
+            )
+            version = self._node_version()
+            self._move_node_version(since_version, version)
+            if since_version < self._node_log_base:
+                joined_nodes = sorted(self.node_ids)
+                self._trim_node_log()
+                return NodeChanges(version=version, joined=joined_nodes, left=[])
+            changes = self._node_log[since_version - self._node_log_base :]
+            self._trim_node_log()
+        joined: dict[int, None] = {}
+        left: dict[int, None] = {}
+        for node_id, is_joined in changes:
+            added, removed = (joined, left) if is_joined else (left, joined)
+            if node_id in removed:
+                del removed[node_id]
+            else:
+                added[node_id] = None
+        return NodeChanges(version=version, joined=list(joined), left=list(left))
+
+    def _node_version(self) -> int:
+        """Return the version of the node registry (must hold the lock)."""
+        return self._node_log_base + len(self._node_log)
+
+    def _move_node_version(self, since_version: int, version: int) -> None:
+        """Record that a caller moved on from `since_version` to `version`."""
+        in_use = self._node_versions_in_use
+        if in_use[since_version] > 0:
+            in_use[since_version] -= 1
+            if in_use[since_version] == 0:
+                del in_use[since_version]
+        in_use[version] += 1
+
+    def _trim_node_log(self) -> None:
+        """Drop the node changes no caller needs anymore (must hold the lock).
+
+        The log is only trimmed once at least half of it is not needed, so the cost
+        of trimming is constant per change.
+        """
+        oldest = min(self._node_versions_in_use, default=self._node_version())
+        num_trimmed = oldest - self._node_log_base
+        if num_trimmed > 0 and 2 * num_trimmed >= len(self._node_log):
+            del self._node_log[:num_trimmed]
+            self._node_log_base = oldest
+
+    def store_message_ins(self, message: Message) -> Optional[str]:
+        """Store a message sent by the Driver and return its assigned ID.
+
+        Returns None if the message cannot be stored (e.g. because its run or its
+        destination node are unknown).
+        """
+        metadata = message.metadata
+        with self._cv:
+            if metadata.run_id not in self.run_ids:
+                log(ERROR, "`run_id` is invalid")
+                return None
+            if metadata.dst_node_id not in self.node_ids:
+                log(ERROR, "`dst_node_id` is invalid")
+                return None
+
+            self._messages.evict_expired()
+            message_id = str(uuid4())
+            metadata.message_id = message_id
+            self._messages.add_message_ins(message)
+            self._cv.notify_all()
+        return message_id
+
+    def get_message_ins(
+        self, timeout: Optional[float] = None, node_id: Optional[int] = None
+    ) -> Optional[Message]:
+        """Return the next undelivered message, waiting up to `timeout` seconds.
+
+        If `node_id` is given, only a message sent to that node is returned. The
+        message is marked as delivered and will not be returned again. Messages
+        whose TTL has passed are not delivered.
+        """
+        with self._cv:
+            self._messages.evict_expired()
+            if not self._messages.num_undelivered(node_id) and not self._cv.wait_for(
+                lambda: self._messages.num_undelivered(node_id) > 0, timeout=timeout
+            ):
+                return None
+            message = self._messages.next_message_ins(node_id)
+        if message is None:
+            return None
+        message.metadata.delivered_at = datetime.now(tz=timezone.utc).isoformat()
+        return message
+
+    def store_message_res(self, message: Message) -> Optional[str]:
+        """Store a reply sent by a node and return its assigned ID.
+
+        Returns None if the message it replies to is unknown (e.g. expired).
+        """
+        metadata = message.metadata
+        with self._cv:
+            self._messages.evict_expired()
+            if not self._messages.has_message_ins(metadata.reply_to_message):
+                log(
+                    ERROR,
+                    "Message to reply to not found: %s",
+                    metadata.reply_to_message,
+                )
+                return None
+
+            return self._add_message_res(message)
+
+    def cancel_message_ins(self, message_ids: Iterable[str]) -> list[str]:
+        """Withdraw the given messages if they were not delivered yet.
+
+        A withdrawn message is never delivered. An error reply is stored in place of
+        its reply, so that the caller waiting for it does not wait any longer.
+        Returns the IDs of the withdrawn messages.
+        """
+        cancelled: list[str] = []
+        with self._cv:
+            self._messages.evict_expired()
+            for message_id in message_ids:
+                message = self._messages.withdraw_message_ins(message_id)
+                if message is None:
+                    continue
+                reply = message.create_error_reply(
+                    Error(
+                        code=ErrorCode.MESSAGE_UNAVAILABLE,
+                        reason="The message was cancelled before it was delivered",
+                    )
+                )
+                self._add_message_res(reply)
+                cancelled.append(message_id)
+        return cancelled
+
+    def _add_message_res(self, message: Message) -> str:
+        """Store a valid reply and wake up its waiter (must hold the lock)."""
+        metadata = message.metadata
+        message_id = str(uuid4())
+        metadata.message_id = message_id
+        self._messages.add_message_res(message)
+        waiter = self._res_waiters.get(metadata.reply_to_message)
+        if waiter is not None:
+            waiter.ready.append(metadata.reply_to_message)
+            waiter.cv.notify()
+        return message_id
+
+    def get_message_res(self, message_ids: Iterable[str]) -> list[Message]:
+        """Return and remove the replies to the given message IDs.
+
+        Messages for which no reply is available yet are skipped. Once a reply is
+        returned, both the reply and the message it replies to are deleted.
+        """
+        with self._cv:
+            return self._pop_message_res(message_ids)
+
+    def wait_for_message_res(
+        self,
+        message_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        interrupt: Optional["PullInterrupt"] = None,
+    ) -> list[Message]:
+        """Return and remove the replies to the given message IDs once available.
+
+        Like `get_message_res`, but if no reply is available yet, waits up to
+        `timeout` seconds (indefinitely if None) for one. The caller is woken up as
+        soon as a reply to one of the messages is stored, and gets all the replies
+        stored by the time it runs again. Interrupting `interrupt` ends the wait
+        early. Only one caller should wait for the reply to a given message at a
+        time.
+        """
+        message_ids = list(message_ids)
+        with self._cv:
+            replies = self._pop_message_res(message_ids)
+            if replies or timeout == 0:
+                return replies
+            waiter = _ReplyWaiter(threading.Condition(self._lock))
+            for message_id in message_ids:
+                self._res_waiters[message_id] = waiter
+            if interrupt is not None:
+                interrupt.add_callback(lambda: self._interrupt_waiter(waiter))
+            try:
+                end_time = None if timeout is None else time.time() + timeout
+                while not waiter.ready and not waiter.interrupted:
+                    remaining = (
+                        None if end_time is None else max(0.0, end_time - time.time())
+                    )
+                    if not waiter.cv.wait(remaining):
+                        break
+            finally:
+                for message_id in message_ids:
+                    if self._res_waiters.get(message_id) is waiter:
+                        del self._res_waiters[message_id]
+            return self._pop_message_res(waiter.ready)
+
+    def _interrupt_waiter(self, waiter: "_ReplyWaiter") -> None:
+        """Wake up a caller of `wait_for_message_res` before its replies arrive."""
+        with self._cv:
+            waiter.interrupted = True
+            waiter.cv.notify()
+
+    def _pop_message_res(self, message_ids: Iterable[str]) -> list[Message]:
+        """Pop the available replies (must be called holding the lock)."""
+        replies: list[Message] = []
+        now = time.time()
+        self._messages.evict_expired(now)
+        for message_id in message_ids:
+            reply = self._messages.pop_message_res(message_id, now)
+            if reply is not None:
+                replies.append(reply)
+        return replies
+
+    def num_message_ins(self) -> int:
+        """Return the number of stored messages (including delivered ones)."""
+        with self._cv:
+            return self._messages.num_message_ins()
+
+    def num_message_res(self) -> int:
+        """Return the number of stored replies."""
+        with self._cv:
+            return self._messages.num_message_res()
+
+
+class _ReplyWaiter:  # pylint: disable=too-few-public-methods
+    """A caller of `wait_for_message_res` and the replies stored for it."""
+
+    __slots__ = ("cv", "ready", "interrupted")
+
+    def __init__(self, cv: threading.Condition) -> None:
+        self.cv = cv
+        self.ready: list[str] = []
+        self.interrupted = False
+
+
+def _generate_id(existing: Container[int]) -> int:
+    """Return a random positive 63-bit integer not contained in `existing`."""
+    while True:
+        new_id = random.getrandbits(63)
+        if new_id != 0 and new_id not in existing:
+            return new_id
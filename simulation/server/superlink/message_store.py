@@ -0,0 +1,166 @@
+"""Store of the messages exchanged through the local SuperLink stand-in."""
+
+
+import heapq
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from common import Message
+
+# The expiry index is rebuilt once it holds this many more entries than there are
+# stored messages (entries of messages removed before they expired)
+_MIN_STALE_EXPIRY_ENTRIES = 1024
+
+
+class MessageStore:
+    """Messages sent to nodes and their replies, evicted once their TTL passes.
+
+    Messages are keyed by their `message_id` and replies by the `message_id` of the
+    message they reply to. Messages not yet delivered are also indexed by their
+    destination node, in the order in which they were stored, so the next message
+    for any node or for a given node is found in constant time.
+
+    A message expires `ttl` seconds after its `created_at` timestamp. A heap of
+    expiry times lets `evict_expired` remove each expired message (and its reply,
+    which cannot outlive it) in O(log n), without scanning the store. Replies are
+    also checked for expiry when they are pulled.
+
+    The store is not thread-safe, its owner (e.g. `InMemoryLinkState`) must
+    serialize the calls.
+    """
+
+    def __init__(self) -> None:
+        self._ins: dict[str, Message] = {}
+        self._res: dict[str, Message] = {}
+        self._undelivered: OrderedDict[str, None] = OrderedDict()
+        self._undelivered_by_node: dict[int, OrderedDict[str, None]] = {}
+        self._expiry: list[tuple[float, str]] = []
+
+    def add_message_ins(self, message: Message) -> None:
+        """Store a message whose `message_id` is set, to be delivered later."""
+        metadata = message.metadata
+        message_id = metadata.message_id
+        self._ins[message_id] = message
+        self._undelivered[message_id] = None
+        self._undelivered_by_node.setdefault(metadata.dst_node_id, OrderedDict())[
+            message_id
+        ] = None
+        heapq.heappush(self._expiry, (_expires_at(message), message_id))
+
+    def next_message_ins(self, node_id: Optional[int] = None) -> Optional[Message]:
+        """Return the oldest undelivered message (for `node_id`, if given).
+
+        The message is marked as delivered and will not be returned again. It stays
+        in the store, to validate its reply, until it expires or its reply is
+        pulled.
+        """
+        if node_id is None:
+            if not self._undelivered:
+                return None
+            message_id, _ = self._undelivered.popitem(last=False)
+            message = self._ins[message_id]
+            self._discard_undelivered(message.metadata.dst_node_id, message_id)
+            return message
+        node_queue = self._undelivered_by_node.get(node_id)
+        if not node_queue:
+            return None
+        message_id, _ = node_queue.popitem(last=False)
+        if not node_queue:
+            del self._undelivered_by_node[node_id]
+        del self._undelivered[message_id]
+        return self._ins[message_id]
+
+    def withdraw_message_ins(self, message_id: str) -> Optional[Message]:
+        """Return an undelivered message and make sure it is never delivered.
+
+        Returns None if the message is unknown or was delivered already. The
+        message stays in the store, to accept a reply in its place.
+        """
+        if message_id not in self._undelivered:
+            return None
+        message = self._ins[message_id]
+        del self._undelivered[message_id]
+        self._discard_undelivered(message.metadata.dst_node_id, message_id)
+        return message
+
+    def num_undelivered(self, node_id: Optional[int] = None) -> int:
+        """Return the number of undelivered messages (for `node_id`, if given)."""
+        if node_id is None:
+            return len(self._undelivered)
+        return len(self._undelivered_by_node.get(node_id, ()))
+
+    def has_message_ins(self, message_id: str) -> bool:
+        """Return whether a message with the given ID is stored."""
+        return message_id in self._ins
+
+    def add_message_res(self, message: Message) -> bool:
+        """Store a reply, return False if the message it replies to is unknown."""
+        reply_to = message.metadata.reply_to_message
+        if reply_to not in self._ins:
+            return False
+        self._res[reply_to] = message
+        return True
+
+    def pop_message_res(
+        self, message_id: str, now: Optional[float] = None
+    ) -> Optional[Message]:
+        """Return and remove the reply to a message, or None if there is none.
+
+        Once its reply is returned, the message is removed too. An expired reply is
+        removed but not returned.
+        """
+        reply = self._res.pop(message_id, None)
+        if reply is None:
+            return None
+        self._remove(message_id)
+        if _expires_at(reply) <= (time.time() if now is None else now):
+            return None
+        return reply
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Remove the messages whose TTL has passed, return how many were removed.
+
+        The replies to those messages are removed with them.
+        """
+        now = time.time() if now is None else now
+        expiry = self._expiry
+        num_evicted = 0
+        while expiry and expiry[0][0] <= now:
+            _, message_id = heapq.heappop(expiry)
+            if message_id in self._ins:
+                self._remove(message_id)
+                num_evicted += 1
+        if len(expiry) > 2 * len(self._ins) + _MIN_STALE_EXPIRY_ENTRIES:
+            # Drop the entries of the messages removed before they expired
+            self._expiry = [entry for entry in expiry if entry[1] in self._ins]
+            heapq.heapify(self._expiry)
+        return num_evicted
+
+    def num_message_ins(self) -> int:
+        """Return the number of stored messages (including delivered ones)."""
+        return len(self._ins)
+
+    def num_message_res(self) -> int:
+        """Return the number of stored replies."""
+        return len(self._res)
+
+    def _remove(self, message_id: str) -> None:
+        """Remove a message, its reply and its entries in the delivery indexes."""
+        message = self._ins.pop(message_id)
+        self._res.pop(message_id, None)
+        if message_id in self._undelivered:
+            del self._undelivered[message_id]
+            self._discard_undelivered(message.metadata.dst_node_id, message_id)
+
+    def _discard_undelivered(self, node_id: int, message_id: str) -> None:
+        """Remove an undelivered message from the queue of its node."""
+        node_queue = self._undelivered_by_node[node_id]
+        del node_queue[message_id]
+        if not node_queue:
+            del self._undelivered_by_node[node_id]
+
+
+def _expires_at(message: Message) -> float:
+    """Return the time at which the TTL of `message` passes."""
+    return message.metadata.created_at + message.metadata.ttl
@@ -0,0 +1,10 @@
+"""Flower Simulation Engine (Virtual Client Engine)."""
+
+
+from .run_simulation import run_simulation as run_simulation
+from .vce_api import start_vce as start_vce
+
+__all__ = [
+    "run_simulation",
+    "start_vce",
+]
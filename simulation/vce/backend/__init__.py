@@ -0,0 +1,20 @@
+"""Simulation Engine Backends."""
+
+
+from .backend import Backend, BackendConfig
+from .processbackend import ProcessBackend
+from .threadbackend import ThreadBackend
+
+# Mappings
+supported_backends: dict[str, type[Backend]] = {
+    "thread": ThreadBackend,
+    "process": ProcessBackend,
+}
+
+__all__ = [
+    "Backend",
+    "BackendConfig",
+    "ProcessBackend",
+    "ThreadBackend",
+    "supported_backends",
+]
@@ -0,0 +1,48 @@
+"""Generic Backend class for the Virtual Client Engine."""
+
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from client.client_app import ClientApp
+from common import Context, Message
+from common.typing import ConfigsRecordValues
+
+BackendConfig = dict[str, ConfigsRecordValues]
+
+
+class Backend(ABC):
+    """Abstract base class for a Simulation Engine Backend."""
+
+    def __init__(self, backend_config: BackendConfig) -> None:
+        """Construct a backend."""
+
+    @abstractmethod
+    def build(self, app_fn: Callable[[], ClientApp]) -> None:
+        """Build backend.
+
+        Different components need to be in place before a backend is ready to accept
+        messages. This method is called once by the engine before the first message
+        is processed. `app_fn` returns the `ClientApp` the backend should execute.
+        """
+
+    @property
+    def num_workers(self) -> int:
+        """Return number of messages the backend can process concurrently."""
+        return 0
+
+    @abstractmethod
+    def is_worker_idle(self) -> bool:
+        """Report whether a backend worker is idle and can therefore run a ClientApp."""
+
+    @abstractmethod
+    def terminate(self) -> None:
+        """Terminate backend."""
+
+    @abstractmethod
+    def process_message(
+        self,
+        message: Message,
+        context: Context,
+    ) -> tuple[Message, Context]:
+        """Submit a job to the backend and return the reply and updated Context."""
@@ -0,0 +1,236 @@
+"""Process-based backend for the Virtual Client Engine."""
+
+
+import multiprocessing
+import os
+import queue
+import socket
+import sys
+import traceback
+from logging import DEBUG, WARN
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Callable, Optional
+
+from client.client_app import ClientApp, ClientAppException
+from common import Context, Message
+from common.logger import log
+from common.serde import FrameReader, FrameWriter, recv_frame, send_frame
+
+from .backend import Backend, BackendConfig
+
+# Seconds to wait for a worker process to exit before killing it
+_TERMINATE_TIMEOUT = 5.0
+
+# Frames sent to a worker process start with one of these commands...
+_JOB = 1
+_STOP = 0
+# ...and frames sent back by a worker process with one of these statuses
+_READY = 0
+_OK = 1
+_ERROR = 2
+
+
+def _set_num_threads(num_threads: int) -> None:
+    """Limit the number of threads used by numerical libraries in this process."""
+    for env_var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[env_var] = str(num_threads)
+    # Libraries imported before the process was forked ignore the env vars above
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(num_threads)
+
+
+def _send_status(sock: socket.socket, status: int, error: str = "") -> None:
+    """Send a frame holding only a status and an error description."""
+    writer = FrameWriter()
+    writer.write_u8(status)
+    writer.write_str(error)
+    send_frame(sock, writer.frame())
+
+
+def _worker_loop(
+    app_fn: Callable[[], ClientApp], sock: socket.socket, num_threads: int
+) -> None:
+    """Load the `ClientApp` once, then process messages until told to stop."""
+    _set_num_threads(num_threads)
+    try:
+        app = app_fn()
+    except Exception:  # pylint: disable=broad-exception-caught
+        _send_status(sock, _ERROR, traceback.format_exc())
+        return
+    _send_status(sock, _READY)
+
+    while True:
+        try:
+            reader = FrameReader(recv_frame(sock))
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if reader.read_u8() == _STOP:
+            break
+
+        message, context = reader.read_message(), reader.read_context()
+        try:
+            out_message = app(message=message, context=context)
+            writer = FrameWriter()
+            writer.write_u8(_OK)
+            writer.write_message(out_message)
+            writer.write_context(context)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _send_status(sock, _ERROR, str(type(ex)) + ":<'" + str(ex) + "'>")
+            continue
+        send_frame(sock, writer.frame())
+    sock.close()
+
+
+class _WorkerActor:
+    """A long-lived worker process hosting a warm `ClientApp`."""
+
+    def __init__(
+        self, ctx: BaseContext, app_fn: Callable[[], ClientApp], num_threads: int
+    ) -> None:
+        self.sock, child_sock = socket.socketpair()
+        self.process: BaseProcess = ctx.Process(  # type: ignore[attr-defined]
+            target=_worker_loop,
+            args=(app_fn, child_sock, num_threads),
+            daemon=True,
+        )
+        self.process.start()
+        child_sock.close()
+
+        # Wait until the ClientApp has been loaded
+        reader = FrameReader(recv_frame(self.sock))
+        if reader.read_u8() != _READY:
+            self.process.join()
+            raise ClientAppException(
+                f"Failed to load ClientApp:\n{reader.read_str()}"
+            )
+
+    def run(self, message: Message, context: Context) -> tuple[Message, Context]:
+        """Execute the `ClientApp` in the worker process."""
+        writer = FrameWriter()
+        writer.write_u8(_JOB)
+        writer.write_message(message)
+        writer.write_context(context)
+        send_frame(self.sock, writer.frame())
+
+        reader = FrameReader(recv_frame(self.sock))
+        if reader.read_u8() != _OK:
+            raise ClientAppException(reader.read_str())
+        return reader.read_message(), reader.read_context()
+
+    def is_alive(self) -> bool:
+        """Return True if the worker process is running."""
+        return self.process.is_alive()
+
+    def terminate(self) -> None:
+        """Ask the worker process to exit and kill it if it does not."""
+        try:
+            writer = FrameWriter()
+            writer.write_u8(_STOP)
+            send_frame(self.sock, writer.frame())
+        except OSError:
+            pass
+        self.process.join(timeout=_TERMINATE_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.sock.close()
+
+
+class ProcessBackend(Backend):
+    """A backend that runs `ClientApp`s in a pool of long-lived worker processes.
+
+    Each worker process loads the `ClientApp` once and then keeps processing the
+    messages it is handed, so module imports, model construction and dataset
+    handles cached by the app are paid once per worker instead of once per message.
+    Messages and `Context`s are exchanged with the workers over sockets, framed by
+    `common.serde`: the arrays of the records are sent as out-of-band buffers and
+    received without being copied.
+
+    Parameters
+    ----------
+    backend_config : BackendConfig
+        Supported keys are `num_workers` (int, default: number of CPUs), the number
+        of worker processes; `num_threads_per_worker` (int, default: 1), the size
+        of the thread pool numerical libraries (e.g. PyTorch) may use in each
+        worker; and `start_method` (str, default: `"fork"` where available), the
+        multiprocessing start method. With start methods other than `"fork"`, the
+        `ClientApp` must be passed to the Simulation Engine as a reference (e.g.
+        `"client_app:app"`) since it has to be loaded in a fresh interpreter.
+    """
+
+    def __init__(self, backend_config: BackendConfig) -> None:
+        super().__init__(backend_config)
+        num_workers = backend_config.get("num_workers", os.cpu_count() or 1)
+        num_threads = backend_config.get("num_threads_per_worker", 1)
+        for key, value in (
+            ("num_workers", num_workers),
+            ("num_threads_per_worker", num_threads),
+        ):
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(
+                    f"`{key}` must be a positive integer, but `{value!r}` was passed."
+                )
+        default_start_method = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        start_method = backend_config.get("start_method", default_start_method)
+
+        self._num_workers: int = num_workers  # type: ignore[assignment]
+        self._num_threads: int = num_threads  # type: ignore[assignment]
+        self._ctx = multiprocessing.get_context(str(start_method))
+        self._app_fn: Optional[Callable[[], ClientApp]] = None
+        self._actors: list[_WorkerActor] = []
+        self._idle_actors: queue.Queue[_WorkerActor] = queue.Queue()
+
+    @property
+    def num_workers(self) -> int:
+        """Return number of messages the backend can process concurrently."""
+        return self._num_workers
+
+    def is_worker_idle(self) -> bool:
+        """Report whether a backend worker is idle and can therefore run a ClientApp."""
+        return not self._idle_actors.empty()
+
+    def build(self, app_fn: Callable[[], ClientApp]) -> None:
+        """Start the worker processes and load the `ClientApp` in each of them."""
+        self._app_fn = app_fn
+        for _ in range(self._num_workers):
+            self._add_actor()
+        log(DEBUG, "Constructed ProcessBackend with %s workers", self._num_workers)
+
+    def _add_actor(self) -> None:
+        actor = _WorkerActor(self._ctx, self._app_fn, self._num_threads)  # type: ignore
+        self._actors.append(actor)
+        self._idle_actors.put(actor)
+
+    def process_message(
+        self,
+        message: Message,
+        context: Context,
+    ) -> tuple[Message, Context]:
+        """Run the `ClientApp` on the message in the next idle worker process."""
+        actor = self._idle_actors.get()
+        try:
+            return actor.run(message, context)
+        except (EOFError, OSError) as ex:
+            # The worker process died, replace it with a new one
+            log(WARN, "Worker process crashed (%s), starting a new one", ex)
+            self._replace_actor(actor)
+            raise ClientAppException("Worker process crashed.") from ex
+        finally:
+            if actor.is_alive():
+                self._idle_actors.put(actor)
+
+    def _replace_actor(self, actor: _WorkerActor) -> None:
+        actor.terminate()
+        self._actors.remove(actor)
+        self._add_actor()
+
+    def terminate(self) -> None:
+        """Stop all worker processes."""
+        for actor in self._actors:
+            actor.terminate()
+        self._actors.clear()
+        self._idle_actors = queue.Queue()
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""Thread-based backend for the Virtual Client Engine."""
+
+
+import os
+import threading
+from logging import DEBUG
+from typing import Callable, Optional
+
+from client.client_app import ClientApp
+from common import Context, Message
+from common.logger import log
+
+from .backend import Backend, BackendConfig
+
+
+class ThreadBackend(Backend):
+    """A backend that runs `ClientApp`s in threads of the current process.
+
+    A single `ClientApp` instance is shared by all workers, so importing the app
+    and constructing it is only paid once.
+
+    Parameters
+    ----------
+    backend_config : BackendConfig
+        Supported keys are `num_workers` (int, default: number of CPUs), the number
+        of messages that are processed concurrently.
+    """
+
+    def __init__(self, backend_config: BackendConfig) -> None:
+        super().__init__(backend_config)
+        num_workers = backend_config.get("num_workers", os.cpu_count() or 1)
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise ValueError(
+                "`num_workers` must be a positive integer, "
+                f"but `{num_workers!r}` was passed."
+            )
+        self._num_workers = num_workers
+        self._num_busy = 0
+        self._lock = threading.Lock()
+        self._app: Optional[ClientApp] = None
+
+    @property
+    def num_workers(self) -> int:
+        """Return number of messages the backend can process concurrently."""
+        return self._num_workers
+
+    def is_worker_idle(self) -> bool:
+        """Report whether a backend worker is idle and can therefore run a ClientApp."""
+        with self._lock:
+            return self._num_busy < self._num_workers
+
+    def build(self, app_fn: Callable[[], ClientApp]) -> None:
+        """Load the `ClientApp` executed by all workers."""
+        self._app = app_fn()
+        log(DEBUG, "Constructed ThreadBackend with %s workers", self._num_workers)
+
+    def process_message(
+        self,
+        message: Message,
+        context: Context,
+    ) -> tuple[Message, Context]:
+        """Run the `ClientApp` on the message in the calling thread."""
+        if self._app is None:
+            raise RuntimeError("ThreadBackend.build() must be called first.")
+        with self._lock:
+            self._num_busy += 1
+        try:
+            out_message = self._app(message=message, context=context)
+        finally:
+            with self._lock:
+                self._num_busy -= 1
+        return out_message, context
+
+    def terminate(self) -> None:
+        """Terminate backend."""
+        self._app = None
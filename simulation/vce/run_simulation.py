@@ -0,0 +1,111 @@
+"""Flower Simulation."""
+
+
+import threading
+from functools import partial
+from logging import INFO
+from typing import Callable, Optional, Union
+
+from client.client_app import ClientApp, LoadClientAppError
+from common import Context, RecordSet
+from common.constant import SUPERLINK_NODE_ID
+from common.logger import log
+from common.object_ref import load_app
+from common.typing import Run, UserConfig
+from server.driver import InMemoryDriver
+from server.server_app import ServerApp
+from server.superlink import InMemoryLinkState
+
+from .backend import BackendConfig
+from .vce_api import start_vce
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def run_simulation(
+    server_app: ServerApp,
+    client_app: Union[ClientApp, str],
+    num_supernodes: int,
+    backend_name: str = "thread",
+    backend_config: Optional[BackendConfig] = None,
+    run_config: Optional[UserConfig] = None,
+) -> None:
+    """Run a Flower App using the Simulation Engine.
+
+    Parameters
+    ----------
+    server_app : ServerApp
+        The `ServerApp` to be executed. It will send messages to different
+        `ClientApp` instances running on different (virtual) SuperNodes.
+    client_app : Union[ClientApp, str]
+        The `ClientApp` to be executed by each of the SuperNodes. It will receive
+        messages sent by the `ServerApp`. It can also be passed as a reference in
+        the form `<module>:<attribute>` (e.g. `"client_app:app"`), in which case
+        it is loaded by the backend itself (e.g. once in each worker process).
+    num_supernodes : int
+        Number of nodes that run a ClientApp. They can be sampled by a Driver in the
+        ServerApp and receive a Message describing what the ClientApp should perform.
+    backend_name : str (default: thread)
+        A simulation backend that runs `ClientApp`s. One of the keys in
+        `vce.backend.supported_backends` (i.e. `"thread"` or `"process"`).
+    backend_config : Optional[BackendConfig] (default: None)
+        A dictionary to configure a backend. Separate dictionaries to configure
+        different elements of backend. Supported keys depend on the backend.
+    run_config : Optional[UserConfig] (default: None)
+        The run config passed to both the `ServerApp` and the `ClientApp`s via
+        their `Context`.
+    """
+    if num_supernodes < 1:
+        raise ValueError("`num_supernodes` must be at least 1.")
+
+    app_fn: Callable[[], ClientApp]
+    if isinstance(client_app, str):
+        app_fn = partial(load_app, client_app, LoadClientAppError)
+    else:
+        app_fn = partial(_identity, client_app)
+
+    state = InMemoryLinkState()
+    run_id = state.create_run(run_config)
+    run = state.get_run(run_id)
+
+    # Start the Simulation Engine in a separate thread
+    f_stop = threading.Event()
+    vce_thread = threading.Thread(
+        target=start_vce,
+        kwargs={
+            "app_fn": app_fn,
+            "backend_name": backend_name,
+            "backend_config": backend_config or {},
+            "state": state,
+            "run": run,
+            "f_stop": f_stop,
+            "num_supernodes": num_supernodes,
+        },
+        daemon=True,
+    )
+    vce_thread.start()
+
+    try:
+        _run_server_app(server_app, state, run)  # type: ignore[arg-type]
+    finally:
+        # Stop the Simulation Engine
+        f_stop.set()
+        vce_thread.join()
+        log(INFO, "Simulation finished")
+
+
+def _run_server_app(server_app: ServerApp, state: InMemoryLinkState, run: Run) -> None:
+    """Execute the `ServerApp` using an `InMemoryDriver`."""
+    driver = InMemoryDriver(state=state)
+    driver.set_run(run.run_id)
+    context = Context(
+        run_id=run.run_id,
+        node_id=SUPERLINK_NODE_ID,
+        node_config={},
+        state=RecordSet(),
+        run_config=run.override_config,
+    )
+    server_app(driver=driver, context=context)
+
+
+def _identity(client_app: ClientApp) -> ClientApp:
+    return client_app
@@ -0,0 +1,254 @@
+"""Fleet Simulation Engine API."""
+
+
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import DEBUG, ERROR, INFO
+from typing import Callable, Optional
+
+from client.client_app import ClientApp
+from common import Context, Message, RecordSet
+from common.constant import ErrorCode
+from common.logger import log
+from common.message import Error
+from common.typing import Run, UserConfig
+from server.superlink import InMemoryLinkState
+
+from .backend import Backend, BackendConfig, supported_backends
+
+NodeToPartitionMapping = dict[int, int]
+
+# Seconds an idle worker waits for a message before checking if it should stop
+_WORKER_WAKEUP_INTERVAL = 0.5
+
+
+def _register_nodes(
+    num_nodes: int, state: InMemoryLinkState
+) -> NodeToPartitionMapping:
+    """Register nodes with the state and assign a data partition to each of them."""
+    nodes_mapping: NodeToPartitionMapping = {}
+    for i in range(num_nodes):
+        node_id = state.create_node()
+        nodes_mapping[node_id] = i
+    log(DEBUG, "Registered %i nodes", len(nodes_mapping))
+    return nodes_mapping
+
+
+class _NodeStates:
+    """Contexts of the virtual nodes, created the first time a node runs.
+
+    A node processes its messages one at a time: `retrieve_context` and
+    `update_context` are last-writer-wins, so two messages processed at once for
+    the same node would lose the Context update of one of them. A worker that
+    fetches a message for a node busy with another one hands it over to the
+    worker processing that node (see `claim` and `next_message`), which processes
+    it next. Workers never block on a busy node and the messages of a node are
+    processed in the order in which they were fetched.
+    """
+
+    def __init__(
+        self, run: Run, nodes_mapping: NodeToPartitionMapping, run_config: UserConfig
+    ) -> None:
+        self._run_id = run.run_id
+        self._nodes_mapping = nodes_mapping
+        self._run_config = run_config
+        self._contexts: dict[int, Context] = {}
+        self._lock = threading.Lock()
+        self._pending: dict[int, deque[Message]] = {}
+
+    def retrieve_context(self, node_id: int) -> Context:
+        """Return the Context of a node, creating it if necessary."""
+        context = self._contexts.get(node_id)
+        if context is None:
+            context = Context(
+                run_id=self._run_id,
+                node_id=node_id,
+                node_config={
+                    "partition-id": self._nodes_mapping[node_id],
+                    "num-partitions": len(self._nodes_mapping),
+                },
+                state=RecordSet(),
+                run_config=self._run_config,
+            )
+            context = self._contexts.setdefault(node_id, context)
+        return context
+
+    def update_context(self, node_id: int, context: Context) -> None:
+        """Replace the Context of a node."""
+        self._contexts[node_id] = context
+
+    def claim(self, message: Message) -> bool:
+        """Claim the destination node of a message for processing it.
+
+        Returns False if the node is busy, in which case the message is queued for
+        the worker processing the node.
+        """
+        node_id = message.metadata.dst_node_id
+        with self._lock:
+            pending = self._pending.get(node_id)
+            if pending is not None:
+                pending.append(message)
+                return False
+            self._pending[node_id] = deque()
+            return True
+
+    def next_message(self, node_id: int) -> Optional[Message]:
+        """Return the next message queued for a claimed node, or None.
+
+        If no message is queued, the node is released.
+        """
+        with self._lock:
+            pending = self._pending[node_id]
+            if pending:
+                return pending.popleft()
+            del self._pending[node_id]
+            return None
+
+
+def worker(
+    state: InMemoryLinkState,
+    node_states: _NodeStates,
+    backend: Backend,
+    f_stop: threading.Event,
+) -> None:
+    """Process messages fetched from the state until `f_stop` is set.
+
+    Once `f_stop` is set, the messages queued for the node being processed are
+    answered with an error instead of being processed.
+    """
+    while not f_stop.is_set():
+        message = state.get_message_ins(timeout=_WORKER_WAKEUP_INTERVAL)
+        if message is None or not node_states.claim(message):
+            continue
+
+        node_id = message.metadata.dst_node_id
+        while message is not None and not f_stop.is_set():
+            state.store_message_res(_process(message, node_states, backend))
+            message = node_states.next_message(node_id)
+        while message is not None:
+            state.store_message_res(
+                message.create_error_reply(
+                    error=Error(
+                        code=ErrorCode.MESSAGE_UNAVAILABLE,
+                        reason="The Simulation Engine stopped before processing "
+                        "the message",
+                    )
+                )
+            )
+            message = node_states.next_message(node_id)
+
+
+def _process(message: Message, node_states: _NodeStates, backend: Backend) -> Message:
+    """Run the ClientApp of the destination node of a message, return the reply."""
+    node_id = message.metadata.dst_node_id
+    try:
+        # Fetch the Context of the destination node and run the ClientApp
+        context = node_states.retrieve_context(node_id)
+        out_message, updated_context = backend.process_message(message, context)
+
+        # Update the Context of this node
+        node_states.update_context(node_id, context=updated_context)
+
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        log(ERROR, ex)
+        log(ERROR, traceback.format_exc())
+
+        # Return a Message with an Error
+        reason = str(type(ex)) + ":<'" + str(ex) + "'>"
+        out_message = message.create_error_reply(
+            error=Error(code=ErrorCode.CLIENT_APP_RAISED_EXCEPTION, reason=reason)
+        )
+    return out_message
+
+
+def _reply_with_errors(
+    state: InMemoryLinkState, f_stop: threading.Event, reason: str
+) -> None:
+    """Reply to every message with an error until `f_stop` is set."""
+    while not f_stop.is_set():
+        message = state.get_message_ins(timeout=_WORKER_WAKEUP_INTERVAL)
+        if message is None:
+            continue
+        out_message = message.create_error_reply(
+            error=Error(code=ErrorCode.LOAD_CLIENT_APP_EXCEPTION, reason=reason)
+        )
+        state.store_message_res(out_message)
+
+
+def start_vce(  # pylint: disable=too-many-arguments
+    *,
+    app_fn: Callable[[], ClientApp],
+    backend_name: str,
+    backend_config: BackendConfig,
+    state: InMemoryLinkState,
+    run: Run,
+    f_stop: threading.Event,
+    num_supernodes: Optional[int] = None,
+    existing_nodes_mapping: Optional[NodeToPartitionMapping] = None,
+) -> None:
+    """Start Fleet API with the Simulation Engine.
+
+    Messages pushed to `state` are processed by a pool of workers until `f_stop`
+    is set. Nodes are virtual: each one only costs its `Context`, which is created
+    the first time a message is delivered to it.
+    """
+    if num_supernodes is None and existing_nodes_mapping is None:
+        raise ValueError(
+            "Pass either `num_supernodes` or `existing_nodes_mapping` to `start_vce`."
+        )
+    if num_supernodes is not None and existing_nodes_mapping is not None:
+        raise ValueError(
+            "Both `num_supernodes` and `existing_nodes_mapping` were passed to "
+            "`start_vce`, but only one of them is expected."
+        )
+
+    # Register nodes (if not done already)
+    if existing_nodes_mapping is not None:
+        nodes_mapping = existing_nodes_mapping
+    else:
+        nodes_mapping = _register_nodes(
+            num_nodes=num_supernodes, state=state  # type: ignore[arg-type]
+        )
+    node_states = _NodeStates(run, nodes_mapping, run.override_config)
+
+    # Build backend
+    if backend_name not in supported_backends:
+        raise ValueError(
+            f"Backend `{backend_name}` is not supported. "
+            f"Choose one of: {list(supported_backends)}."
+        )
+    backend = supported_backends[backend_name](backend_config)
+    try:
+        backend.build(app_fn)
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        log(ERROR, "Failed to build the `%s` backend: %s", backend_name, ex)
+        log(ERROR, traceback.format_exc())
+        backend.terminate()
+        # Keep answering, so the ServerApp does not wait for replies forever
+        reason = str(type(ex)) + ":<'" + str(ex) + "'>"
+        _reply_with_errors(state, f_stop, reason=reason)
+        return
+
+    log(
+        INFO,
+        "Started Simulation Engine with %s nodes and %s workers (backend: %s)",
+        len(nodes_mapping),
+        backend.num_workers,
+        backend_name,
+    )
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=backend.num_workers, thread_name_prefix="vce-worker"
+        ) as executor:
+            futures = [
+                executor.submit(worker, state, node_states, backend, f_stop)
+                for _ in range(backend.num_workers)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        backend.terminate()
+        log(DEBUG, "Terminated Simulation Engine")